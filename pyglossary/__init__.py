@@ -1,5 +1,12 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+# core must be imported first, it sets up the logger class for all modules
 from .core import VERSION
-from .glossary import Glossary
+
+if TYPE_CHECKING:
+	from .glossary import Glossary
 
 __version__ = VERSION
 
@@ -7,3 +14,13 @@ __all__ = [
 	"Glossary",
 	"__version__",
 ]
+
+
+# importing Glossary is postponed until it is used, so that importing
+# a submodule (like pyglossary.ui.main) does not load all of its dependencies
+def __getattr__(name: str) -> Any:
+	if name == "Glossary":
+		from .glossary import Glossary
+
+		return Glossary
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
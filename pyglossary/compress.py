@@ -5,11 +5,12 @@ from __future__ import annotations
 import logging
 import os
 from os.path import join
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 if TYPE_CHECKING:
 	import io
 	from collections.abc import Callable
+	from typing import BinaryIO
 
 
 stdCompressions = ("gz", "bz2", "lzma")
@@ -17,9 +18,11 @@ stdCompressions = ("gz", "bz2", "lzma")
 log = logging.getLogger("pyglossary")
 
 __all__ = [
+	"ProgressSize",
 	"compress",
 	"compressionOpen",
 	"compressionOpenFunc",
+	"progressSize",
 	"stdCompressions",
 	"uncompress",
 ]
@@ -75,7 +78,148 @@ def compressionOpen(
 	return open(filename, **kwargs)  # noqa: SIM115
 
 
+class ProgressSize(NamedTuple):
+	"""
+	Total size for byte progress of reading a file.
+
+	size: 0 if not known
+	rawTell: None if size is the size of (uncompressed) data, so position
+		in data (file.tell()) is used for progress. Otherwise size is the
+		size of compressed file, and rawTell returns position in it.
+	"""
+
+	size: int
+	rawTell: Callable[[], int] | None = None
+
+	@property
+	def uncompressed(self) -> bool:
+		return self.size > 0 and self.rawTell is None
+
+
+def _rawFile(cfile: io.IOBase) -> BinaryIO | None:
+	"""Underlying compressed file of a file opened by compressionOpen."""
+	compression = getattr(cfile, "compression", "")
+	if not compression:
+		return None
+	# text mode files are TextIOWrapper, binary file is `buffer`
+	file = getattr(cfile, "buffer", cfile)
+	if compression in {"gz", "dz"}:
+		return getattr(file, "fileobj", None)
+	# BZ2File and LZMAFile
+	return getattr(file, "_fp", None)
+
+
+def _readAt(raw: BinaryIO, offset: int, size: int) -> bytes:
+	"""Read from offset (relative to end), keeping position of raw."""
+	pos = raw.tell()
+	try:
+		raw.seek(offset, 2)
+		return raw.read(size)
+	finally:
+		raw.seek(pos)
+
+
+# deflate compresses data at most about 1032 times
+_deflateMaxRatio = 1032
+
+
+def _gzipDataSize(raw: BinaryIO, rawSize: int) -> int | None:
+	if rawSize < 18:
+		return None
+	# ISIZE (size of data modulo 2^32, of the last member) is only known
+	# to be the data size if the data can not be 4 GiB or larger
+	if rawSize * _deflateMaxRatio >= 2**32:
+		return None
+	isize = int.from_bytes(_readAt(raw, -4, 4), "little")
+	# smaller than compressed size means file has multiple members
+	if isize < rawSize:
+		return None
+	return isize
+
+
+def _readVarInt(buf: bytes, pos: int) -> tuple[int, int]:
+	value = 0
+	shift = 0
+	while True:
+		byte = buf[pos]
+		pos += 1
+		value |= (byte & 0x7F) << shift
+		if not byte & 0x80:
+			return value, pos
+		shift += 7
+
+
+def _xzDataSize(raw: BinaryIO, rawSize: int) -> int | None:
+	"""Sum of uncompressed sizes in index of a single-stream xz file."""
+	if rawSize < 32:
+		return None
+	footer = _readAt(raw, -12, 12)
+	if footer[10:] != b"YZ":
+		return None
+	indexSize = (int.from_bytes(footer[4:8], "little") + 1) * 4
+	if indexSize + 24 > rawSize:
+		return None
+	index = _readAt(raw, -12 - indexSize, indexSize)
+	if index[0] != 0:
+		return None
+	try:
+		count, pos = _readVarInt(index, 1)
+		dataSize = blocksSize = 0
+		for _ in range(count):
+			unpaddedSize, pos = _readVarInt(index, pos)
+			uncompressedSize, pos = _readVarInt(index, pos)
+			blocksSize += (unpaddedSize + 3) & ~3
+			dataSize += uncompressedSize
+	except IndexError:
+		return None
+	# stream header + blocks + index + stream footer must be the whole
+	# file, otherwise it has multiple streams or padding
+	if 12 + blocksSize + indexSize + 12 != rawSize:
+		return None
+	return dataSize
+
+
+def progressSize(cfile: io.IOBase) -> ProgressSize:
+	"""
+	Find total size for byte progress of a file opened by compressionOpen,
+	without decompressing it.
+
+	For gzip, size of data is read from ISIZE trailer, and for xz, from
+	the index. If that is not possible (bz2, or gzip data of 4 GiB or
+	more), size of compressed file and position in it are used.
+	"""
+	if not cfile.seekable():
+		return ProgressSize(0)
+	raw = _rawFile(cfile)
+	if raw is None:
+		try:
+			return ProgressSize(os.fstat(cfile.fileno()).st_size)
+		except (AttributeError, OSError):
+			pos = cfile.tell()
+			cfile.seek(0, 2)
+			size = cfile.tell()
+			cfile.seek(pos)
+			return ProgressSize(size)
+	rawSize = os.fstat(raw.fileno()).st_size
+	compression = getattr(cfile, "compression", "")
+	dataSize: int | None = None
+	if compression in {"gz", "dz"}:
+		dataSize = _gzipDataSize(raw, rawSize)
+	elif compression == "lzma":
+		dataSize = _xzDataSize(raw, rawSize)
+	if dataSize is not None:
+		return ProgressSize(dataSize)
+	return ProgressSize(rawSize, raw.tell)
+
+
 def zipFileOrDir(filename: str) -> None:
+	"""
+	Create filename.zip, containing the files in directory filename,
+	or file filename and its resource directory (filename_res).
+
+	Files are added in sorted order, and compressed in parallel
+	(see parallel_zip.py).
+	"""
 	import shutil
 	from os.path import (
 		isdir,
@@ -83,38 +227,35 @@ def zipFileOrDir(filename: str) -> None:
 		split,
 	)
 
-	from .os_utils import indir
-	from .repro_zipfile import ReproducibleZipFile as ZipFile
+	from .parallel_zip import ParallelZipWriter
 
-	def _zipFileAdd(zf: ZipFile, filename: str) -> None:
-		if isfile(filename):
-			zf.write(filename)
-			return
-		if not isdir(filename):
-			raise OSError(f"Not a file or directory: {filename}")
-		for subFname in os.listdir(filename):
-			_zipFileAdd(zf, join(filename, subFname))
-
-	with ZipFile(f"{filename}.zip", mode="w") as zf:
-		if isdir(filename):
-			dirn, name = split(filename)
-			with indir(filename):
-				for subFname in os.listdir(filename):
-					_zipFileAdd(zf, subFname)
-
-			log.debug(f"zipFileOrDir: removing {filename}")
-			shutil.rmtree(filename)
+	def _zipFileAdd(zw: ParallelZipWriter, path: str, arcname: str) -> None:
+		if isfile(path):
+			zw.write(path, arcname)
 			return
+		if not isdir(path):
+			raise OSError(f"Not a file or directory: {path}")
+		for subFname in sorted(os.listdir(path)):
+			_zipFileAdd(zw, join(path, subFname), f"{arcname}/{subFname}")
+
+	if isdir(filename):
+		with ParallelZipWriter(f"{filename}.zip") as zw:
+			for subFname in sorted(os.listdir(filename)):
+				_zipFileAdd(zw, join(filename, subFname), subFname)
+
+		log.debug(f"zipFileOrDir: removing {filename}")
+		shutil.rmtree(filename)
+		return
 
-		dirn, name = split(filename)
-		files = [name]
+	dirn, name = split(filename)
+	files = [name]
 
-		if isdir(f"{filename}_res"):
-			files.append(f"{name}_res")
+	if isdir(f"{filename}_res"):
+		files.append(f"{name}_res")
 
-		with indir(dirn):
-			for fname in files:
-				_zipFileAdd(zf, fname)
+	with ParallelZipWriter(f"{filename}.zip") as zw:
+		for fname in files:
+			_zipFileAdd(zw, join(dirn, fname), fname)
 
 
 def compress(filename: str, compression: str) -> str:
@@ -9,6 +9,7 @@ class ConfigType(TypedDict):
 	log_time: NotRequired[bool]
 	cleanup: NotRequired[bool]
 	auto_sqlite: NotRequired[bool]
+	sqlite_mmap_size: NotRequired[int]
 	lower: NotRequired[bool]
 	utf8_check: NotRequired[bool]
 	enable_alts: NotRequired[bool]
@@ -18,6 +19,8 @@ class ConfigType(TypedDict):
 	remove_html_all: NotRequired[bool]
 	normalize_html: NotRequired[bool]
 	save_info_json: NotRequired[bool]
+	stage_stats: NotRequired[bool]
+	stage_stats_json: NotRequired[str]
 	skip_duplicate_headword: NotRequired[bool]
 	skip_term_regex: NotRequired[str]
 	trim_arabic_diacritics: NotRequired[bool]
@@ -42,3 +45,5 @@ class ConfigType(TypedDict):
 	reverse_minRel: NotRequired[float]
 	reverse_maxNum: NotRequired[float]
 	reverse_includeDefs: NotRequired[bool]
+	reverse_sqlitePath: NotRequired[str]
+	reverse_processes: NotRequired[int]
@@ -0,0 +1,292 @@
+"""
+Lazily opened contents of data entries (resource files).
+
+A data source refers to bytes that are already on disk: a whole file,
+a byte range of a file (for example a resource stored uncompressed inside
+an archive) or a member of a ZIP file. Data entries created from a data
+source do not read the bytes into memory, writers can stream them with
+open(), or copy them to the output with copyTo(), which uses
+os.copy_file_range / os.sendfile (or a hard link if asked) when possible.
+
+This module is used in plugins.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import shutil
+import struct
+import sys
+import zipfile
+import zlib
+from os.path import getsize
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from typing import BinaryIO
+
+__all__ = [
+	"DataSource",
+	"FileDataSource",
+	"ZipDataSource",
+	"copyFileRange",
+]
+
+log = logging.getLogger("pyglossary")
+
+_bufferSize = 1024 * 1024
+
+# signature, ..., file name length, extra field length
+_zipLocalHeader = struct.Struct("<4s22xHH")
+_zipLocalHeaderSignature = b"PK\x03\x04"
+
+
+def _copyFileRangeFallback(
+	fromFile: BinaryIO,
+	toFile: BinaryIO,
+	offset: int,
+	count: int,
+) -> None:
+	fromFile.seek(offset)
+	while count > 0:
+		data = fromFile.read(min(count, _bufferSize))
+		if not data:
+			raise EOFError(f"unexpected end of file {fromFile.name!r}")
+		toFile.write(data)
+		count -= len(data)
+
+
+def copyFileRange(
+	fromFile: BinaryIO,
+	toFile: BinaryIO,
+	offset: int,
+	count: int,
+) -> None:
+	"""
+	Copy count bytes starting at offset of fromFile to current position
+	of toFile.
+
+	Uses os.copy_file_range or os.sendfile when available so the bytes
+	do not pass through Python memory, and falls back to read/write.
+	"""
+	toFile.flush()
+	fromFd = fromFile.fileno()
+	toFd = toFile.fileno()
+	try:
+		if hasattr(os, "copy_file_range"):
+			while count > 0:
+				n = os.copy_file_range(fromFd, toFd, count, offset_src=offset)
+				if n == 0:
+					break
+				offset += n
+				count -= n
+		elif sys.platform == "linux":
+			while count > 0:
+				n = os.sendfile(toFd, fromFd, offset, count)
+				if n == 0:
+					break
+				offset += n
+				count -= n
+	except OSError as e:
+		log.debug(f"copyFileRange: {e}, falling back to read/write")
+	if count > 0:
+		# position of toFd was moved by the system calls
+		toFile.seek(os.lseek(toFd, 0, os.SEEK_CUR))
+		_copyFileRangeFallback(fromFile, toFile, offset, count)
+
+
+class _FileRangeIO(io.RawIOBase):
+	"""Read-only raw stream of a byte range of a file."""
+
+	def __init__(self, path: str, offset: int, size: int) -> None:
+		self._file = open(path, "rb", buffering=0)  # noqa: SIM115
+		self._file.seek(offset)
+		self._remain = size
+
+	def readable(self) -> bool:  # noqa: PLR6301
+		return True
+
+	def readinto(self, buffer: bytearray | memoryview) -> int:  # type: ignore
+		if self._remain <= 0:
+			return 0
+		view = memoryview(buffer)[: self._remain]
+		n = self._file.readinto(view) or 0
+		self._remain -= n
+		return n
+
+	def close(self) -> None:
+		self._file.close()
+		super().close()
+
+
+class _InflateIO(io.RawIOBase):
+	"""Read-only raw stream that decompresses a raw deflate stream."""
+
+	def __init__(self, raw: io.RawIOBase) -> None:
+		self._raw = raw
+		self._decomp = zlib.decompressobj(-zlib.MAX_WBITS)
+		self._pending = b""
+
+	def readable(self) -> bool:  # noqa: PLR6301
+		return True
+
+	def readinto(self, buffer: bytearray | memoryview) -> int:  # type: ignore
+		while not self._pending:
+			if self._decomp.eof:
+				return 0
+			data = self._decomp.unconsumed_tail or self._raw.read(_bufferSize)
+			if not data:
+				raise zipfile.BadZipFile("unexpected end of compressed data")
+			self._pending = self._decomp.decompress(data, _bufferSize)
+		n = min(len(buffer), len(self._pending))
+		memoryview(buffer)[:n] = self._pending[:n]
+		self._pending = self._pending[n:]
+		return n
+
+	def close(self) -> None:
+		self._raw.close()
+		super().close()
+
+
+class DataSource:
+	__slots__: list[str] = []
+
+	def size(self) -> int:
+		raise NotImplementedError
+
+	def open(self) -> BinaryIO:
+		"""Open for reading, must be closed by caller."""
+		raise NotImplementedError
+
+	def read(self) -> bytes:
+		with self.open() as file:
+			return file.read()
+
+	def copyTo(self, fpath: str, hardLink: bool = False) -> None:
+		"""
+		Write contents to file fpath (overwritten if exists).
+
+		hardLink: create a hard link instead of copying, if possible.
+		Only makes sense if neither file is going to be modified in place.
+		"""
+		raise NotImplementedError
+
+
+class FileDataSource(DataSource):
+	"""A whole file, or size bytes of a file starting at offset."""
+
+	__slots__ = ["_offset", "_path", "_size"]
+
+	def __init__(self, path: str, offset: int = 0, size: int = -1) -> None:
+		self._path = path
+		self._offset = offset
+		self._size = size
+
+	def __repr__(self) -> str:
+		return f"FileDataSource({self._path!r}, offset={self._offset}, size={self._size})"
+
+	@property
+	def path(self) -> str:
+		return self._path
+
+	def isWholeFile(self) -> bool:
+		return self._offset == 0 and self._size < 0
+
+	def size(self) -> int:
+		if self._size < 0:
+			return getsize(self._path) - self._offset
+		return self._size
+
+	def open(self) -> BinaryIO:
+		if self.isWholeFile():
+			return open(self._path, "rb")
+		return io.BufferedReader(  # type: ignore
+			_FileRangeIO(self._path, self._offset, self.size()),
+			buffer_size=_bufferSize,
+		)
+
+	def copyTo(self, fpath: str, hardLink: bool = False) -> None:
+		if os.path.lexists(fpath):
+			os.remove(fpath)
+		if hardLink and self.isWholeFile():
+			try:
+				os.link(self._path, fpath)
+			except OSError as e:
+				log.debug(f"failed to create hard link {fpath}: {e}")
+			else:
+				return
+		with open(self._path, "rb") as fromFile, open(fpath, "wb") as toFile:
+			copyFileRange(fromFile, toFile, self._offset, self.size())
+
+
+class ZipDataSource(DataSource):
+	"""
+	A member of a ZIP file.
+
+	Members stored without compression are read as a byte range of the
+	ZIP file, deflated members are decompressed while reading.
+	The ZIP file is not kept open (and its central directory is not read
+	again) between entries.
+	"""
+
+	__slots__ = ["_info", "_path"]
+
+	def __init__(self, path: str, info: zipfile.ZipInfo) -> None:
+		self._path = path
+		self._info = info
+
+	def __repr__(self) -> str:
+		return f"ZipDataSource({self._path!r}, {self._info.filename!r})"
+
+	def size(self) -> int:
+		return self._info.file_size
+
+	def _dataOffset(self) -> int:
+		info = self._info
+		with open(self._path, "rb") as file:
+			file.seek(info.header_offset)
+			header = file.read(_zipLocalHeader.size)
+		if len(header) < _zipLocalHeader.size:
+			raise zipfile.BadZipFile(f"truncated file {self._path!r}")
+		signature, nameSize, extraSize = _zipLocalHeader.unpack(header)
+		if signature != _zipLocalHeaderSignature:
+			raise zipfile.BadZipFile(f"bad local file header in {self._path!r}")
+		return info.header_offset + _zipLocalHeader.size + nameSize + extraSize
+
+	def _isStored(self) -> bool:
+		info = self._info
+		return info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1
+
+	def open(self) -> BinaryIO:
+		info = self._info
+		if info.flag_bits & 0x1 or info.compress_type not in {
+			zipfile.ZIP_STORED,
+			zipfile.ZIP_DEFLATED,
+		}:
+			# encrypted, or other compression method
+			with zipfile.ZipFile(self._path) as zf:
+				return io.BytesIO(zf.read(info))
+		raw = _FileRangeIO(self._path, self._dataOffset(), info.compress_size)
+		if info.compress_type == zipfile.ZIP_STORED:
+			return io.BufferedReader(raw, buffer_size=_bufferSize)  # type: ignore
+		return io.BufferedReader(  # type: ignore
+			_InflateIO(raw),
+			buffer_size=_bufferSize,
+		)
+
+	def copyTo(self, fpath: str, hardLink: bool = False) -> None:  # noqa: ARG002
+		if os.path.lexists(fpath):
+			os.remove(fpath)
+		if self._isStored():
+			with open(self._path, "rb") as fromFile, open(fpath, "wb") as toFile:
+				copyFileRange(
+					fromFile,
+					toFile,
+					self._dataOffset(),
+					self._info.file_size,
+				)
+			return
+		with self.open() as fromFile, open(fpath, "wb") as toFile:
+			shutil.copyfileobj(fromFile, toFile, _bufferSize)
@@ -0,0 +1,424 @@
+#
+# Copyright © 2025 Saeed Rasooli <saeed.gnu@gmail.com> (ilius)
+# This file is part of PyGlossary project, https://github.com/ilius/pyglossary
+#
+# This program is a free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. Or on Debian systems, from /usr/share/common-licenses/GPL
+# If not, see <http://www.gnu.org/licenses/gpl.txt>.
+"""
+Dictzip (random-access gzip) file format.
+
+A dictzip file is a gzip file whose deflate stream is made of independently
+compressed chunks, with a table of compressed chunk sizes stored in the "RA"
+extra field of the gzip header. See dictzip(1).
+Files larger than what one header can describe are written as multiple gzip
+members (like idzip does).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import struct
+import time
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from os.path import basename
+from typing import TYPE_CHECKING, Self
+
+if TYPE_CHECKING:
+	import io
+	from concurrent.futures import Future
+	from types import TracebackType
+
+__all__ = ["DictzipReader", "DictzipWriter", "compressFile", "openDictzip"]
+
+log = logging.getLogger("pyglossary")
+
+# same as dictzip, every compressed chunk must fit in 16 bits
+chunkSize = 58315
+
+# gzip extra field (XLEN) is 16 bits: 4 bytes of subfield header,
+# 6 bytes of RA header (version, chunk length, chunk count)
+maxMemberChunks = (0xFFFF - 10) // 2
+
+_FHCRC = 0x02
+_FEXTRA = 0x04
+_FNAME = 0x08
+_FCOMMENT = 0x10
+_OS_UNIX = 3
+
+
+def _compressChunk(data: bytes, level: int) -> bytes:
+	comp = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+	# full flush ends the chunk on a byte boundary without a final block,
+	# so chunks compressed independently can be concatenated
+	return comp.compress(data) + comp.flush(zlib.Z_FULL_FLUSH)
+
+
+def _finalBlock() -> bytes:
+	return zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS).flush(zlib.Z_FINISH)
+
+
+class DictzipWriter:
+	"""
+	Binary file-like object that writes a dictzip file.
+
+	Chunks are compressed in a thread pool (zlib releases the GIL)
+	while the caller keeps writing. Compressed chunks are kept in a
+	temporary file next to `filename` until the gzip header of the
+	member (which includes the chunk size table) can be written.
+	"""
+
+	def __init__(
+		self,
+		filename: str,
+		origName: str = "",
+		level: int = 9,
+		workers: int = 0,
+	) -> None:
+		self.name = filename
+		self._origName = origName
+		self._level = level
+		self._mtime = int(time.time())
+		self._file = open(filename, "wb")
+		self._tmpPath = filename + ".tmp"
+		self._body = open(self._tmpPath, "w+b")
+		if workers <= 0:
+			workers = min(8, os.cpu_count() or 1)
+		self._pool = ThreadPoolExecutor(max_workers=workers)
+		self._maxInFlight = 2 * workers
+		self._inFlight: deque[Future[bytes]] = deque()
+		self._buffer = bytearray()
+		self._pos = 0
+		# state of the current member:
+		self._sizes: list[int] = []
+		self._crc = 0
+		self._isize = 0
+		self.closed = False
+
+	def __enter__(self) -> Self:
+		return self
+
+	def __exit__(
+		self,
+		exc_type: type[BaseException] | None,
+		exc_val: BaseException | None,
+		exc_tb: TracebackType | None,
+	) -> None:
+		self.close()
+
+	def tell(self) -> int:
+		"""Return uncompressed position."""
+		return self._pos
+
+	def write(self, data: bytes) -> int:
+		buffer = self._buffer
+		buffer += data
+		self._pos += len(data)
+		if len(buffer) < chunkSize:
+			return len(data)
+		count = len(buffer) // chunkSize * chunkSize
+		view = memoryview(buffer)
+		for start in range(0, count, chunkSize):
+			self._addChunk(bytes(view[start : start + chunkSize]))
+		view.release()
+		del buffer[:count]
+		return len(data)
+
+	def _addChunk(self, chunk: bytes) -> None:
+		if len(self._sizes) + len(self._inFlight) >= maxMemberChunks:
+			self._finishMember()
+		self._crc = zlib.crc32(chunk, self._crc)
+		self._isize += len(chunk)
+		self._inFlight.append(self._pool.submit(_compressChunk, chunk, self._level))
+		if len(self._inFlight) >= self._maxInFlight:
+			self._writeCompressed(self._inFlight.popleft().result())
+
+	def _writeCompressed(self, data: bytes) -> None:
+		self._sizes.append(len(data))
+		self._body.write(data)
+
+	def _header(self) -> bytes:
+		sizes = self._sizes
+		ra = struct.pack(
+			f"<HHH{len(sizes)}H",
+			1,  # version
+			chunkSize,
+			len(sizes),
+			*sizes,
+		)
+		extra = b"RA" + struct.pack("<H", len(ra)) + ra
+		flags = _FEXTRA
+		name = b""
+		if self._origName:
+			flags |= _FNAME
+			name = self._origName.encode("latin-1", "replace") + b"\x00"
+		return (
+			struct.pack(
+				"<BBBBIBB",
+				0x1F,
+				0x8B,
+				zlib.DEFLATED,
+				flags,
+				self._mtime,
+				2 if self._level == 9 else 0,
+				_OS_UNIX,
+			)
+			+ struct.pack("<H", len(extra))
+			+ extra
+			+ name
+		)
+
+	def _finishMember(self) -> None:
+		while self._inFlight:
+			self._writeCompressed(self._inFlight.popleft().result())
+		self._body.write(_finalBlock())
+		self._body.write(struct.pack("<II", self._crc, self._isize & 0xFFFFFFFF))
+		self._file.write(self._header())
+		self._body.seek(0)
+		shutil.copyfileobj(self._body, self._file)
+		self._body.seek(0)
+		self._body.truncate()
+		self._sizes = []
+		self._crc = 0
+		self._isize = 0
+
+	def close(self) -> None:
+		if self.closed:
+			return
+		self.closed = True
+		try:
+			if self._buffer or not (self._sizes or self._inFlight):
+				self._addChunk(bytes(self._buffer))
+				self._buffer.clear()
+			self._finishMember()
+		finally:
+			self._pool.shutdown()
+			self._body.close()
+			os.remove(self._tmpPath)
+			self._file.close()
+
+
+def compressFile(filename: str, level: int = 9, workers: int = 0) -> None:
+	"""Compress `filename` into `filename.dz` and remove `filename`."""
+	log.debug(f"compressing {filename} to {filename}.dz")
+	with (
+		open(filename, "rb") as inputFile,
+		DictzipWriter(
+			filename + ".dz",
+			origName=basename(filename),
+			level=level,
+			workers=workers,
+		) as outputFile,
+	):
+		shutil.copyfileobj(inputFile, outputFile, chunkSize * 16)
+	os.remove(filename)
+
+
+class _NotDictzipError(Exception):
+	pass
+
+
+class DictzipReader:
+	"""
+	Binary read-only file-like object with random access to a dictzip file.
+
+	Only the chunks containing the requested range are decompressed,
+	the last `cacheSize` decompressed chunks are kept in memory.
+	"""
+
+	def __init__(self, filename: str, cacheSize: int = 32) -> None:
+		self.name = filename
+		self._file = open(filename, "rb")
+		self._cacheSize = cacheSize
+		self._cache: OrderedDict[int, bytes] = OrderedDict()
+		self._pos = 0
+		# uncompressed start, compressed file offset and compressed size
+		# of every chunk in the file:
+		self._chunkStarts: list[int] = []
+		self._chunkOffsets: list[int] = []
+		self._chunkSizes: list[int] = []
+		self._size = 0
+		try:
+			self._readMembers()
+		except Exception:
+			self._file.close()
+			raise
+
+	@property
+	def closed(self) -> bool:
+		return self._file.closed
+
+	def __enter__(self) -> Self:
+		return self
+
+	def __exit__(
+		self,
+		exc_type: type[BaseException] | None,
+		exc_val: BaseException | None,
+		exc_tb: TracebackType | None,
+	) -> None:
+		self.close()
+
+	def close(self) -> None:
+		self._file.close()
+		self._cache.clear()
+
+	def __len__(self) -> int:
+		"""Return uncompressed size."""
+		return self._size
+
+	def _readMembers(self) -> None:
+		file = self._file
+		fileSize = os.fstat(file.fileno()).st_size
+		offset = 0
+		while offset < fileSize:
+			offset = self._readMember(offset)
+
+	def _readHeader(self, offset: int) -> tuple[int, list[int], int]:
+		"""Return (chunkLen, chunkSizes, dataOffset)."""
+		file = self._file
+		file.seek(offset)
+		header = file.read(10)
+		if len(header) < 10 or header[:3] != b"\x1f\x8b\x08":
+			raise _NotDictzipError(f"invalid gzip header at {offset}")
+		flags = header[3]
+		if not flags & _FEXTRA:
+			raise _NotDictzipError("gzip header has no extra field")
+		(extraLen,) = struct.unpack("<H", file.read(2))
+		extra = file.read(extraLen)
+		chunkLen = 0
+		sizes: list[int] = []
+		pos = 0
+		while pos + 4 <= len(extra):
+			subLen = struct.unpack("<H", extra[pos + 2 : pos + 4])[0]
+			if extra[pos : pos + 2] == b"RA":
+				_version, chunkLen, chunkCount = struct.unpack(
+					"<HHH",
+					extra[pos + 4 : pos + 10],
+				)
+				sizes = list(
+					struct.unpack(
+						f"<{chunkCount}H",
+						extra[pos + 10 : pos + 10 + 2 * chunkCount],
+					),
+				)
+				break
+			pos += 4 + subLen
+		if not chunkLen:
+			raise _NotDictzipError("gzip header has no RA extra field")
+		if flags & _FNAME:
+			while file.read(1) not in {b"\x00", b""}:
+				pass
+		if flags & _FCOMMENT:
+			while file.read(1) not in {b"\x00", b""}:
+				pass
+		if flags & _FHCRC:
+			file.read(2)
+		return chunkLen, sizes, file.tell()
+
+	def _readMember(self, offset: int) -> int:
+		"""Read the member starting at offset, return offset of the next one."""
+		chunkLen, sizes, dataOffset = self._readHeader(offset)
+		start = self._size
+		for size in sizes:
+			self._chunkStarts.append(start)
+			self._chunkOffsets.append(dataOffset)
+			self._chunkSizes.append(size)
+			start += chunkLen
+			dataOffset += size
+		if not sizes:
+			return dataOffset
+		# decompress the last chunk to find its length, and the end of
+		# deflate stream (which may come after the last chunk)
+		file = self._file
+		file.seek(self._chunkOffsets[-1])
+		decomp = zlib.decompressobj(-zlib.MAX_WBITS)
+		lastChunkLen = 0
+		while not decomp.eof:
+			data = file.read(chunkLen)
+			if not data:
+				raise ValueError(f"{self.name}: unexpected end of file")
+			lastChunkLen += len(decomp.decompress(data))
+		self._size = start - chunkLen + lastChunkLen
+		# skip CRC32 and ISIZE
+		return file.tell() - len(decomp.unused_data) + 8
+
+	def _getChunk(self, index: int) -> bytes:
+		cache = self._cache
+		data = cache.get(index)
+		if data is not None:
+			cache.move_to_end(index)
+			return data
+		self._file.seek(self._chunkOffsets[index])
+		data = zlib.decompressobj(-zlib.MAX_WBITS).decompress(
+			self._file.read(self._chunkSizes[index]),
+		)
+		cache[index] = data
+		if len(cache) > self._cacheSize:
+			cache.popitem(last=False)
+		return data
+
+	def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+		if whence == os.SEEK_CUR:
+			offset += self._pos
+		elif whence == os.SEEK_END:
+			offset += self._size
+		elif whence != os.SEEK_SET:
+			raise ValueError(f"invalid {whence=}")
+		if offset < 0:
+			raise ValueError(f"negative seek position {offset}")
+		self._pos = offset
+		return offset
+
+	def tell(self) -> int:
+		return self._pos
+
+	def read(self, size: int = -1) -> bytes:
+		pos = self._pos
+		end = self._size if size < 0 else min(pos + size, self._size)
+		if pos >= end:
+			return b""
+		parts: list[bytes] = []
+		index = bisect_right(self._chunkStarts, pos) - 1
+		while pos < end:
+			chunkStart = self._chunkStarts[index]
+			chunk = self._getChunk(index)
+			parts.append(chunk[pos - chunkStart : end - chunkStart])
+			pos = chunkStart + len(chunk)
+			index += 1
+		self._pos = end
+		return b"".join(parts)
+
+
+def openDictzip(
+	filename: str,
+	cacheSize: int = 32,
+) -> DictzipReader | io.BufferedIOBase:
+	"""
+	Open a .dz file for reading.
+
+	Return a DictzipReader, or a gzip file object if the file is
+	a plain gzip file (without the chunk table).
+	"""
+	try:
+		return DictzipReader(filename, cacheSize=cacheSize)
+	except _NotDictzipError as e:
+		import gzip
+
+		log.debug(f"{filename}: {e}, using gzip")
+		return gzip.open(filename, mode="rb")  # type: ignore
@@ -35,7 +35,7 @@ from os.path import join
 from typing import TYPE_CHECKING, cast
 
 from .os_utils import indir, rmtree
-from .repro_zipfile import ReproducibleZipFile as ZipFile
+from .parallel_zip import ParallelZipWriter
 
 if TYPE_CHECKING:
 	import io
@@ -163,6 +163,8 @@ class EbookWriter:
 		self.files: list[dict[str, Any]] = []
 		self.manifest_files: list[dict[str, str]] = []
 		self._group_labels: list[str] = []
+		# if compressing, files are added to ZIP file as they are produced
+		self._zipWriter: ParallelZipWriter | None = None
 
 	def finish(self) -> None:
 		self._filename = ""
@@ -184,9 +186,12 @@ class EbookWriter:
 	) -> None:
 		if mode is None:
 			mode = zipfile.ZIP_DEFLATED
-		file_path = os.path.join(self._tmpDir, relative_path)
-		with self.myOpen(file_path, "wb") as file_obj:
-			file_obj.write(contents)
+		if self._zipWriter is not None:
+			self._zipWriter.writestr(relative_path, contents, compressType=mode)
+		if self._zipWriter is None or self._keep:
+			file_path = os.path.join(self._tmpDir, relative_path)
+			with self.myOpen(file_path, "wb") as file_obj:
+				file_obj.write(contents)
 		self.files.append(
 			{
 				"path": relative_path,
@@ -429,20 +434,26 @@ class EbookWriter:
 		self._filename = filename
 
 	def _doZip(self) -> None:
-		with ZipFile(
-			self._filename,
-			mode="w",
-			compression=zipfile.ZIP_DEFLATED,
-		) as zipFp:
-			for fileDict in self.files:
-				zipFp.write(
-					fileDict["path"],
-					compress_type=fileDict["mode"],
-				)
+		assert self._zipWriter is not None
+		self._zipWriter.close()
+		self._zipWriter = None
 		if not self._keep:
 			rmtree(self._tmpDir)
 
 	def write(self) -> Generator[None, EntryType, None]:
+		if not self._compress:
+			yield from self._write()
+			return
+		self._zipWriter = ParallelZipWriter(self._filename)
+		try:
+			yield from self._write()
+		except BaseException:
+			if self._zipWriter is not None:
+				self._zipWriter.abort()
+				self._zipWriter = None
+			raise
+
+	def _write(self) -> Generator[None, EntryType, None]:
 		filename = self._filename
 		# self._group_by_prefix_length
 		# self._include_index_page
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import io
 import logging
 import os
 import re
@@ -14,10 +15,10 @@ from .text_utils import joinByBar
 
 if TYPE_CHECKING:
 	from collections.abc import Callable
-	from typing import Any
+	from typing import BinaryIO
 
+	from .data_source import DataSource
 	from .entry_base import MultiStr
-	from .glossary_types import RawEntryType
 
 
 __all__ = ["DataEntry", "Entry"]
@@ -31,6 +32,7 @@ class DataEntry(BaseEntry):  # noqa: PLR0904
 		"_byteProgress",
 		"_data",
 		"_fname",
+		"_source",
 		"_tmpPath",
 	]
 
@@ -48,7 +50,17 @@ class DataEntry(BaseEntry):  # noqa: PLR0904
 		data: bytes | None = None,
 		tmpPath: str | None = None,
 		byteProgress: tuple[int, int] | None = None,
+		source: DataSource | None = None,
 	) -> None:
+		"""
+		Create a new data entry (resource file).
+
+		Contents is given as one of:
+			data: bytes, written to tmpPath if tmpPath is given
+			tmpPath: path of a file that can be moved by save()
+			source: a DataSource that is read (or copied) only when needed,
+				and never modified.
+		"""
 		if data is not None and tmpPath:
 			os.makedirs(dirname(tmpPath), mode=0o755, exist_ok=True)
 			with open(tmpPath, "wb") as toFile:
@@ -59,12 +71,19 @@ class DataEntry(BaseEntry):  # noqa: PLR0904
 		self._data = data  # bytes instance
 		self._tmpPath = tmpPath
 		self._byteProgress = byteProgress  # tuple[int, int] | None
+		self._source = source
 
 	def getFileName(self) -> str:
 		return self._fname
 
+	@property
+	def source(self) -> DataSource | None:
+		return self._source
+
 	@property
 	def data(self) -> bytes:
+		if self._source is not None:
+			return self._source.read()
 		if self._tmpPath:
 			with open(self._tmpPath, "rb") as file:
 				return file.read()
@@ -72,11 +91,30 @@ class DataEntry(BaseEntry):  # noqa: PLR0904
 			return self._data if self._data is not None else b""
 
 	def size(self) -> int:
+		if self._source is not None:
+			return self._source.size()
 		if self._tmpPath:
 			return getsize(self._tmpPath)
 		return len(self._data or b"")
 
-	def save(self, directory: str) -> str:
+	def open(self) -> BinaryIO:
+		"""Open contents for reading, must be closed by caller."""
+		if self._source is not None:
+			return self._source.open()
+		if self._tmpPath:
+			return open(self._tmpPath, "rb")
+		return io.BytesIO(self._data or b"")
+
+	def save(self, directory: str, hardLink: bool = False) -> str:
+		"""
+		Save to directory (under relative path getFileName()),
+		return the full path, or empty string on error.
+
+		hardLink: if the entry has a source that is a whole file,
+		create a hard link to it instead of copying (falls back to copy).
+		Only for files owned by us (like temp files), since editing either
+		file in place would change the other one too.
+		"""
 		fname = self._fname
 		# Refuse absolute paths, `..` traversal, and any path that resolves
 		# outside the target directory (covers symlink + drive-letter cases
@@ -94,10 +132,10 @@ class DataEntry(BaseEntry):  # noqa: PLR0904
 		fdir = dirname(fpath)
 		try:
 			os.makedirs(fdir, mode=0o755, exist_ok=True)
-			if self._tmpPath:
-				log.debug(f"DataEntry: moving {self._tmpPath} to {fpath}")
-				shutil.move(self._tmpPath, fpath)
-				self._tmpPath = fpath
+			if self._source is not None:
+				self._source.copyTo(fpath, hardLink=hardLink)
+			elif self._tmpPath:
+				self._saveTmpFile(fpath)
 			else:
 				with open(fpath, "wb") as toFile:
 					toFile.write(self._data or b"")  # NESTED 4
@@ -108,6 +146,21 @@ class DataEntry(BaseEntry):  # noqa: PLR0904
 			return ""
 		return fpath
 
+	def _saveTmpFile(self, fpath: str) -> None:
+		tmpPath = self._tmpPath
+		assert tmpPath
+		if os.stat(tmpPath).st_nlink > 1:
+			# hard link to a file we don't own, like an input resource file
+			# (see Glossary._dataEntryToRaw), moving it would make the output
+			# file a hard link to that file too
+			log.debug(f"DataEntry: copying {tmpPath} to {fpath}")
+			shutil.copyfile(tmpPath, fpath)
+			os.remove(tmpPath)
+		else:
+			log.debug(f"DataEntry: moving {tmpPath} to {fpath}")
+			shutil.move(tmpPath, fpath)
+		self._tmpPath = fpath
+
 	@property
 	def s_term(self) -> str:
 		return self._fname
@@ -208,16 +261,6 @@ class Entry(BaseEntry):  # noqa: PLR0904
 	def isData(cls) -> bool:
 		return False
 
-	@staticmethod
-	def getRawEntrySortKey(
-		key: Callable[[list[str]], Any],
-	) -> Callable[[RawEntryType], Any]:
-		def newKey(x: RawEntryType) -> Any:
-			# x is rawEntry, so x[2:] is list[bytes]: list of words in bytes
-			return key([b.decode("utf-8") for b in x[2:]])
-
-		return newKey
-
 	def __init__(
 		self,
 		term: MultiStr | None = None,
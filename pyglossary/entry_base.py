@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
 	from collections.abc import Callable
+	from typing import BinaryIO
 
 __all__ = ["BaseEntry", "MultiStr"]
 
@@ -114,7 +115,10 @@ class BaseEntry(ABC):  # noqa: PLR0904
 	def size(self) -> int:
 		raise NotImplementedError
 
-	def save(self, directory: str) -> str:
+	def open(self) -> BinaryIO:
+		raise NotImplementedError
+
+	def save(self, directory: str, hardLink: bool = False) -> str:
 		raise NotImplementedError
 
 	@property
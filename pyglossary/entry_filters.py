@@ -45,6 +45,7 @@ class EntryFilterType(typing.Protocol):
 	name: str = ""
 	desc: str = ""
 	falseComment: str = ""
+	parallel: bool = False
 
 	def __init__(self, glos: _GlossaryType) -> None:
 		raise NotImplementedError
@@ -56,14 +57,32 @@ class EntryFilterType(typing.Protocol):
 		raise NotImplementedError
 
 
+class _GlossaryLangs:
+	"""Picklable stand-in for glossary, used by filters in worker processes."""
+
+	def __init__(self, sourceLang: Lang | None, targetLang: Lang | None) -> None:
+		self.sourceLang = sourceLang
+		self.targetLang = targetLang
+
+
 class EntryFilter:
 	name: str = ""
 	desc: str = ""
 	falseComment: str = ""
+	# stateless filters that only depend on the entry they are given
+	# can be run in worker processes, see parallel_filters.py
+	parallel: bool = False
 
 	def __init__(self, glos: _GlossaryType) -> None:
 		self.glos = glos
 
+	def __getstate__(self) -> dict[str, typing.Any]:
+		state = self.__dict__.copy()
+		glos = state.get("glos")
+		if glos is not None:
+			state["glos"] = _GlossaryLangs(glos.sourceLang, glos.targetLang)
+		return state
+
 	def prepare(self) -> None:
 		"""Run this after glossary info is set and ready."""
 
@@ -81,6 +100,7 @@ class EntryFilter:
 class TrimWhitespaces(EntryFilter):
 	name = "trim_whitespaces"
 	desc = "Remove leading/trailing whitespaces from term(s) and definition"
+	parallel = True
 
 	def run(self, entry: EntryType) -> EntryType | None:  # noqa: PLR6301
 		entry.strip()
@@ -91,6 +111,7 @@ class TrimWhitespaces(EntryFilter):
 class NonEmptyTermFilter(EntryFilter):
 	name = "non_empty_term"
 	desc = "Skip entries with empty terms"
+	parallel = True
 
 	def run(self, entry: EntryType) -> EntryType | None:  # noqa: PLR6301
 		if not entry.s_term:
@@ -101,6 +122,7 @@ class NonEmptyTermFilter(EntryFilter):
 class NonEmptyDefiFilter(EntryFilter):
 	name = "non_empty_defi"
 	desc = "Skip entries with empty definition"
+	parallel = True
 
 	def run(self, entry: EntryType) -> EntryType | None:  # noqa: PLR6301
 		if not entry.defi:
@@ -111,6 +133,7 @@ class NonEmptyDefiFilter(EntryFilter):
 class RemoveEmptyAndDuplicateAltTerms(EntryFilter):
 	name = "remove_empty_dup_alt_terms"
 	desc = "Remove empty and duplicate alternate terms"
+	parallel = True
 
 	def run(self, entry: EntryType) -> EntryType | None:  # noqa: PLR6301
 		entry.removeEmptyAndDuplicateAltTerms()
@@ -123,6 +146,7 @@ class FixUnicode(EntryFilter):
 	name = "utf8_check"
 	desc = "Fix Unicode in term(s) and definition"
 	falseComment = "Do not fix Unicode in term(s) and definition"
+	parallel = True
 
 	def run(self, entry: EntryType) -> EntryType | None:  # noqa: PLR6301
 		entry.editFuncTerm(fixUtf8Str)
@@ -134,6 +158,7 @@ class LowerTerm(EntryFilter):
 	name = "lower"
 	desc = "Lowercase term(s)"
 	falseComment = "Do not lowercase terms before writing"
+	parallel = True
 
 	def __init__(self, glos: _GlossaryType) -> None:
 		EntryFilter.__init__(self, glos)
@@ -154,6 +179,7 @@ class LowerTerm(EntryFilter):
 class RTLDefi(EntryFilter):
 	name = "rtl"
 	desc = "Make definition right-to-left"
+	parallel = True
 
 	def run(self, entry: EntryType) -> EntryType | None:  # noqa: PLR6301
 		entry.editFuncDefi(lambda defi: f'<div dir="rtl">{defi}</div>')
@@ -163,6 +189,7 @@ class RTLDefi(EntryFilter):
 class MarkdownToHtml(EntryFilter):
 	name = "md_to_html"
 	desc = "Treat plaintext definitions as markdown and convert them to HTML"
+	parallel = True
 
 	def run(self, entry: EntryType) -> EntryType | None:  # noqa: PLR6301
 		if entry.defiFormat != "m":
@@ -177,6 +204,7 @@ class MarkdownToHtml(EntryFilter):
 class RemoveHtmlTagsAll(EntryFilter):
 	name = "remove_html_all"
 	desc = "Remove all HTML tags (not their contents) from definition"
+	parallel = True
 
 	def __init__(
 		self,
@@ -219,6 +247,7 @@ class RemoveHtmlTagsAll(EntryFilter):
 class RemoveHtmlTags(EntryFilter):
 	name = "remove_html"
 	desc = "Remove given comma-separated HTML tags (not their contents) from definition"
+	parallel = True
 
 	def __init__(self, glos: _GlossaryType, tagsStr: str) -> None:
 		tags = tagsStr.split(",")
@@ -259,6 +288,7 @@ class StripFullHtml(EntryFilter):
 class NormalizeHtml(EntryFilter):
 	name = "normalize_html"
 	desc = "Normalize HTML tags in definition (WIP)"
+	parallel = True
 
 	_tags = (
 		"a",
@@ -307,6 +337,7 @@ class NormalizeHtml(EntryFilter):
 class SkipDataEntry(EntryFilter):
 	name = "skip_resources"
 	desc = "Skip resources / data files"
+	parallel = True
 
 	def run(self, entry: EntryType) -> EntryType | None:  # noqa: PLR6301
 		if entry.isData():
@@ -317,6 +348,7 @@ class SkipDataEntry(EntryFilter):
 class LanguageCleanup(EntryFilter):
 	name = "lang"
 	desc = "Language-specific cleanup/fixes"
+	parallel = True
 
 	def __init__(self, glos: _GlossaryType) -> None:
 		EntryFilter.__init__(self, glos)
@@ -379,6 +411,7 @@ class PreventDuplicateTerms(EntryFilter):
 class SkipTermRegex(EntryFilter):
 	name = "skip_term_regex"
 	desc = "Skip entries with any term  matching regexp"
+	parallel = True
 
 	def __init__(self, glos: _GlossaryType, regexStr: str) -> None:
 		EntryFilter.__init__(self, glos)
@@ -417,6 +450,7 @@ class SkipEntriesWithDuplicateHeadword(EntryFilter):
 class TrimArabicDiacritics(EntryFilter):
 	name = "trim_arabic_diacritics"
 	desc = "Trim Arabic diacritics from headword (first term)"
+	parallel = True
 
 	def __init__(self, glos: _GlossaryType) -> None:
 		EntryFilter.__init__(self, glos)
@@ -436,6 +470,7 @@ class TrimArabicDiacritics(EntryFilter):
 class UnescapeTermLinks(EntryFilter):
 	name = "unescape_word_links"  # used in config, do not change
 	desc = "Unescape Term/Entry Links"
+	parallel = True
 
 	def __init__(self, glos: _GlossaryType) -> None:
 		from .html_utils import unescape_unicode
@@ -15,21 +15,33 @@
 # You should have received a copy of the GNU General Public License along
 # with this program. Or on Debian systems, from /usr/share/common-licenses/GPL
 # If not, see <http://www.gnu.org/licenses/gpl.txt>.
+"""
+In-memory list of entries, used in indirect mode (when sorting entries).
+
+Raw entries (list of bytes: defiFormat, defi, terms...) are not kept as
+Python objects. All their parts are concatenated in one bytearray (arena),
+and the boundaries of parts are kept in arrays, so each entry costs a few
+integers in memory instead of a list and several bytes objects.
+
+Sorting computes the key of each entry once, and keeps only the sorted
+order of entry indexes (argsort), entries are not moved.
+"""
+
 from __future__ import annotations
 
 import logging
+from array import array
+from itertools import pairwise
 from time import perf_counter as now
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-	from collections.abc import Callable, Iterator
+	from collections.abc import Callable, Iterable, Iterator
 	from typing import Any
 
 	from .glossary_types import EntryType, RawEntryType
 	from .sort_keys import NamedSortKey
 
-from .entry import Entry
-
 __all__ = ["EntryList"]
 
 log = logging.getLogger("pyglossary")
@@ -41,24 +53,60 @@ class EntryList:
 		entryToRaw: Callable[[EntryType], RawEntryType],
 		entryFromRaw: Callable[[RawEntryType], EntryType],
 	) -> None:
-		self._l: list[RawEntryType] = []
 		self._entryToRaw = entryToRaw
 		self._entryFromRaw = entryFromRaw
-		self._sortKey: Callable[[RawEntryType], Any] | None = None
+		self._sortKey: Callable[[list[str]], Any] | None = None
+		self._initArrays()
+
+	def _initArrays(self) -> None:
+		self._arena = bytearray()
+		# part j (of all entries) is self._arena[self._partEnds[j]:self._partEnds[j+1]]
+		# and parts of entry i are parts self._partIndex[i] to self._partIndex[i+1]
+		self._partEnds = array("Q", [0])
+		self._partIndex = array("Q", [0])
+		# indexes of entries in sorted order, or None if not sorted
+		self._order: array[int] | None = None
 
 	def append(self, entry: EntryType) -> None:
-		self._l.append(self._entryToRaw(entry))
+		rawEntry = self._entryToRaw(entry)
+		if self._order is not None:
+			# like appending to a sorted list
+			self._order.append(len(self))
+		arena = self._arena
+		partEnds = self._partEnds
+		for part in rawEntry:
+			arena += part
+			partEnds.append(len(arena))
+		self._partIndex.append(len(partEnds) - 1)
 
 	def clear(self) -> None:
-		self._l.clear()
+		self._initArrays()
 
 	def __len__(self) -> int:
-		return len(self._l)
+		return len(self._partIndex) - 1
+
+	def _rawEntry(self, index: int, skip: int = 0) -> list[bytearray]:
+		"""
+		Return raw entry at `index` (in order of append),
+		without its first `skip` parts.
+		"""
+		arena = self._arena
+		bounds = self._partEnds[
+			self._partIndex[index] + skip : self._partIndex[index + 1] + 1
+		]
+		return [arena[start:end] for start, end in pairwise(bounds)]
 
 	def __iter__(self) -> Iterator[EntryType]:
 		entryFromRaw = self._entryFromRaw
-		for rawEntry in self._l:
-			yield entryFromRaw(rawEntry)
+		arena = self._arena
+		partEnds = self._partEnds
+		partIndex = self._partIndex
+		order: Iterable[int] = range(len(self)) if self._order is None else self._order
+		for index in order:
+			bounds = partEnds[partIndex[index] : partIndex[index + 1] + 1]
+			yield entryFromRaw(
+				[arena[start:end] for start, end in pairwise(bounds)],
+			)
 
 	def hasSortKey(self) -> bool:
 		return bool(self._sortKey)
@@ -76,16 +124,21 @@ class EntryList:
 		kwargs = writeOptions.copy()
 		if sortEncoding:
 			kwargs["sortEncoding"] = sortEncoding
-		sortKey = namedSortKey.normal(**kwargs)
-		self._sortKey = Entry.getRawEntrySortKey(
-			key=sortKey,
-		)
+		self._sortKey = namedSortKey.normal(**kwargs)
 
 	def sort(self) -> None:
-		if self._sortKey is None:
+		sortKey = self._sortKey
+		if sortKey is None:
 			raise ValueError("EntryList.sort: sortKey is not set")
 		t0 = now()
-		self._l.sort(key=self._sortKey)
+		rawEntry = self._rawEntry
+		# parts 2: are terms, see Glossary._entryToRaw
+		keys = [
+			sortKey([b.decode("utf-8") for b in rawEntry(index, skip=2)])
+			for index in range(len(self))
+		]
+		# stable, so entries with equal keys keep their order
+		self._order = array("Q", sorted(range(len(keys)), key=keys.__getitem__))
 		log.info(f"Sorting took {now() - t0:.1f} seconds")
 
 	def close(self) -> None:
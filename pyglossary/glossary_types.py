@@ -10,6 +10,9 @@ from collections.abc import (
 from typing import TYPE_CHECKING, Any, Protocol
 
 if TYPE_CHECKING:
+	from typing import BinaryIO
+
+	from .data_source import DataSource
 	from .langs import Lang
 	from .sort_keys import NamedSortKey
 
@@ -43,7 +46,9 @@ class EntryType(Protocol):  # noqa: PLR0904
 
 	def size(self) -> int: ...
 
-	def save(self, directory: str) -> str: ...
+	def open(self) -> BinaryIO: ...
+
+	def save(self, directory: str, hardLink: bool = False) -> str: ...
 
 	@property
 	def s_term(self) -> str: ...
@@ -172,6 +177,8 @@ class ReaderGlossaryType(GlossaryInfoCommonType, Protocol):
 
 	def newDataEntry(self, fname: str, data: bytes) -> EntryType: ...
 
+	def newFileDataEntry(self, fname: str, source: DataSource) -> EntryType: ...
+
 	@property
 	def progressbar(self) -> bool: ...
 
@@ -30,9 +30,8 @@ from os.path import (
 )
 from time import perf_counter as now
 from typing import TYPE_CHECKING, cast
-from uuid import uuid1
 
-from . import core
+from . import core, startup_profile
 from .core import cacheDir, log
 from .entry import DataEntry, Entry
 from .entry_filters import (
@@ -54,16 +53,19 @@ from .glossary_progress import GlossaryProgress
 from .glossary_utils import Error, ReadError, WriteError, splitFilenameExt
 from .info import c_name
 from .os_utils import rmtree, showMemoryUsage
+from .parallel_filters import ParallelFilterIterator, splitParallelFilters
 from .plugin_handler import PluginHandler
 from .queued_iter import QueuedIterator
 from .sort_keys import defaultSortKeyName, lookupSortKey
 from .sq_entry_list import SqEntryList
+from .stage_stats import StageStats, entrySize, filesSnapshot, stageName
 
 if TYPE_CHECKING:
 	from collections.abc import Callable, Iterable, Iterator
 	from typing import Any
 
 	from .config_type import ConfigType
+	from .data_source import DataSource
 	from .entry_base import MultiStr
 	from .entry_filters import EntryFilterType
 	from .glossary_types import (
@@ -191,6 +193,7 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 		self._sqlite = False
 		self._cleanupPathList: set[str] = set()
 		self._readOptions: dict[str, Any] | None = None
+		self._stageStats: StageStats | None = None
 
 		self.initVars()
 
@@ -236,7 +239,7 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 	def _dataEntryToRaw(self, entry: DataEntry) -> RawEntryType:
 		b_fpath = b""
 		if self.tmpDataDir:
-			b_fpath = entry.save(self.tmpDataDir).encode("utf-8")
+			b_fpath = entry.save(self.tmpDataDir, hardLink=True).encode("utf-8")
 		return (b"b", b_fpath, entry.getFileName().encode("utf-8"))
 
 	def _entryToRaw(self, entry: EntryType) -> RawEntryType:
@@ -407,6 +410,8 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 		iterable = self._progressIter(self._data)
 
 		filters = self._entryFiltersExtra
+		if filters and self._stageStats is not None:
+			filters = self._stageStats.wrapFilters(filters)
 		if not filters:
 			self.progressInit("Writing")
 			yield from iterable
@@ -426,7 +431,7 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 		for reader in self._readers:
 			self.progressInit("Converting")
 
-			iterator = self._progressIter(reader)
+			iterator = self._readerIter(reader)
 
 			iterator = self._applyEntryFiltersGen(iterator)
 
@@ -441,6 +446,13 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 				reader.close()
 			self.progressEnd()
 
+	def _readerIter(self, reader: Any) -> Iterable[EntryType]:
+		iterable = self._progressIter(reader)
+		stats = self._stageStats
+		if stats is None:
+			return iterable
+		return stats.timeIter(iterable, stats.counter("read", stageName(reader)))  # type: ignore
+
 	# This iterator/generator does not give None entries.
 	# And Entry is not falsable, so bool(entry) is always True.
 	# Since ProgressBar is already handled with an EntryFilter, there is
@@ -451,10 +463,37 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 	) -> Iterator[EntryType]:
 		entry: EntryType | None
 
+		entryFilters = self._entryFilters
+
+		iterable = startup_profile.markFirst(iterable, "first_entry")
+
+		# run stateless filters in worker processes, and the rest here
+		processes = int(os.getenv("PYGLOSSARY_FILTER_PROCESSES") or 0)
+		if processes > 1:
+			parallelFilters, entryFilters = splitParallelFilters(entryFilters)
+			if parallelFilters:
+				log.info(
+					f"Running {len(parallelFilters)} entry filters"
+					f" in {processes} processes",
+				)
+				iterable = ParallelFilterIterator(
+					iterable,
+					parallelFilters,
+					processes,
+				)
+				if self._stageStats is not None:
+					iterable = self._stageStats.timeIter(  # type: ignore
+						iterable,
+						self._stageStats.counter("filter", "parallel"),
+					)
+
+		if self._stageStats is not None:
+			entryFilters = self._stageStats.wrapFilters(entryFilters)
+
 		for entry in iterable:
 			if entry is None:
 				continue
-			for entryFilter in self._entryFilters:
+			for entryFilter in entryFilters:
 				entry = entryFilter.run(entry)  # noqa: PLW2901
 				if entry is None:
 					break
@@ -631,6 +670,8 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 				tmpPath=join(self._tmpDataDir, fname.replace("/", "_")),
 			)
 
+		from uuid import uuid1
+
 		tmpDir = join(cacheDir, "tmp")
 		os.makedirs(tmpDir, mode=0o700, exist_ok=True)
 		self._cleanupPathList.add(tmpDir)
@@ -640,6 +681,13 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 			tmpPath=join(tmpDir, uuid1().hex),
 		)
 
+	def newFileDataEntry(self, fname: str, source: DataSource) -> EntryType:  # noqa: PLR6301
+		"""
+		Create a data entry whose contents stays in source (a file, a byte
+		range of a file, or a ZIP member) until it is read or copied.
+		"""
+		return DataEntry(fname, source=source)
+
 	# ________________________________________________________________________#
 
 	# def _hasWriteAccessToDir(self, dirPath: str) -> None:
@@ -674,6 +722,8 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 		# 	self._tmpDataDir = f"{filename}_res"
 		# else:
 		if not filename:
+			from uuid import uuid1
+
 			filename = uuid1().hex
 		self._tmpDataDir = join(cacheDir, os.path.basename(filename) + "_res")
 		log.debug(f"tmpDataDir = {self._tmpDataDir}")
@@ -778,6 +828,11 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 
 		reader = self._createReader(formatName, options)
 		self._openReader(reader, filenameUC)
+		if self._stageStats is not None:
+			self._stageStats.addInputFiles(
+				self._stageStats.counter("read", stageName(reader)),
+				filenameUC,
+			)
 
 		self._readOptions = options
 
@@ -799,7 +854,7 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 		showMemoryUsage()
 
 		self.progressInit("Reading")
-		iterator = self._progressIter(reader)
+		iterator = self._readerIter(reader)
 		iterator = self._applyEntryFiltersGen(iterator)
 		try:
 			for entry in iterator:
@@ -929,14 +984,36 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 
 		for gen in genList:
 			gen.send(None)
-		for entry in self:
-			for gen in genList:
-				gen.send(entry)
+		if self._stageStats is not None:
+			self._writeEntriesTimed(writerList, genList)
+		else:
+			for entry in self:
+				for gen in genList:
+					gen.send(entry)
 		# suppress() on the whole for-loop does not work
 		for gen in genList:
 			with suppress(StopIteration):
 				gen.send(None)
 
+	def _writeEntriesTimed(
+		self,
+		writerList: list[Any],
+		genList: list[Any],
+	) -> None:
+		stats = self._stageStats
+		assert stats is not None
+		counters = [stats.counter("write", stageName(writer)) for writer in writerList]
+		for entry in self:
+			size = entrySize(entry)
+			for gen, counter in zip(genList, counters, strict=False):
+				t0 = now()
+				gen.send(entry)
+				elapsed = now() - t0
+				counter.time += elapsed
+				counter.addSlow(elapsed, entry)
+				counter.count += 1
+				counter.sizeIn += size
+
 	@staticmethod
 	def _openWriter(
 		writer: Any,
@@ -986,6 +1063,9 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 			self._iter = self._readersEntryGen()
 		else:
 			self._iter = self._loadedEntryGen()
+		outputFilesBefore: dict[str, tuple[int, int, int]] = {}
+		if self._stageStats is not None:
+			outputFilesBefore = filesSnapshot(filename)
 		self._openWriter(writer, filename)
 
 		showMemoryUsage()
@@ -1000,14 +1080,30 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 		finally:
 			showMemoryUsage()
 			log.debug("Running writer.finish()")
-			for writer in writerList:
-				writer.finish()
+			self._finishWriters(writerList)
 			self.clear()
 
+		if self._stageStats is not None:
+			self._stageStats.addOutputFiles(
+				self._stageStats.counter("write", stageName(writer)),
+				filename,
+				outputFilesBefore,
+			)
+
 		showMemoryUsage()
 
 		return filename
 
+	def _finishWriters(self, writerList: list[Any]) -> None:
+		stats = self._stageStats
+		for writer in writerList:
+			if stats is None:
+				writer.finish()
+				continue
+			t0 = now()
+			writer.finish()
+			stats.counter("finish", stageName(writer)).time += now() - t0
+
 	@staticmethod
 	def _compressOutput(filename: str, compression: str) -> str:
 		from .compress import compress
@@ -1028,6 +1124,7 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 			entryFromRaw=self._entryFromRaw,
 			database=sq_fpath,
 			create=True,
+			mmapSize=self._config.get("sqlite_mmap_size", 0),
 		)
 		self._cleanupPathList.add(sq_fpath)
 
@@ -1205,6 +1302,27 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 
 		return sort
 
+	@property
+	def stageStats(self) -> StageStats | None:
+		"""
+		Timing counters of reader, entry filters and writer, of the last
+		conversion, or None if not enabled with "stage_stats" config key.
+		"""
+		return self._stageStats
+
+	def _reportStageStats(self, jsonPath: str) -> None:
+		stats = self._stageStats
+		assert stats is not None
+		stats.stop()
+		log.info("Stage stats:\n" + stats.reportText())
+		if not jsonPath:
+			return
+		from .json_utils import dataToPrettyJson
+
+		with open(jsonPath, mode="w", encoding="utf-8") as file:
+			file.write(dataToPrettyJson(stats.toDict()))
+		log.info(f"Saved stage stats to {jsonPath!r}")
+
 	def convertV2(self, args: ConvertArgs) -> str:
 		"""
 		Return absolute path of output file.
@@ -1225,6 +1343,11 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 
 		tm0 = now()
 
+		statsJsonPath = self._config.get("stage_stats_json", "")
+		self._stageStats = None
+		if self._config.get("stage_stats", False) or statsJsonPath:
+			self._stageStats = StageStats()
+
 		outputFilename, outputFormat, compression = PluginHandler.detectOutputFormat(
 			filename=args.outputFilename,
 			formatName=args.outputFormat,
@@ -1261,6 +1384,8 @@ class GlossaryCommon(GlossaryInfo, GlossaryProgress):  # noqa: PLR0904
 
 		log.info(f"Writing file {finalOutputFile!r} done.")
 		log.info(f"Running time of convert: {now() - tm0:.1f} seconds")
+		if self._stageStats is not None:
+			self._reportStageStats(statsJsonPath)
 		showMemoryUsage()
 		self.cleanup()
 
@@ -26,6 +26,7 @@ log = logging.getLogger("pyglossary")
 
 
 def optionFromDict(data: dict[str, Any]) -> Option:
+	data = data.copy()
 	className = data.pop("class")
 
 	if className == "Option":
@@ -131,19 +131,43 @@ def _dictzip(filename: str | Path) -> bool:
 	return True
 
 
+def _nativeDictzip(filename: str | Path) -> bool:
+	from .dictzip import compressFile
+
+	try:
+		compressFile(os.fspath(filename))
+	except OSError as error:
+		log.error(str(error))
+		return False
+	return True
+
+
 def runDictzip(filename: str | Path, method: str = "") -> None:
-	"""Compress file into dictzip format."""
-	res = None
-	if method in {"", "idzip"}:
+	"""
+	Compress file into dictzip format.
+
+	method: "" or "native" to use the built-in compressor,
+		"idzip" to use python-idzip, "dictzip" to use dictzip utility.
+	"""
+	if method in {"", "native"}:
+		_nativeDictzip(filename)
+		return
+	if method == "idzip":
 		res = _idzip(filename)
-	if not res and method in {"", "dictzip"}:
+		if not res:
+			log.warning(
+				"Dictzip compression with idzip requires idzip module,"
+				f" run `{pip} install python-idzip` to install",
+			)
+	elif method == "dictzip":
 		res = _dictzip(filename)
-	if not res:
-		log.warning(
-			"Dictzip compression requires idzip module or dictzip utility,"
-			f" run `{pip} install python-idzip` to install or make sure"
-			" dictzip is in your $PATH",
-		)
+		if not res:
+			log.warning(
+				"Dictzip compression with dictzip requires dictzip utility,"
+				" make sure dictzip is in your $PATH",
+			)
+	else:
+		raise ValueError(f"invalid dictzip {method=}")
 
 
 def _rmtreeError(
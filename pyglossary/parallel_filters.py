@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING
+
+from .entry import Entry
+
+if TYPE_CHECKING:
+	from collections.abc import Iterable, Iterator
+	from concurrent.futures import Future
+
+	from .entry_filters import EntryFilterType
+	from .glossary_types import EntryType, RawEntryType
+
+__all__ = ["ParallelFilterIterator", "splitParallelFilters"]
+
+# number of entries sent to a worker process at once
+defaultBatchSize = 256
+
+_workerFilters: list[EntryFilterType] = []
+
+
+def splitParallelFilters(
+	filters: list[EntryFilterType],
+) -> tuple[list[EntryFilterType], list[EntryFilterType]]:
+	"""
+	Split filters into (parallel, serial) lists.
+
+	parallel is the longest prefix of stateless filters that can run in
+	worker processes, serial is the rest that must run (in order) in the
+	main process.
+	"""
+	for index, entryFilter in enumerate(filters):
+		if not getattr(entryFilter, "parallel", False):
+			return filters[:index], filters[index:]
+	return filters, []
+
+
+def _entryToRaw(entry: EntryType) -> RawEntryType:
+	return [entry.defiFormat.encode("ascii"), entry.b_defi] + entry.lb_term
+
+
+def _entryFromRaw(
+	rawEntry: RawEntryType,
+	byteProgress: tuple[int, int] | None = None,
+) -> EntryType:
+	return Entry(
+		[b.decode("utf-8") for b in rawEntry[2:]],
+		rawEntry[1].decode("utf-8"),
+		defiFormat=rawEntry[0].decode("ascii"),
+		byteProgress=byteProgress,
+	)
+
+
+def _runFilters(
+	entry: EntryType,
+	filters: list[EntryFilterType],
+) -> EntryType | None:
+	for entryFilter in filters:
+		entry = entryFilter.run(entry)  # type: ignore
+		if entry is None:
+			return None
+	return entry
+
+
+def _initWorker(filters: list[EntryFilterType]) -> None:
+	global _workerFilters  # noqa: PLW0603
+	_workerFilters = filters
+
+
+def _runBatch(batch: list[RawEntryType]) -> list[RawEntryType | None]:
+	result: list[RawEntryType | None] = []
+	for rawEntry in batch:
+		entry = _runFilters(_entryFromRaw(rawEntry), _workerFilters)
+		result.append(None if entry is None else _entryToRaw(entry))
+	return result
+
+
+class ParallelFilterIterator:
+	"""
+	Run stateless entry filters on batches of entries in worker processes.
+
+	Entries are sent to workers in raw (bytes) form and yielded back in
+	their original order. Data entries (resources) are not sent to workers,
+	filters are applied to them in the main process.
+	At most `2 * processes` batches are in flight at any time.
+	"""
+
+	def __init__(
+		self,
+		iterable: Iterable[EntryType | None],
+		filters: list[EntryFilterType],
+		processes: int,
+		batchSize: int = defaultBatchSize,
+	) -> None:
+		self._iterable = iterable
+		self._filters = filters
+		self._processes = processes
+		self._batchSize = batchSize
+
+	def _results(
+		self,
+		future: Future[list[RawEntryType | None]],
+		entries: list[EntryType],
+	) -> Iterator[EntryType]:
+		rawIter = iter(future.result())
+		filters = self._filters
+		for entry in entries:
+			if entry.isData():
+				result = _runFilters(entry, filters)
+				if result is not None:
+					yield result
+				continue
+			rawEntry = next(rawIter)
+			if rawEntry is not None:
+				yield _entryFromRaw(rawEntry, entry.byteProgress())
+
+	def __iter__(self) -> Iterator[EntryType]:
+		# importing concurrent.futures.process (and multiprocessing) is slow,
+		# so it is not done on startup
+		from concurrent.futures import ProcessPoolExecutor
+
+		maxInFlight = 2 * self._processes
+		batchSize = self._batchSize
+		inFlight: deque[tuple[Future[list[RawEntryType | None]], list[EntryType]]] = (
+			deque()
+		)
+		with ProcessPoolExecutor(
+			max_workers=self._processes,
+			initializer=_initWorker,
+			initargs=(self._filters,),
+		) as pool:
+			entries: list[EntryType] = []
+			batch: list[RawEntryType] = []
+			for entry in self._iterable:
+				if entry is None:
+					continue
+				entries.append(entry)
+				if not entry.isData():
+					batch.append(_entryToRaw(entry))
+				if len(entries) < batchSize:
+					continue
+				inFlight.append((pool.submit(_runBatch, batch), entries))
+				entries, batch = [], []
+				if len(inFlight) >= maxInFlight:
+					yield from self._results(*inFlight.popleft())
+			if entries:
+				inFlight.append((pool.submit(_runBatch, batch), entries))
+			while inFlight:
+				yield from self._results(*inFlight.popleft())
@@ -0,0 +1,185 @@
+"""
+Reproducible ZIP writer that compresses members in a thread pool.
+
+Members are deflated in worker threads (zlib releases the GIL) as soon as
+they are added, while the caller keeps producing the next ones, and are
+written to the archive in the order they were added. Like
+repro_zipfile.ReproducibleZipFile, modification times and permissions
+are fixed, so the archive only depends on the names and contents of
+members.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from os.path import getsize
+from typing import TYPE_CHECKING, NamedTuple, Self
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipInfo
+
+from .repro_zipfile import ReproducibleZipFile
+from .repro_zipfile.repro_zipfile import date_time, file_mode
+
+if TYPE_CHECKING:
+	from concurrent.futures import Future
+	from types import TracebackType
+
+__all__ = ["ParallelZipWriter"]
+
+log = logging.getLogger("pyglossary")
+
+# larger files are compressed (and written) by ZipFile.write in the
+# calling thread, instead of being loaded into memory
+maxParallelFileSize = 32 * 1024 * 1024
+
+
+class _Member(NamedTuple):
+	data: bytes  # compressed
+	crc: int
+	size: int
+
+
+def _compressMember(
+	data: bytes,
+	compressType: int,
+	level: int,
+) -> _Member:
+	crc = zlib.crc32(data)
+	if compressType == ZIP_STORED:
+		return _Member(data, crc, len(data))
+	compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+	return _Member(compressor.compress(data) + compressor.flush(), crc, len(data))
+
+
+def _compressFile(path: str, compressType: int, level: int) -> _Member:
+	with open(path, "rb") as file:
+		data = file.read()
+	return _compressMember(data, compressType, level)
+
+
+class ParallelZipWriter:
+	"""
+	Write a new ZIP file, compressing members in `workers` threads.
+
+	At most `2 * workers` members are kept in memory (in flight) at once.
+	Only ZIP_STORED and ZIP_DEFLATED members are supported.
+	"""
+
+	def __init__(
+		self,
+		filename: str,
+		workers: int = 0,
+		level: int = zlib.Z_DEFAULT_COMPRESSION,
+	) -> None:
+		self.name = filename
+		self._level = level
+		self._zf = ReproducibleZipFile(filename, mode="w", compression=ZIP_DEFLATED)
+		if workers <= 0:
+			workers = min(8, os.cpu_count() or 1)
+		self._pool = ThreadPoolExecutor(max_workers=workers)
+		self._maxInFlight = 2 * workers
+		self._inFlight: deque[tuple[ZipInfo, Future[_Member]]] = deque()
+		self.closed = False
+
+	def __enter__(self) -> Self:
+		return self
+
+	def __exit__(
+		self,
+		exc_type: type[BaseException] | None,
+		exc_val: BaseException | None,
+		exc_tb: TracebackType | None,
+	) -> None:
+		if exc_type is None:
+			self.close()
+		else:
+			self.abort()
+
+	@staticmethod
+	def _newZipInfo(arcname: str, compressType: int) -> ZipInfo:
+		zinfo = ZipInfo(arcname, date_time=date_time())
+		zinfo.external_attr = file_mode() << 16
+		zinfo.compress_type = compressType
+		return zinfo
+
+	def _submit(self, zinfo: ZipInfo, future: Future[_Member]) -> None:
+		self._inFlight.append((zinfo, future))
+		if len(self._inFlight) >= self._maxInFlight:
+			self._writeMember(*self._inFlight.popleft())
+
+	def _writeMember(self, zinfo: ZipInfo, future: Future[_Member]) -> None:
+		member = future.result()
+		zinfo.CRC = member.crc
+		zinfo.file_size = member.size
+		zinfo.compress_size = len(member.data)
+		zf = self._zf
+		# like ZipFile.open(zinfo, "w"), but with already compressed data
+		zf._writecheck(zinfo)  # noqa: SLF001
+		zf._didModify = True  # noqa: SLF001
+		fp = zf.fp
+		assert fp is not None
+		fp.seek(zf.start_dir)
+		zinfo.header_offset = fp.tell()
+		fp.write(zinfo.FileHeader())
+		fp.write(member.data)
+		zf.start_dir = fp.tell()
+		zf.filelist.append(zinfo)
+		zf.NameToInfo[zinfo.filename] = zinfo
+
+	def _flush(self) -> None:
+		while self._inFlight:
+			self._writeMember(*self._inFlight.popleft())
+
+	def writestr(
+		self,
+		arcname: str,
+		data: bytes,
+		compressType: int = ZIP_DEFLATED,
+	) -> None:
+		"""Add a member with contents `data`."""
+		self._submit(
+			self._newZipInfo(arcname, compressType),
+			self._pool.submit(_compressMember, data, compressType, self._level),
+		)
+
+	def write(
+		self,
+		path: str,
+		arcname: str,
+		compressType: int = ZIP_DEFLATED,
+	) -> None:
+		"""Add file `path` as member `arcname`."""
+		if getsize(path) > maxParallelFileSize:
+			self._flush()
+			self._zf.write(path, arcname=arcname, compress_type=compressType)
+			return
+		self._submit(
+			self._newZipInfo(arcname, compressType),
+			self._pool.submit(_compressFile, path, compressType, self._level),
+		)
+
+	def close(self) -> None:
+		if self.closed:
+			return
+		self.closed = True
+		try:
+			self._flush()
+		finally:
+			self._pool.shutdown()
+			self._zf.close()
+
+	def abort(self) -> None:
+		"""Stop compressing, and remove the incomplete ZIP file."""
+		if self.closed:
+			return
+		self.closed = True
+		self._pool.shutdown(cancel_futures=True)
+		self._inFlight.clear()
+		self._zf.close()
+		try:
+			os.remove(self.name)
+		except OSError as e:
+			log.error(f"failed to remove {self.name}: {e}")
@@ -0,0 +1,205 @@
+#
+# Copyright © 2025 Saeed Rasooli <saeed.gnu@gmail.com> (ilius)
+# This file is part of PyGlossary project, https://github.com/ilius/pyglossary
+#
+# This program is a free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program. Or on Debian systems, from /usr/share/common-licenses/GPL
+# If not, see <http://www.gnu.org/licenses/gpl.txt>.
+"""
+Cache of plugin metadata (the same dicts as plugins-meta/index.json).
+
+Each plugin is stored with a stamp of its files (paths, sizes and
+modification times), so a plugin is imported again (and its metadata
+regenerated) only when one of its files changes. The whole cache is
+discarded if the cache format, PyGlossary version, Python version or
+the modules that define the metadata format change.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sys
+from os.path import isdir, isfile, join
+from typing import TYPE_CHECKING
+
+from .core import VERSION, rootDir
+
+if TYPE_CHECKING:
+	from collections.abc import Iterator
+	from typing import Any
+
+__all__ = ["PluginCache", "iterPluginModules", "pluginStamp"]
+
+log = logging.getLogger("pyglossary")
+
+# increase when format of cache file (or of metadata dicts) changes
+cacheFormatVersion = 1
+
+# modules that define how plugin metadata is extracted and stored
+_libModules = (
+	"flags.py",
+	"option.py",
+	"plugin_cache.py",
+	"plugin_prop.py",
+	"text_reader.py",
+)
+
+
+def _stamp(items: list[str]) -> str:
+	return hashlib.md5("\n".join(items).encode("utf-8")).hexdigest()  # noqa: S324
+
+
+def _fileStampItem(fpath: str, relPath: str) -> str:
+	st = os.stat(fpath)
+	return f"{relPath}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def pluginStamp(path: str) -> str:
+	"""
+	Return a stamp of plugin module path (a package directory or a .py file)
+	that changes if any of its files is added, removed or modified.
+	"""
+	if not isdir(path):
+		return _stamp([_fileStampItem(path, "")])
+	items: list[str] = []
+	for dirPath, dirNames, fileNames in os.walk(path):
+		dirNames[:] = sorted(name for name in dirNames if name != "__pycache__")
+		relDir = os.path.relpath(dirPath, path)
+		items.extend(
+			_fileStampItem(join(dirPath, fname), join(relDir, fname))
+			for fname in sorted(fileNames)
+		)
+	return _stamp(items)
+
+
+def iterPluginModules(directory: str) -> Iterator[tuple[str, str]]:
+	"""
+	Yield (moduleName, path) of plugin modules in directory, sorted by name.
+	Like pkgutil.iter_modules, but without importing pkgutil.
+	"""
+	modules: list[tuple[str, str]] = []
+	for entry in os.scandir(directory):
+		name = entry.name
+		if name.startswith(("_", ".")):
+			continue
+		if entry.is_dir():
+			if isfile(join(entry.path, "__init__.py")):
+				modules.append((name, entry.path))
+			continue
+		if name.endswith(".py") and "." not in name[:-3]:
+			modules.append((name[:-3], entry.path))
+	modules.sort()
+	yield from modules
+
+
+def _header() -> dict[str, Any]:
+	libDir = join(rootDir, "pyglossary")
+	return {
+		"version": cacheFormatVersion,
+		"pyglossary": VERSION,
+		"python": sys.version.split(" ", maxsplit=1)[0],
+		"lib": _stamp(
+			[_fileStampItem(join(libDir, fname), fname) for fname in _libModules],
+		),
+	}
+
+
+class PluginCache:
+	"""
+	Persistent cache of plugin metadata, keyed by plugin directory
+	and module name.
+	"""
+
+	def __init__(self, path: str) -> None:
+		self._path = path
+		self._header = _header()
+		self._dirs: dict[str, dict[str, dict[str, Any]]] = {}
+		self._modified = False
+		self._load()
+
+	def _load(self) -> None:
+		try:
+			with open(self._path, encoding="utf-8") as file:
+				data = json.load(file)
+		except FileNotFoundError:
+			return
+		except Exception as e:
+			log.debug(f"failed to load plugin cache {self._path}: {e}")
+			return
+		if not isinstance(data, dict) or data.get("header") != self._header:
+			log.debug("plugin cache is outdated, ignoring it")
+			return
+		self._dirs = data.get("dirs", {})
+
+	@property
+	def modified(self) -> bool:
+		return self._modified
+
+	def get(self, directory: str, moduleName: str, stamp: str) -> dict | None:
+		"""
+		Return cached item of plugin if the stamp matches, or None.
+
+		Item is a dict with "attrs" (metadata dict, or None if plugin
+		could not be imported) and "missing" (name of missing module).
+		"""
+		item = self._dirs.get(directory, {}).get(moduleName)
+		if item is None or item.get("stamp") != stamp:
+			return None
+		return item
+
+	def set(  # noqa: PLR0913
+		self,
+		directory: str,
+		moduleName: str,
+		stamp: str,
+		attrs: dict[str, Any] | None,
+		missing: str = "",
+	) -> None:
+		self._dirs.setdefault(directory, {})[moduleName] = {
+			"stamp": stamp,
+			"attrs": attrs,
+			"missing": missing,
+		}
+		self._modified = True
+
+	def removeOthers(self, directory: str, moduleNames: set[str]) -> None:
+		"""Remove plugins of directory that are not in moduleNames."""
+		modules = self._dirs.get(directory)
+		if not modules:
+			return
+		for moduleName in set(modules) - moduleNames:
+			del modules[moduleName]
+			self._modified = True
+
+	def save(self) -> None:
+		if not self._modified:
+			return
+		tmpPath = f"{self._path}.{os.getpid()}.tmp"
+		try:
+			os.makedirs(os.path.dirname(self._path), mode=0o700, exist_ok=True)
+			with open(tmpPath, mode="w", encoding="utf-8") as file:
+				json.dump(
+					{"header": self._header, "dirs": self._dirs},
+					file,
+					ensure_ascii=True,
+				)
+			os.replace(tmpPath, self._path)
+		except OSError as e:
+			log.debug(f"failed to save plugin cache {self._path}: {e}")
+			if isfile(tmpPath):
+				os.remove(tmpPath)
+			return
+		self._modified = False
@@ -21,7 +21,7 @@ import logging
 import os
 import sys
 from os.path import isdir, join
-from typing import Any, NamedTuple
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from . import core
 from .core import (
@@ -34,8 +34,12 @@ from .glossary_utils import (
 	Error,
 	splitFilenameExt,
 )
+from .plugin_cache import PluginCache, iterPluginModules, pluginStamp
 from .plugin_prop import PluginProp
 
+if TYPE_CHECKING:
+	from collections.abc import Callable
+
 __all__ = ["DetectedFormat", "PluginHandler"]
 
 log = logging.getLogger("pyglossary")
@@ -128,6 +132,111 @@ class PluginLoader:
 
 		return plugins
 
+	@staticmethod
+	def _importPluginAttrs(
+		moduleName: str,
+		fallbackAttrs: Callable[[str], dict[str, Any] | None],
+	) -> tuple[dict[str, Any] | None, str]:
+		"""
+		Import plugin and return (attrs, missingModuleName).
+
+		If a module that plugin depends on is missing, attrs are taken
+		from plugins-meta/index.json (if plugin is there), so the plugin
+		is still listed, and its dependencies are shown when it's used.
+		If importing fails for another reason, returns (None, "").
+		"""
+		log.debug(f"importing {moduleName} to update plugin cache")
+		try:
+			module = __import__(
+				f"pyglossary.plugins.{moduleName}",
+				fromlist=[moduleName],
+			)
+		except ModuleNotFoundError as e:
+			missing = e.name or ""
+			attrs = fallbackAttrs(moduleName)
+			if attrs is None:
+				log.warning(
+					f"Module {missing!r} not found, skipping plugin {moduleName!r}",
+				)
+			return attrs, missing
+		except Exception:
+			log.exception(f"Error while importing plugin {moduleName}")
+			return None, ""
+		return PluginProp.fromModule(module).toDict(), ""
+
+	@classmethod
+	def _cachedPluginAttrs(  # noqa: PLR0913
+		cls: type[PluginLoader],
+		cache: PluginCache,
+		directory: str,
+		moduleName: str,
+		path: str,
+		fallbackAttrs: Callable[[str], dict[str, Any] | None],
+	) -> dict[str, Any] | None:
+		from importlib.util import find_spec
+
+		stamp = pluginStamp(path)
+		item = cache.get(directory, moduleName, stamp)
+		# failed imports (attrs=None, missing="") are not cached, but older
+		# versions did cache them, so they are retried too
+		if item is not None and (item["attrs"] is not None or item["missing"]):
+			missing = item["missing"]
+			if not missing or find_spec(missing.partition(".")[0]) is None:
+				return item["attrs"]
+			# the missing module is installed now
+		attrs, missing = cls._importPluginAttrs(moduleName, fallbackAttrs)
+		if attrs is None and not missing:
+			# import failed for a reason other than a missing module (already
+			# logged), like an incompatible version of a dependency, which can
+			# be fixed without changing the plugin, so try again next time
+			return None
+		cache.set(directory, moduleName, stamp, attrs, missing)
+		return attrs
+
+	@classmethod
+	def loadPluginsCached(
+		cls: type[PluginLoader],
+		directory: str,
+		cache: PluginCache,
+		fallbackAttrs: Callable[[str], dict[str, Any] | None],
+		skipDisabled: bool = True,
+	) -> list[PluginProp]:
+		"""
+		Load plugins of pyglossary.plugins package (in directory) on startup
+		using metadata from cache. Plugin modules are only imported if they are
+		new or changed since they were cached (or when they are used).
+		Skip plugin modules that are already loaded.
+		"""
+		if not isdir(directory):
+			log.critical(f"Invalid plugin directory: {directory!r}")
+			return []
+
+		plugins: list[PluginProp] = []
+		moduleNames: set[str] = set()
+		for moduleName, path in iterPluginModules(directory):
+			moduleNames.add(moduleName)
+			if moduleName in cls.loadedModules:
+				continue
+			cls.loadedModules.add(moduleName)
+			attrs = cls._cachedPluginAttrs(
+				cache,
+				directory,
+				moduleName,
+				path,
+				fallbackAttrs,
+			)
+			if attrs is None:
+				continue
+			prop = PluginProp.fromDict(
+				attrs=attrs,
+				modulePath=path.removesuffix(".py"),
+			)
+			if not prop.enable and skipDisabled:
+				continue
+			plugins.append(prop)
+		cache.removeOthers(directory, moduleNames)
+		return plugins
+
 
 class PluginHandler:
 	plugins: dict[str, PluginProp] = {}
@@ -167,6 +276,47 @@ class PluginHandler:
 		for prop in PluginLoader.loadPlugins(directory, skipDisabled):
 			cls._addPlugin(prop)
 
+	@classmethod
+	def loadPluginsCached(
+		cls: type[PluginHandler],
+		directory: str,
+		skipDisabled: bool = True,
+	) -> None:
+		"""
+		Load plugins from directory (of pyglossary.plugins package) on startup,
+		with plugin metadata cached in cacheDir.
+		"""
+		fallback: dict[str, dict[str, Any]] | None = None
+
+		def fallbackAttrs(moduleName: str) -> dict[str, Any] | None:
+			nonlocal fallback
+			if fallback is None:
+				fallback = cls._loadPluginsJsonAttrs()
+			return fallback.get(moduleName)
+
+		cache = PluginCache(join(cacheDir, "plugins-index.json"))
+		for prop in PluginLoader.loadPluginsCached(
+			directory,
+			cache,
+			fallbackAttrs,
+			skipDisabled=skipDisabled,
+		):
+			cls._addPlugin(prop)
+		cache.save()
+
+	@staticmethod
+	def _loadPluginsJsonAttrs() -> dict[str, dict[str, Any]]:
+		import json
+
+		pluginsJsonPath = join(dataDir, "plugins-meta", "index.json")
+		try:
+			with open(pluginsJsonPath, encoding="utf-8") as file:
+				data = json.load(file)
+		except OSError as e:
+			log.debug(f"failed to load {pluginsJsonPath}: {e}")
+			return {}
+		return {attrs["module"]: attrs for attrs in data}
+
 	@classmethod
 	def _addPlugin(
 		cls: type[PluginHandler],
@@ -192,7 +342,7 @@ class PluginHandler:
 			cls.formatsWriteOptions[name] = prop.getWriteOptions()
 			cls.writeFormats.append(name)
 
-		if log.level <= core.TRACE:
+		if log.isEnabledFor(core.TRACE):
 			prop.module  # noqa: B018, to make sure importing works
 
 	@classmethod
@@ -325,15 +475,14 @@ class PluginHandler:
 		"""
 		cls.readFormats = []
 		cls.writeFormats = []
-		pluginsJsonPath = join(dataDir, "plugins-meta", "index.json")
-
-		# even if usePluginsJson, we should still call loadPlugins to load
-		# possible new plugins that are not in json file
 
+		# if usePluginsJson, plugin metadata is taken from a cache
+		# (see plugin_cache.py), and plugin modules are imported on first use
+		# otherwise all plugin modules are imported now
 		if usePluginsJson:
-			cls.loadPluginsFromJson(pluginsJsonPath, skipDisabled=skipDisabledPlugins)
-
-		cls.loadPlugins(pluginsDir, skipDisabled=skipDisabledPlugins)
+			cls.loadPluginsCached(pluginsDir, skipDisabled=skipDisabledPlugins)
+		else:
+			cls.loadPlugins(pluginsDir, skipDisabled=skipDisabledPlugins)
 
 		if isdir(userPluginsDir):
 			cls.loadPlugins(userPluginsDir)
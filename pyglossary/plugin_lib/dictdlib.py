@@ -20,16 +20,27 @@
 from __future__ import annotations
 
 import gzip
+import heapq
+import mmap
 import os
 import string
 import sys
+import tempfile
+import threading
 import typing
+from bisect import bisect_left, bisect_right
+from itertools import batched
+from typing import NamedTuple
+
+from pyglossary.dictzip import openDictzip
 
 if typing.TYPE_CHECKING:
 	import io
-	from collections.abc import Iterable
+	from collections.abc import Iterable, Iterator
+	from types import TracebackType
+	from typing import IO, Self
 
-__all__ = ["DictDB"]
+__all__ = ["DictDB", "DictLookup", "IndexEntry"]
 
 b64_list = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
 url_headword = "00-database-url"
@@ -39,25 +50,40 @@ info_headword = "00-database-info"
 validdict = set(
 	string.ascii_letters + string.digits + " \t",
 )
+# bytes that sortNormalize removes from ASCII text
+_invalidAsciiBytes = bytes(c for c in range(128) if chr(c) not in validdict)
+
+# index lines are sorted in memory up to this total length (in characters),
+# larger indexes are sorted in runs kept in temporary files, then merged
+maxSortBufferSize = 64 * 1024 * 1024
+
+# number of index lines encoded and written at once
+writeChunkSize = 10000
+
+# bytes that DictLookup removes from UTF-8 headwords to get the key that
+# .index is sorted by (see sortNormalize)
+_invalidKeyBytes = bytes(c for c in range(256) if chr(c) not in validdict)
+
+# index lines with the same normalized key (for example all headwords
+# without ASCII letters and digits) are scanned by DictLookup if they
+# take up to this many bytes, larger groups are loaded and sorted once
+maxGroupScanSize = 64 * 1024
 
 
 def b64_encode(val: int) -> str:
 	"""
 	Takes as input an integer val and returns a string of it encoded
 	with the base64 algorithm used by dict indexes.
+	Only the lower 36 bits (6 digits) are encoded.
 	"""
-	startfound = 0
+	val &= 0xFFFFFFFFF
+	if not val:
+		return b64_list[0]
 	retval = ""
-	for i in range(5, -1, -1):
-		thispart = (val >> (6 * i)) & ((2**6) - 1)
-		if (not startfound) and (not thispart):
-			# Both zero -- keep going.
-			continue
-		startfound = 1
-		retval += b64_list[thispart]
-	if retval:
-		return retval
-	return b64_list[0]
+	while val:
+		retval = b64_list[val & 0x3F] + retval
+		val >>= 6
+	return retval
 
 
 def b64_decode(text: str) -> int:
@@ -81,16 +107,24 @@ def sortNormalize(inp: str) -> str:
 	Returns a value such that x is mapped to a format that sorts properly
 	with standard comparison.
 	"""
-	st2 = ""
-	for char in inp:
-		if char in validdict:
-			st2 += char
-	return st2.upper() + "\0" + inp.upper()
+	st2 = inp.encode("ascii", "ignore").translate(None, _invalidAsciiBytes)
+	return (st2.decode("ascii") + "\0" + inp).upper()
 
 
-def sortKey(x: str) -> list[str]:
-	"""Emulate sort -df."""
-	return x.split("\0")
+def sortKey(line: str) -> str:
+	"""
+	Emulate sort -df, for index lines.
+
+	Gives the same order as (sortNormalize(line), line), unless the
+	line contains NUL, which dictd does not support in headwords anyway.
+	"""
+	return sortNormalize(line) + "\0" + line
+
+
+def _readSortedRun(file: IO[bytes]) -> Iterator[str]:
+	with file:
+		for line in file:
+			yield line[:-1].decode("utf-8")
 
 
 class DictDB:
@@ -150,7 +184,7 @@ class DictDB:
 		if mode == "read":
 			self.indexFile = open(self.indexFilename, "rb")
 			if self.useCompression:
-				self.dictFile = gzip.GzipFile(self.dictFilename, "rb")
+				self.dictFile = openDictzip(self.dictFilename)
 			else:
 				self.dictFile = open(self.dictFilename, "rb")
 			self._initIndex()
@@ -320,49 +354,19 @@ class DictDB:
 		"""
 		self.update(f"Processed {self.count} records.\n")
 
+		indexLines: Iterable[str]
 		if dosort:
-			self.update("Sorting index: converting")
-
-			indexList: list[str] = [
-				f"{word}\t{b64_encode(thisdef[0])}\t{b64_encode(thisdef[1])}"
-				for word, defs in self.indexEntries.items()
-				for thisdef in defs
-			]
-
-			self.update(" mapping")
-
-			sortmap: dict[str, list[str]] = {}
-			for entry in indexList:
-				norm = sortNormalize(entry)
-				if norm in sortmap:
-					sortmap[norm].append(entry)
-					sortmap[norm].sort(key=sortKey)
-				else:
-					sortmap[norm] = [entry]
-
-			self.update(" listing")
-
-			normalizedentries = list(sortmap)
-
-			self.update(" sorting")
-
-			normalizedentries.sort()
-
-			self.update(" re-mapping")
-			indexList = []
-
-			for normentry in normalizedentries:
-				for entry in sortmap[normentry]:
-					indexList.append(entry)
-
-			self.update(", done.\n")
+			self.update("Sorting index...\n")
+			indexLines = self._sortedIndexLines()
+		else:
+			indexLines = self._iterIndexLines()
 
 		self.update("Writing index...\n")
 
 		self.indexFile.seek(0)
 
-		for entry in indexList:
-			self.indexFile.write(entry.encode("utf-8") + b"\n")
+		for chunk in batched(indexLines, writeChunkSize):
+			self.indexFile.write(("\n".join(chunk) + "\n").encode("utf-8"))
 
 		if self.mode == "update":
 			# In case things were deleted
@@ -372,6 +376,47 @@ class DictDB:
 
 		self.update("Complete.\n")
 
+	def _iterIndexLines(self) -> Iterator[str]:
+		for word, defs in self.indexEntries.items():
+			for start, size in defs:
+				yield f"{word}\t{b64_encode(start)}\t{b64_encode(size)}"
+
+	def _sortedIndexLines(self) -> Iterable[str]:
+		"""
+		Return index lines sorted by sortKey.
+
+		If total length of lines exceeds maxSortBufferSize, sorted runs of
+		lines are written to temporary files and merged while writing.
+		"""
+		runs: list[IO[bytes]] = []
+		lines: list[str] = []
+		size = 0
+		for line in self._iterIndexLines():
+			lines.append(line)
+			size += len(line)
+			if size >= maxSortBufferSize:
+				runs.append(self._writeSortedRun(lines))
+				lines = []
+				size = 0
+		lines.sort(key=sortKey)
+		if not runs:
+			return lines
+		self.update(f"Merging {len(runs) + 1} sorted runs\n")
+		return heapq.merge(
+			*[_readSortedRun(file) for file in runs],
+			lines,
+			key=sortKey,
+		)
+
+	@staticmethod
+	def _writeSortedRun(lines: list[str]) -> IO[bytes]:
+		lines.sort(key=sortKey)
+		file = tempfile.TemporaryFile()  # noqa: SIM115
+		for chunk in batched(lines, writeChunkSize):
+			file.write(("\n".join(chunk) + "\n").encode("utf-8"))
+		file.seek(0)
+		return file
+
 	def close(self) -> None:
 		self.indexFile.close()
 		self.dictFile.close()
@@ -401,6 +446,260 @@ class DictDB:
 		return retval
 
 
+class IndexEntry(NamedTuple):
+	word: str
+	start: int
+	size: int
+
+
+def _indexKey(b_word: bytes) -> bytes:
+	return b_word.translate(None, _invalidKeyBytes).upper()
+
+
+class DictLookup:
+	"""
+	Read-only random access to a dictd database (.index and .dict
+	or .dict.dz files), for answering lookups without loading the index.
+
+	The .index file is memory-mapped and binary-searched, so it must be
+	sorted like `sort -df` (as DictDB.finish writes it).
+	A .dict.dz file is read with DictzipReader, which only decompresses
+	the chunks it needs and keeps the last `cacheSize` of them.
+
+	Match strategies (like the ones of dictd):
+		exact: headword is equal to the query
+		normalized: headword is equal to the query after removing all
+			characters other than ASCII letters, digits and spaces,
+			and ignoring case (the `sort -df` key of index)
+		prefix: normalized headword starts with the normalized query
+
+	A DictLookup object can be used from multiple threads.
+	"""
+
+	strategies = ("exact", "normalized", "prefix")
+
+	def __init__(self, basename: str, cacheSize: int = 32) -> None:
+		basename = basename.removesuffix(".index")
+		self.basename = basename
+		self._lock = threading.Lock()
+		# lower bound of group -> (sorted headwords, line offsets)
+		self._groups: dict[int, tuple[list[bytes], list[int]]] = {}
+		self._index: mmap.mmap | bytes = b""
+		self._dictMmap: mmap.mmap | bytes | None = None
+		self._dictFile: io.IOBase | None = None
+
+		self._index = self._mmapFile(basename + ".index")
+		if os.path.isfile(basename + ".dict.dz"):
+			self._dictFile = openDictzip(basename + ".dict.dz", cacheSize=cacheSize)
+		else:
+			self._dictMmap = self._mmapFile(basename + ".dict")
+
+	@staticmethod
+	def _mmapFile(filename: str) -> mmap.mmap | bytes:
+		with open(filename, "rb") as file:
+			if os.fstat(file.fileno()).st_size == 0:
+				return b""
+			return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+	def __enter__(self) -> Self:
+		return self
+
+	def __exit__(
+		self,
+		exc_type: type[BaseException] | None,
+		exc_val: BaseException | None,
+		exc_tb: TracebackType | None,
+	) -> None:
+		self.close()
+
+	def close(self) -> None:
+		if isinstance(self._index, mmap.mmap):
+			self._index.close()
+		self._index = b""
+		if isinstance(self._dictMmap, mmap.mmap):
+			self._dictMmap.close()
+		self._dictMmap = None
+		if self._dictFile is not None:
+			self._dictFile.close()
+			self._dictFile = None
+		self._groups.clear()
+
+	def _bound(self, key: bytes, lo: int = 0, upper: bool = False) -> int:
+		"""
+		Return offset of the first index line (starting from offset `lo`)
+		with a key greater than or equal to `key`, or greater than `key`
+		if `upper` is True.
+		"""
+		index = self._index
+		hi = len(index)
+		while lo < hi:
+			mid = (lo + hi) // 2
+			# start of the line containing mid (lo is always a line start)
+			start = index.rfind(b"\n", lo, mid) + 1 or lo
+			end = index.find(b"\n", start)
+			if end < 0:
+				end = len(index)
+			lineKey = _indexKey(index[start:end].partition(b"\t")[0])
+			if lineKey < key or (upper and lineKey == key):
+				lo = end + 1
+			else:
+				hi = start
+		return min(lo, len(index))
+
+	@staticmethod
+	def _parseLine(line: bytes) -> IndexEntry | None:
+		parts = line.rstrip(b"\r").split(b"\t")
+		if len(parts) < 3:
+			return None
+		return IndexEntry(
+			parts[0].decode("utf-8", "replace"),
+			b64_decode(parts[1].decode("ascii")),
+			b64_decode(parts[2].decode("ascii")),
+		)
+
+	def _iterLines(self, start: int, end: int) -> Iterator[tuple[int, bytes]]:
+		"""Yield (offset, line) for index lines in the given range."""
+		index = self._index
+		while start < end:
+			lineEnd = index.find(b"\n", start, end)
+			if lineEnd < 0:
+				lineEnd = end
+			yield start, index[start:lineEnd]
+			start = lineEnd + 1
+
+	def _group(self, lo: int, hi: int) -> tuple[list[bytes], list[int]]:
+		"""Return headwords and line offsets of index range, sorted by headword."""
+		group = self._groups.get(lo)
+		if group is not None:
+			return group
+		pairs = sorted(
+			(line.partition(b"\t")[0], offset) for offset, line in self._iterLines(lo, hi)
+		)
+		group = [pair[0] for pair in pairs], [pair[1] for pair in pairs]
+		self._groups[lo] = group
+		return group
+
+	def _matchExact(self, b_word: bytes, lo: int, hi: int) -> list[IndexEntry]:
+		if hi - lo <= maxGroupScanSize:
+			prefix = b_word + b"\t"
+			entries = [
+				self._parseLine(line)
+				for _, line in self._iterLines(lo, hi)
+				if line.startswith(prefix)
+			]
+			return [entry for entry in entries if entry is not None]
+		words, offsets = self._group(lo, hi)
+		first = bisect_left(words, b_word)
+		last = bisect_right(words, b_word, lo=first)
+		entries = []
+		index = self._index
+		for offset in sorted(offsets[first:last]):
+			end = index.find(b"\n", offset)
+			entry = self._parseLine(index[offset : end if end >= 0 else len(index)])
+			if entry is not None:
+				entries.append(entry)
+		return entries
+
+	def _match(
+		self,
+		word: str,
+		strategy: str,
+		limit: int = 0,
+		lo: int = 0,
+	) -> tuple[list[IndexEntry], int]:
+		"""Return matching index entries, and lower bound of their key."""
+		if strategy not in self.strategies:
+			raise ValueError(f"invalid strategy {strategy!r}")
+		b_word = word.encode("utf-8")
+		key = _indexKey(b_word)
+		if strategy == "prefix" and not key:
+			# every index key starts with an empty key
+			raise ValueError(
+				f"prefix match of {word!r}: needs ASCII letters or digits",
+			)
+		lo = self._bound(key, lo)
+		if strategy == "prefix":
+			entries: list[IndexEntry] = []
+			for _, line in self._iterLines(lo, len(self._index)):
+				if not _indexKey(line.partition(b"\t")[0]).startswith(key):
+					break
+				entry = self._parseLine(line)
+				if entry is not None:
+					entries.append(entry)
+				if limit and len(entries) >= limit:
+					break
+			return entries, lo
+		hi = self._bound(key, lo, upper=True)
+		if strategy == "exact":
+			return self._matchExact(b_word, lo, hi), lo
+		entries = [self._parseLine(line) for _, line in self._iterLines(lo, hi)]
+		entries = [entry for entry in entries if entry is not None]
+		if limit:
+			entries = entries[:limit]
+		return entries, lo
+
+	def match(
+		self,
+		word: str,
+		strategy: str = "exact",
+		limit: int = 0,
+	) -> list[IndexEntry]:
+		"""
+		Return index entries matching `word`, in index order.
+		`limit` is the maximum number of entries, 0 means no limit.
+		Raises ValueError for "prefix" strategy if `word` has no ASCII
+		letters or digits, since it would match the whole index.
+		"""
+		return self._match(word, strategy, limit=limit)[0]
+
+	def _readData(self, start: int, size: int) -> bytes:
+		if self._dictMmap is not None:
+			return self._dictMmap[start : start + size]
+		if self._dictFile is None:
+			raise ValueError("lookup on closed DictLookup")
+		with self._lock:
+			self._dictFile.seek(start)
+			return self._dictFile.read(size)
+
+	def getDefinition(self, entry: IndexEntry) -> str:
+		return self._readData(entry.start, entry.size).decode("utf-8", "replace")
+
+	def lookup(self, word: str, strategy: str = "exact") -> list[str]:
+		"""Return definitions of headwords matching `word`."""
+		return [self.getDefinition(entry) for entry in self.match(word, strategy)]
+
+	def lookupMany(
+		self,
+		words: Iterable[str],
+		strategy: str = "exact",
+	) -> dict[str, list[str]]:
+		"""
+		Return a dict of definitions for each of `words`.
+
+		Queries are searched in order of their index key, each one
+		starting from the position of the previous one, and definitions
+		are read in the order they are stored in .dict file (and only
+		once), so neighbouring ones come from the same cached chunk.
+		"""
+		queries = sorted(set(words), key=lambda word: _indexKey(word.encode("utf-8")))
+		entriesByWord: dict[str, list[IndexEntry]] = {}
+		lo = 0
+		for word in queries:
+			entriesByWord[word], lo = self._match(word, strategy, lo=lo)
+		spans = sorted(
+			{
+				(entry.start, entry.size)
+				for entries in entriesByWord.values()
+				for entry in entries
+			},
+		)
+		data = {span: self._readData(*span).decode("utf-8", "replace") for span in spans}
+		return {
+			word: [data[entry.start, entry.size] for entry in entries]
+			for word, entries in entriesByWord.items()
+		}
+
+
 # print("------------------------ ", __name__)
 if __name__ == "__main__":
 	db = DictDB("test")
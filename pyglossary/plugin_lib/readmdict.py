@@ -20,11 +20,19 @@
 from __future__ import annotations
 
 import logging
+import mmap
+import os
 import re
 import sys
+import threading
 
 # zlib compression is used for engine version >=2.0
 import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from io import BytesIO
 from struct import pack, unpack
 
@@ -47,6 +55,13 @@ __all__ = ["MDD", "MDX"]
 
 log = logging.getLogger(__name__)
 
+# default maximum size of record blocks that are read ahead (compressed)
+# or decoded and waiting to be consumed, in bytes
+default_memory_budget = 64 * 1024 * 1024
+
+# default number of decompressed record blocks cached for lookups
+default_cache_size = 32
+
 
 def _unescape_entities(text):
 	"""Unescape offending tags < > " &."""
@@ -82,22 +97,103 @@ def _decrypt_regcode_by_userid(reg_code: bytes, userid: bytes) -> bytes:
 	return s20.encryptBytes(reg_code)
 
 
+def _decode_block(block, decompressed_size, encrypted_key, version):
+	"""
+	Decrypt and decompress a key or record block.
+
+	This is a module-level function (not a method) so that it can be
+	run in worker threads or processes.
+	"""
+	# block info: compression, encryption
+	info = unpack("<L", block[:4])[0]
+	compression_method = info & 0xF
+	encryption_method = (info >> 4) & 0xF
+	encryption_size = (info >> 8) & 0xFF
+
+	# adler checksum of the block data used as the encryption key if none given
+	adler32 = unpack(">I", block[4:8])[0]
+	if encrypted_key is None:
+		encrypted_key = ripemd128(block[4:8])
+
+	# block data
+	data = block[8:]
+
+	# decrypt
+	if encryption_method == 0:
+		decrypted_block = data
+	elif encryption_method == 1:
+		decrypted_block = (
+			_fast_decrypt(data[:encryption_size], encrypted_key) + data[encryption_size:]
+		)
+	elif encryption_method == 2:
+		decrypted_block = (
+			_salsa_decrypt(data[:encryption_size], encrypted_key) + data[encryption_size:]
+		)
+	else:
+		raise ValueError(f"encryption method {encryption_method} not supported")
+
+	# check adler checksum over decrypted data
+	if version >= 3:
+		assert hex(adler32) == hex(zlib.adler32(decrypted_block) & 0xFFFFFFFF)
+
+	# decompress
+	if compression_method == 0:
+		decompressed_block = decrypted_block
+	elif compression_method == 1:
+		if lzo is None:
+			raise RuntimeError("LZO compression is not supported")
+		header = b"\xf0" + pack(">I", decompressed_size)
+		decompressed_block = lzo.decompress(header + decrypted_block)
+	elif compression_method == 2:
+		decompressed_block = zlib.decompress(decrypted_block)
+	else:
+		raise ValueError(f"compression method {compression_method} not supported")
+
+	# check adler checksum over decompressed data
+	if version < 3:
+		assert hex(adler32) == hex(zlib.adler32(decompressed_block) & 0xFFFFFFFF)
+
+	return decompressed_block
+
+
 class MDict:
 	"""
 	Base class which reads in header and key block.
-	It has no public methods and serves only as code sharing base class.
+
+	Record blocks are independent of each other, with workers > 1 (or 0
+	for number of CPUs) they are read ahead and decoded in a thread pool
+	(or a process pool if processes=True), while keeping at most
+	memory_budget bytes of pending (compressed + decompressed) blocks.
+
+	Records can also be looked up by key (mdict[key], mdict.get(key) or
+	mdict.lookup(key)) without reading the whole file; the last cache_size
+	decompressed record blocks are kept in memory.
 	"""
 
-	def __init__(
+	def __init__(  # noqa: PLR0913
 		self,
 		fname: str,
 		encoding: str = "",
 		passcode: tuple[bytes, bytes] | None = None,
+		workers: int = 1,
+		processes: bool = False,
+		memory_budget: int = default_memory_budget,
+		cache_size: int = default_cache_size,
 	) -> None:
 		self._fname = fname
 		self._encoding = encoding.upper()
 		self._encrypted_key = None
 		self._passcode = passcode
+		if workers <= 0:
+			workers = min(8, os.cpu_count() or 1)
+		self._workers = workers
+		self._processes = processes
+		self._memory_budget = memory_budget
+		self._cache_size = cache_size
+		# lookup index, see _init_lookup
+		self._lookup_lock = threading.Lock()
+		self._mmap = None
+		self._block_cache = OrderedDict()
 
 		self.header = self._read_header()
 
@@ -161,59 +257,12 @@ class MDict:
 		}
 
 	def _decode_block(self, block, decompressed_size):
-		# block info: compression, encryption
-		info = unpack("<L", block[:4])[0]
-		compression_method = info & 0xF
-		encryption_method = (info >> 4) & 0xF
-		encryption_size = (info >> 8) & 0xFF
-
-		# adler checksum of the block data used as the encryption key if none given
-		adler32 = unpack(">I", block[4:8])[0]
-		encrypted_key = self._encrypted_key
-		if encrypted_key is None:
-			encrypted_key = ripemd128(block[4:8])
-
-		# block data
-		data = block[8:]
-
-		# decrypt
-		if encryption_method == 0:
-			decrypted_block = data
-		elif encryption_method == 1:
-			decrypted_block = (
-				_fast_decrypt(data[:encryption_size], encrypted_key)
-				+ data[encryption_size:]
-			)
-		elif encryption_method == 2:
-			decrypted_block = (
-				_salsa_decrypt(data[:encryption_size], encrypted_key)
-				+ data[encryption_size:]
-			)
-		else:
-			raise ValueError(f"encryption method {encryption_method} not supported")
-
-		# check adler checksum over decrypted data
-		if self._version >= 3:
-			assert hex(adler32) == hex(zlib.adler32(decrypted_block) & 0xFFFFFFFF)
-
-		# decompress
-		if compression_method == 0:
-			decompressed_block = decrypted_block
-		elif compression_method == 1:
-			if lzo is None:
-				raise RuntimeError("LZO compression is not supported")
-			header = b"\xf0" + pack(">I", decompressed_size)
-			decompressed_block = lzo.decompress(header + decrypted_block)
-		elif compression_method == 2:
-			decompressed_block = zlib.decompress(decrypted_block)
-		else:
-			raise ValueError(f"compression method {compression_method} not supported")
-
-		# check adler checksum over decompressed data
-		if self._version < 3:
-			assert hex(adler32) == hex(zlib.adler32(decompressed_block) & 0xFFFFFFFF)
-
-		return decompressed_block
+		return _decode_block(
+			block,
+			decompressed_size,
+			self._encrypted_key,
+			self._version,
+		)
 
 	def _decode_key_block_info(self, key_block_info_compressed):
 		if self._version >= 2:
@@ -568,51 +617,34 @@ class MDict:
 			yield from self._read_records_v1v2()
 
 	def _read_records_v3(self):
-		f = open(self._fname, "rb")
-		f.seek(self._record_block_offset)
-
-		offset = 0
-		i = 0
-		# size_counter = 0
+		with open(self._fname, "rb") as f:
+			f.seek(self._record_block_offset)
+			yield from self._split_record_blocks(
+				self._decode_record_blocks(
+					self._raw_record_blocks_v3(f),
+					skip_errors=False,
+				),
+			)
 
+	def _raw_record_blocks_v3(self, f):
 		num_record_blocks = self._read_int32(f)
 		self._read_number(f)  # num_bytes
 		for _ in range(num_record_blocks):
 			decompressed_size = self._read_int32(f)
 			compressed_size = self._read_int32(f)
-			record_block = self._decode_block(
-				f.read(compressed_size),
-				decompressed_size,
-			)
-
-			# split record block according to the offset info from key block
-			while i < len(self._key_list):
-				record_start, key_text = self._key_list[i]
-				# reach the end of current record block
-				if record_start - offset >= len(record_block):
-					break
-				# record end index
-				if i < len(self._key_list) - 1:
-					record_end = self._key_list[i + 1][0]
-				else:
-					record_end = len(record_block) + offset
-				i += 1
-				data = record_block[record_start - offset : record_end - offset]
-				yield key_text, self._treat_record_data(data)
-			offset += len(record_block)
-			# size_counter += compressed_size
-
-	def _read_records_v1v2(self):
-		f = open(self._fname, "rb")
-		f.seek(self._record_block_offset)
+			yield f.read(compressed_size), decompressed_size
 
+	def _read_record_block_info_v1v2(self, f):
+		"""
+		Read record block info section, return a list of
+		(compressed_size, decompressed_size) tuples.
+		"""
 		num_record_blocks = self._read_number(f)
 		num_entries = self._read_number(f)
 		assert num_entries == self._num_entries
 		record_block_info_size = self._read_number(f)
 		self._read_number(f)  # record_block_size
 
-		# record block info section
 		record_block_info_list = []
 		size_counter = 0
 		for _ in range(num_record_blocks):
@@ -621,41 +653,253 @@ class MDict:
 			record_block_info_list += [(compressed_size, decompressed_size)]
 			size_counter += self._number_width * 2
 		assert size_counter == record_block_info_size
+		return record_block_info_list
 
-		# actual record block
-		offset = 0
-		i = 0
-		size_counter = 0
-		for compressed_size, decompressed_size in record_block_info_list:
-			record_block_compressed = f.read(compressed_size)
-			try:
-				record_block = self._decode_block(
-					record_block_compressed,
+	def _read_records_v1v2(self):
+		with open(self._fname, "rb") as f:
+			f.seek(self._record_block_offset)
+			record_block_info_list = self._read_record_block_info_v1v2(f)
+
+			# actual record block
+			raw_blocks = (
+				(f.read(compressed_size), decompressed_size)
+				for compressed_size, decompressed_size in record_block_info_list
+			)
+			yield from self._split_record_blocks(
+				self._decode_record_blocks(raw_blocks, skip_errors=True),
+			)
+
+	@staticmethod
+	def _record_block_result(get_block, compressed, skip_errors):
+		try:
+			return get_block()
+		except zlib.error:
+			if not skip_errors:
+				raise
+			log.error("zlib decompress error")
+			log.debug(f"record_block_compressed = {compressed!r}")
+			return None
+
+	def _decode_record_blocks(self, raw_blocks, skip_errors):
+		"""
+		Decode (compressed_block, decompressed_size) pairs and yield
+		decompressed blocks in the same order.
+		If skip_errors is True, blocks with zlib errors are logged and skipped.
+		"""
+		workers = self._workers
+		if workers == 1:
+			for compressed, decompressed_size in raw_blocks:
+				block = self._record_block_result(
+					partial(self._decode_block, compressed, decompressed_size),
+					compressed,
+					skip_errors,
+				)
+				if block is not None:
+					yield block
+			return
+
+		executor_class = ProcessPoolExecutor if self._processes else ThreadPoolExecutor
+		max_pending = 2 * workers
+		memory_budget = self._memory_budget
+		encrypted_key = self._encrypted_key
+		version = self._version
+		# items are (future, compressed, memory_size)
+		pending = deque()
+		pending_size = 0
+
+		def pop_pending():
+			nonlocal pending_size
+			future, compressed, size = pending.popleft()
+			pending_size -= size
+			return self._record_block_result(future.result, compressed, skip_errors)
+
+		pool = executor_class(max_workers=workers)
+		try:
+			for compressed, decompressed_size in raw_blocks:
+				size = len(compressed) + decompressed_size
+				# wait for pending blocks, but a single block larger than
+				# memory_budget is still decoded
+				while pending and (
+					len(pending) >= max_pending or pending_size + size > memory_budget
+				):
+					block = pop_pending()
+					if block is not None:
+						yield block
+				future = pool.submit(
+					_decode_block,
+					compressed,
 					decompressed_size,
+					encrypted_key,
+					version,
 				)
-			except zlib.error:
-				log.error("zlib decompress error")
-				log.debug(f"record_block_compressed = {record_block_compressed!r}")
-				continue
-			# split record block according to the offset info from key block
-			while i < len(self._key_list):
-				record_start, key_text = self._key_list[i]
+				pending.append((future, compressed, size))
+				pending_size += size
+			while pending:
+				block = pop_pending()
+				if block is not None:
+					yield block
+		finally:
+			pool.shutdown(wait=True, cancel_futures=True)
+
+	def _split_record_blocks(self, record_blocks):
+		"""Split record blocks according to the offset info from key block."""
+		key_list = self._key_list
+		offset = 0
+		i = 0
+		for record_block in record_blocks:
+			while i < len(key_list):
+				record_start, key_text = key_list[i]
 				# reach the end of current record block
 				if record_start - offset >= len(record_block):
 					break
 				# record end index
-				if i < len(self._key_list) - 1:
-					record_end = self._key_list[i + 1][0]
+				if i < len(key_list) - 1:
+					record_end = key_list[i + 1][0]
 				else:
 					record_end = len(record_block) + offset
 				i += 1
 				data = record_block[record_start - offset : record_end - offset]
 				yield key_text, self._treat_record_data(data)
 			offset += len(record_block)
-			size_counter += compressed_size
-		# assert size_counter == record_block_size
 
-		f.close()
+	# random access lookup
+
+	def _init_lookup(self):
+		"""
+		Build the lookup index on first use.
+
+		The file is memory-mapped, record start offsets and the record block
+		table are kept in arrays, and entry indexes sorted by key in another
+		array, so a lookup only needs a binary search and decoding of
+		a single record block.
+		"""
+		with self._lookup_lock:
+			if self._mmap is not None:
+				return
+			key_list = self._key_list
+			block_file_offsets = array("Q")
+			block_compressed_sizes = array("Q")
+			block_starts = array("Q")
+			block_decompressed_sizes = array("Q")
+			with open(self._fname, "rb") as f:
+				f.seek(self._record_block_offset)
+				if self._version >= 3:
+					num_record_blocks = self._read_int32(f)
+					self._read_number(f)  # num_bytes
+					block_info = []
+					for _ in range(num_record_blocks):
+						decompressed_size = self._read_int32(f)
+						compressed_size = self._read_int32(f)
+						block_info.append((f.tell(), compressed_size, decompressed_size))
+						f.seek(compressed_size, 1)
+				else:
+					pos = None
+					block_info = []
+					record_block_info = self._read_record_block_info_v1v2(f)
+					for compressed_size, decompressed_size in record_block_info:
+						if pos is None:
+							pos = f.tell()
+						block_info.append((pos, compressed_size, decompressed_size))
+						pos += compressed_size
+				offset = 0
+				for file_offset, compressed_size, decompressed_size in block_info:
+					block_file_offsets.append(file_offset)
+					block_compressed_sizes.append(compressed_size)
+					block_starts.append(offset)
+					block_decompressed_sizes.append(decompressed_size)
+					offset += decompressed_size
+				mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+			self._block_file_offsets = block_file_offsets
+			self._block_compressed_sizes = block_compressed_sizes
+			self._block_starts = block_starts
+			self._block_decompressed_sizes = block_decompressed_sizes
+			self._record_starts = array("Q", (key_id for key_id, _ in key_list))
+			self._sorted_indexes = array(
+				"L",
+				sorted(range(len(key_list)), key=lambda i: key_list[i][1]),
+			)
+			self._mmap = mm
+
+	def _get_record_block(self, block_index):
+		cache = self._block_cache
+		with self._lookup_lock:
+			block = cache.get(block_index)
+			if block is not None:
+				cache.move_to_end(block_index)
+				return block
+		start = self._block_file_offsets[block_index]
+		block = self._decode_block(
+			self._mmap[start : start + self._block_compressed_sizes[block_index]],
+			self._block_decompressed_sizes[block_index],
+		)
+		with self._lookup_lock:
+			cache[block_index] = block
+			if len(cache) > self._cache_size:
+				cache.popitem(last=False)
+		return block
+
+	def _get_record(self, index):
+		record_starts = self._record_starts
+		record_start = record_starts[index]
+		block_index = bisect_right(self._block_starts, record_start) - 1
+		block_start = self._block_starts[block_index]
+		block = self._get_record_block(block_index)
+		if index < len(record_starts) - 1:
+			record_end = record_starts[index + 1]
+		else:
+			record_end = block_start + len(block)
+		return self._treat_record_data(
+			block[record_start - block_start : record_end - block_start],
+		)
+
+	def lookup(self, key):
+		"""
+		Return a list of all records (definitions or resource data)
+		with the given key, which is bytes (in UTF-8) or str.
+		Only the record blocks containing these records are decompressed.
+		"""
+		if isinstance(key, str):
+			key = key.encode("utf-8")
+		if self._mmap is None:
+			self._init_lookup()
+		key_list = self._key_list
+		sorted_indexes = self._sorted_indexes
+
+		def key_func(i):
+			return key_list[i][1]
+
+		start = bisect_left(sorted_indexes, key, key=key_func)
+		end = bisect_right(sorted_indexes, key, lo=start, key=key_func)
+		return [self._get_record(index) for index in sorted_indexes[start:end]]
+
+	def get(self, key, default=None):
+		records = self.lookup(key)
+		if not records:
+			return default
+		return records[0]
+
+	def __getitem__(self, key):
+		records = self.lookup(key)
+		if not records:
+			raise KeyError(key)
+		return records[0]
+
+	def __contains__(self, key):
+		return bool(self.lookup(key))
+
+	def close(self):
+		"""Close the memory-mapped file used for lookups, if any."""
+		with self._lookup_lock:
+			if self._mmap is not None:
+				self._mmap.close()
+				self._mmap = None
+			self._block_cache.clear()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_val, exc_tb):
+		self.close()
 
 	def _treat_record_data(self, data):  # noqa: PLR6301
 		return data
@@ -671,12 +915,25 @@ class MDD(MDict):
 	... print(filename, content[:10])
 	"""
 
-	def __init__(
+	def __init__(  # noqa: PLR0913
 		self,
 		fname: str,
 		passcode: tuple[bytes, bytes] | None = None,
+		workers: int = 1,
+		processes: bool = False,
+		memory_budget: int = default_memory_budget,
+		cache_size: int = default_cache_size,
 	) -> None:
-		MDict.__init__(self, fname, encoding="UTF-16", passcode=passcode)
+		MDict.__init__(
+			self,
+			fname,
+			encoding="UTF-16",
+			passcode=passcode,
+			workers=workers,
+			processes=processes,
+			memory_budget=memory_budget,
+			cache_size=cache_size,
+		)
 
 
 class MDX(MDict):
@@ -689,14 +946,27 @@ class MDX(MDict):
 	... print(key, value[:10])
 	"""
 
-	def __init__(
+	def __init__(  # noqa: PLR0913
 		self,
 		fname: str,
 		encoding: str = "",
 		substyle: bool = False,
 		passcode: tuple[bytes, bytes] | None = None,
+		workers: int = 1,
+		processes: bool = False,
+		memory_budget: int = default_memory_budget,
+		cache_size: int = default_cache_size,
 	) -> None:
-		MDict.__init__(self, fname, encoding, passcode)
+		MDict.__init__(
+			self,
+			fname,
+			encoding,
+			passcode,
+			workers=workers,
+			processes=processes,
+			memory_budget=memory_budget,
+			cache_size=cache_size,
+		)
 		self._substyle = substyle
 
 	def _substitute_stylesheet(self, txt):
@@ -219,7 +219,7 @@ class PluginProp:  # noqa: PLR0904
 		try:
 			mod = __import__(
 				f"pyglossary.plugins.{moduleName}",
-				fromlist=moduleName,
+				fromlist=[moduleName],
 			)
 		except ModuleNotFoundError as e:
 			log.warning(
@@ -393,6 +393,45 @@ class PluginProp:  # noqa: PLR0904
 			self._writeDepends = getattr(self.writerClass, "depends", {})
 		return self._writeDepends
 
+	def toDict(self) -> dict[str, Any]:
+		"""
+		Return metadata of plugin as a dict, that can be passed to fromDict.
+		This is the format of plugins-meta/index.json.
+		This imports the plugin module if it's not already imported.
+		"""
+		canRead = self.canRead
+		canWrite = self.canWrite
+		item: dict[str, Any] = {
+			"module": self.moduleName.rpartition(".")[2],
+			"lname": self.lname,
+			"name": self.name,
+			"description": self.description,
+			"extensions": self.extensions,
+			"singleFile": self.singleFile,
+			"optionsProp": {name: opt.toDict() for name, opt in self.optionsProp.items()},
+			"canRead": canRead,
+			"canWrite": canWrite,
+		}
+		if self.extensionCreate:
+			item["extensionCreate"] = self.extensionCreate
+		if self.sortOnWrite != DEFAULT_NO:
+			item["sortOnWrite"] = self.sortOnWrite
+		if self.sortKeyName:
+			item["sortKeyName"] = self.sortKeyName
+		if canRead:
+			item["readOptions"] = self.getReadOptions()
+		if canWrite:
+			item["writeOptions"] = self.getWriteOptions()
+		if not self.enable:
+			item["enable"] = False
+		if self.readDepends:
+			item["readDepends"] = self.readDepends
+		if self.writeDepends:
+			item["writeDepends"] = self.writeDepends
+		if self.readCompressions:
+			item["readCompressions"] = list(self.readCompressions)
+		return item
+
 	def checkModule(self, module: Any) -> None:
 		name = self.name
 
@@ -79,6 +79,10 @@ optionsProp: dict[str, Option] = {
 	"audio_goldendict": BoolOption(
 		comment="Convert audio links for GoldenDict (desktop)",
 	),
+	"sort_memory": FileSizeOption(
+		comment="approximate memory used for sorting before using temp files"
+		"\nexamples: 256m, 1g",
+	),
 }
 
 docTail = """### pyicu
@@ -40,6 +40,7 @@ class Writer:
 	_version_info: bool = False
 
 	_audio_goldendict: bool = False
+	_sort_memory: int = 256 * 1024 * 1024
 
 	resourceMimeTypes = {
 		"bmp": "image/bmp",
@@ -101,6 +102,7 @@ class Writer:
 			workdir=cacheDir,
 			compression=self._compression,
 			version_info=self._version_info,
+			sort_memory=self._sort_memory,
 		)
 
 		# "label" tag is a dictionary name shown in UI
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from itertools import repeat
 from typing import TYPE_CHECKING
 
 from pyglossary.core import log
+from pyglossary.sqlite_utils import bulkLoadPragmas
 
 if TYPE_CHECKING:
 	import sqlite3
@@ -14,6 +17,30 @@ if TYPE_CHECKING:
 
 __all__ = ["Writer"]
 
+# number of entries buffered before they (with their alts and fuzzy rows)
+# are inserted with executemany calls
+defaultBatchSize = 1000
+
+# maximum number of buffered fuzzy3 rows, flushed earlier if reached
+fuzzyBatchSize = 100_000
+
+_indexQueries = (
+	"CREATE INDEX idx_meta ON meta(key);",
+	"CREATE INDEX idx_entry_term ON entry(term COLLATE NOCASE);",
+	"CREATE INDEX idx_alt_id ON alt(id);",
+	"CREATE INDEX idx_alt_term ON alt(term COLLATE NOCASE);",
+)
+
+
+_fuzzyIndexQuery = "CREATE INDEX idx_fuzzy3_sub ON fuzzy3(sub COLLATE NOCASE);"
+
+
+@lru_cache(maxsize=100_000)
+def _wordTrigrams(word: str) -> tuple[str, ...]:
+	"""3-character substrings of word, prefixed by a newline."""
+	eword = "\n" + word
+	return tuple(eword[i : i + 3] for i in range(len(eword) - 2))
+
 
 class Writer:
 	_fuzzy: int = True
@@ -27,6 +54,9 @@ class Writer:
 		self._con: sqlite3.Connection | None = None
 		self._cur: sqlite3.Cursor | None = None
 		self._xdxfTr: XdxfTransformer | None = None
+		self._entryRows: list[tuple[int, str, str]] = []
+		self._altRows: list[tuple[int, str]] = []
+		self._fuzzyRows: list[tuple[str, str, int]] = []
 
 	def open(self, filename: str) -> None:
 		from sqlite3 import connect
@@ -35,6 +65,11 @@ class Writer:
 		con = self._con = connect(filename)
 		self._cur = self._con.cursor()
 
+		# the database is built from scratch in a single transaction,
+		# indexes are created after all rows are inserted
+		for query in bulkLoadPragmas:
+			con.execute(query)
+
 		for query in (
 			"CREATE TABLE meta ('key' TEXT PRIMARY KEY NOT NULL, 'value' TEXT);",
 			(
@@ -42,10 +77,6 @@ class Writer:
 				"'term' TEXT, 'article' TEXT);"
 			),
 			"CREATE TABLE alt ('id' INTEGER NOT NULL, 'term' TEXT);",
-			"CREATE INDEX idx_meta ON meta(key);",
-			"CREATE INDEX idx_entry_term ON entry(term COLLATE NOCASE);",
-			"CREATE INDEX idx_alt_id ON alt(id);",
-			"CREATE INDEX idx_alt_term ON alt(term COLLATE NOCASE);",
 		):
 			try:
 				con.execute(query)
@@ -53,11 +84,10 @@ class Writer:
 				log.error(f"query: {query}")
 				raise
 
-		for key, value in self._glos.iterInfo():
-			con.execute(
-				"INSERT	INTO meta (key, value) VALUES (?, ?);",
-				(key, value),
-			)
+		con.executemany(
+			"INSERT	INTO meta (key, value) VALUES (?, ?);",
+			list(self._glos.iterInfo()),
+		)
 
 		if self._fuzzy:
 			con.execute(
@@ -65,21 +95,51 @@ class Writer:
 				"'term' TEXT NOT NULL, "
 				"id INTEGER NOT NULL);",
 			)
-			con.execute(
-				"CREATE INDEX idx_fuzzy3_sub ON fuzzy3(sub COLLATE NOCASE);",
-			)
-
-		con.commit()
 
 	def finish(self) -> None:
 		if self._con is None or self._cur is None:
 			return
 
+		self._flush()
+		self._createIndexes()
 		self._con.commit()
 		self._con.close()
 		self._con = None
 		self._cur = None
 
+	def _createIndexes(self) -> None:
+		con = self._con
+		if con is None:
+			raise ValueError("con is None")
+		queries = list(_indexQueries)
+		if self._fuzzy:
+			queries.append(_fuzzyIndexQuery)
+		for query in queries:
+			con.execute(query)
+
+	def _flush(self) -> None:
+		cur = self._cur
+		if cur is None:
+			raise ValueError("cur is None")
+		if self._entryRows:
+			cur.executemany(
+				"INSERT INTO entry(id, term, article) VALUES (?, ?, ?);",
+				self._entryRows,
+			)
+			self._entryRows.clear()
+		if self._altRows:
+			cur.executemany(
+				"INSERT INTO alt(id, term) VALUES (?, ?);",
+				self._altRows,
+			)
+			self._altRows.clear()
+		if self._fuzzyRows:
+			cur.executemany(
+				"INSERT INTO fuzzy3(sub, term, id) VALUES (?, ?, ?);",
+				self._fuzzyRows,
+			)
+			self._fuzzyRows.clear()
+
 	def xdxf_setup(self) -> None:
 		from pyglossary.xdxf.py_transform import XdxfTransformer
 
@@ -100,6 +160,9 @@ class Writer:
 		if cur is None:
 			raise ValueError("cur is None")
 		hash_ = hashlib.md5()
+		entryRows = self._entryRows
+		altRows = self._altRows
+		id_ = 0
 		while True:
 			entry = yield
 			if entry is None:
@@ -115,38 +178,29 @@ class Writer:
 			elif entry.defiFormat == "x":
 				defi = self.xdxf_transform(defi)
 
-			cur.execute(
-				"INSERT INTO entry(term, article) VALUES (?, ?);",
-				(entry.l_term[0], defi),
-			)
-			id_ = cur.lastrowid
-			if id_ is None:
-				raise ValueError("lastrowid is None")
-			for alt in entry.l_term[1:]:
-				cur.execute(
-					"INSERT INTO alt(id, term) VALUES (?, ?);",
-					(id_, alt),
-				)
+			id_ += 1
+			entryRows.append((id_, entry.l_term[0], defi))
+			altRows.extend((id_, alt) for alt in entry.l_term[1:])
 			hash_.update(entry.s_term.encode("utf-8"))
 			if self._fuzzy:
 				self.addFuzzy(id_, entry.l_term)
+			if (
+				len(entryRows) >= defaultBatchSize
+				or len(self._fuzzyRows) >= fuzzyBatchSize
+			):
+				self._flush()
 
+		self._flush()
 		cur.execute(
 			"INSERT INTO meta (key, value) VALUES (?, ?);",
 			("hash", hash_.hexdigest()),
 		)
 
 	def addFuzzy(self, id_: int, terms: list[str]) -> None:
-		cur = self._cur
-		if cur is None:
-			raise ValueError("cur is None")
-		for term in terms:
+		"""Buffer fuzzy3 rows (3-character substrings) of terms of an entry."""
+		rows = self._fuzzyRows
+		for term in dict.fromkeys(terms):
 			subs: set[str] = set()
 			for word in term.split(" "):
-				eword = "\n" + word
-				subs.update(eword[i : i + 3] for i in range(len(eword) - 2))
-			for sub in subs:
-				cur.execute(
-					"INSERT INTO fuzzy3(sub, term, id) VALUES (?, ?, ?);",
-					(sub, term, id_),
-				)
+				subs.update(_wordTrigrams(word))
+			rows.extend(zip(subs, repeat(term), repeat(id_)))
@@ -25,8 +25,6 @@ import os
 import re
 from typing import TYPE_CHECKING
 
-from pyglossary.core import log
-
 from .reader_charset import _BglReaderCharset
 from .reader_data import (
 	Block,
@@ -110,7 +108,9 @@ class Reader(
 		self._glos = glos
 		self._filename = ""
 		self.info = {}
-		self.numEntries = None
+		self.numEntries = 0
+		self.numResources = 0
+		self.numBlocks = 0
 		####
 		self.sourceLang = ""
 		self.targetLang = ""
@@ -137,6 +137,10 @@ class Reader(
 		self.file = None
 		# offset of gzip header, set in self.open()
 		self.gzipOffset = None
+		# blocks of dictionary data, and the first article (or resource)
+		# block, set in self.readInfo()
+		self._blocks = None
+		self._firstBlock = None
 		# must be a in RRGGBB format
 		self.iconDataList = []
 		self.aboutBytes: bytes | None = None
@@ -146,7 +150,6 @@ class Reader(
 		return 0
 
 	def __len__(self) -> int:
-		if self.numEntries is None:
-			log.warning("len(reader) called while numEntries=None")
-			return 0
-		return self.numEntries + self.numResources
+		# entries are not counted before iterating, so the number in the
+		# header is used for progress, and 0 means it's not known
+		return self.bgl_numEntries or 0
@@ -49,11 +49,16 @@ class EntryWordData(NamedTuple):
 
 
 class Block:
-	def __init__(self) -> None:
-		self.data = b""
-		self.type = ""
+	def __init__(
+		self,
+		blockType: int | str = "",
+		data: bytes = b"",
+		offset: int = -1,
+	) -> None:
+		self.data = data
+		self.type = blockType
 		# block offset in the gzip stream, for debugging
-		self.offset = -1
+		self.offset = offset
 
 	def __str__(self) -> str:
 		return f"Block type={self.type}, length={self.length}, len(data)={len(self.data)}"
@@ -380,7 +380,7 @@ class DebugReader(Reader):
 	def dumpBlocks(self, dumpPath):
 		import pickle
 
-		self.file.seek(0)
+		self.rewind()
 		metaData = MetaData()
 		metaData.numFiles = 0
 		metaData.gzipStartOffset = self.gzipOffset
@@ -389,16 +389,8 @@ class DebugReader(Reader):
 		self.numBlocks = 0
 		range_type = None
 		range_count = 0
-		block = Block()
-		while not self.isEndOfDictData():
-			log.debug(
-				f"readBlock: offset {self.file.tell():#02x}, "
-				f"unpacked offset {self.file.unpackedFile.tell():#02x}",
-			)
-			if not self.readBlock(block):
-				break
-			self.numBlocks += 1
-
+		for block in self.iterBlocks():
+			log.debug(f"readBlock: offset {block.offset:#02x}")
 			if block.type in {1, 7, 10, 11, 13}:
 				self.numEntries += 1
 			elif block.type == 2:  # Embedded File (mostly Image or HTML)
@@ -437,7 +429,7 @@ class DebugReader(Reader):
 		with open(dumpPath, "wb") as f:
 			pickle.dump(metaData, f)
 
-		self.file.seek(0)
+		self.rewind()
 
 	def dumpMetadata2(self, dumpPath):
 		import pickle
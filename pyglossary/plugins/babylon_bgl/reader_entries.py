@@ -21,6 +21,8 @@
 # If not, see <http://www.gnu.org/licenses/gpl.txt>.
 from __future__ import annotations
 
+import os
+from itertools import chain
 from typing import TYPE_CHECKING
 
 from pyglossary.core import log
@@ -40,7 +42,7 @@ class _BglReaderEntries:
 	"""Entry iteration and per-block entry parsing."""
 
 	def __iter__(self) -> Iterator[EntryType]:  # noqa: PLR0912
-		if not self.file:
+		if not self.file or self._blocks is None:
 			raise RuntimeError("iterating over a reader while it's not open")
 
 		for fname, iconData in self.iconDataList:
@@ -52,17 +54,29 @@ class _BglReaderEntries:
 				self.aboutBytes,
 			)
 
-		block = Block()
-		while not self.isEndOfDictData():
-			if not self.readBlock(block):
-				break
+		# without bgl_numEntries, progress is based on position in bgl file
+		byteProgress = None
+		rawFile = self.file.fileobj
+		fileSize = os.path.getsize(self._filename) - self.gzipOffset
+
+		blocks = self._blocks
+		if self._firstBlock is not None:
+			blocks = chain((self._firstBlock,), blocks)
+			self._firstBlock = None
+
+		for block in blocks:
 			if not block.data:
 				continue
 
+			if not self.bgl_numEntries:
+				byteProgress = (rawFile.tell(), fileSize)
+
 			if block.type == 2:
+				self.numResources += 1
 				yield self.readType2(block)
 
 			elif block.type == 11:
+				self.numEntries += 1
 				succeed, u_word, u_alts, u_defi = self.readEntry_Type11(block)
 				if not succeed:
 					continue
@@ -70,9 +84,11 @@ class _BglReaderEntries:
 				yield self._glos.newEntry(
 					[u_word] + u_alts,
 					u_defi,
+					byteProgress=byteProgress,
 				)
 
 			elif block.type in {1, 7, 10, 11, 13}:
+				self.numEntries += 1
 				pos = 0
 				# word:
 				wordData = self.readEntryWord(block, pos)
@@ -98,8 +114,23 @@ class _BglReaderEntries:
 				yield self._glos.newEntry(
 					[wordData.u_word] + u_alts,
 					u_defi,
+					byteProgress=byteProgress,
 				)
 
+			else:
+				yield from self.readLateMetaBlock(block)
+
+		log.debug(f"numEntries = {self.numEntries}")
+		if self.bgl_numEntries and self.bgl_numEntries != self.numEntries:
+			# There are a number of cases when these numbers do not match.
+			# The dictionary is OK, and these is no doubt that we might missed
+			# an entry.
+			# self.bgl_numEntries may be less than the number of entries
+			# we've read.
+			log.warning(
+				f"bgl_numEntries={self.bgl_numEntries}, numEntries={self.numEntries}",
+			)
+
 	def readType2(self, block: Block) -> EntryType | None:
 		"""
 		Process type 2 block.
@@ -22,6 +22,7 @@
 from __future__ import annotations
 
 import io
+import zlib
 from typing import TYPE_CHECKING, Any
 
 from pyglossary.core import log
@@ -29,14 +30,18 @@ from pyglossary.text_utils import uintFromBytes
 
 from .bgl_gzip import GzipFile
 from .bgl_text import unknownHtmlEntries
+from .reader_data import Block
 
 if TYPE_CHECKING:
-	from .reader_data import Block
+	from collections.abc import Iterator
 
 __all__ = ["BGLGzipFile", "FileOffS", "_BglReaderIO"]
 
 file = io.BufferedReader
 
+# minimum size of decompressed data read at once
+readBufferSize = 256 * 1024
+
 
 class FileOffS(file):
 	"""
@@ -150,6 +155,8 @@ class _BglReaderIO:
 		return True
 
 	def close(self) -> None:
+		self._blocks = None
+		self._firstBlock = None
 		if self.file:
 			self.file.close()
 			self.file = None
@@ -160,80 +167,85 @@ class _BglReaderIO:
 			entity = unknownHtmlEntries.pop()
 			log.debug(f"BGL: unknown html entity: {entity}")
 
-	def isEndOfDictData(self) -> bool:  # noqa: PLR6301
+	def rewind(self) -> None:
+		"""Go back to the beginning of the (decompressed) dictionary data."""
+		self.file.seek(0)
+
+	def _readData(self, buf: bytes, size: int) -> tuple[bytes, bool]:
 		"""
-		Test for end of dictionary data.
-
-		A bgl file stores dictionary data as a gzip compressed block.
-		In other words, a bgl file stores a gzip data file inside.
-		A gzip file consists of a series of "members".
-		gzip data block in bgl consists of one member (I guess).
-		Testing for block type returned by self.readBlock is not a
-		reliable way to detect the end of gzip member.
-		For example, consider "Airport Code Dictionary.BGL" dictionary.
-		To reliably test for end of gzip member block we must use a number
-		of undocumented variables of gzip.GzipFile class.
-		self.file._new_member - true if the current member has been
-		completely read from the input file
-		self.file.extrasize - size of buffered data
-		self.file.offset - offset in the input file
-
-		after reading one gzip member current position in the input file
-		is set to the first byte after gzip data
-		We may get this offset: self.file_bgl.tell()
-		The last 4 bytes of gzip block contains the size of the original
-		(uncompressed) input data modulo 2^32
+		Return `buf` followed by newly read data, at least `size` bytes
+		in total unless the end of data is reached.
+		Second item of returned tuple is True if the end of data is reached.
 		"""
-		return False
-
-	# returns False if error
-	def readBlock(self, block: Block) -> bool:
-		block.offset = self.file.tell()
-		length = self.readBytes(1)
-		if length == -1:
-			log.debug("readBlock: length = -1")
-			return False
-		block.type = length & 0xF
-		length >>= 4
-		if length < 4:
-			length = self.readBytes(length + 1)
-			if length == -1:
-				log.error("readBlock: length = -1")
-				return False
-		else:
-			length -= 4
-		self.file.flush()
-		if length > 0:
+		parts = [buf]
+		have = len(buf)
+		read1 = self.file.read1
+		while have < size:
 			try:
-				block.data = self.file.read(length)
-			except Exception:
-				# struct.error: unpack requires a string argument of length 4
-				# FIXME
+				chunk = read1(max(size - have, readBufferSize))
+			except (OSError, EOFError, zlib.error):
 				log.exception(
-					"failed to read block data"
-					f": numBlocks={self.numBlocks}"
-					f", length={length}"
-					f", filePos={self.file.tell()}",
+					f"failed to read gzip data: numBlocks={self.numBlocks}",
 				)
-				block.data = b""
-				return False
-		else:
-			block.data = b""
-		return True
+				return b"".join(parts), True
+			if not chunk:
+				return b"".join(parts), True
+			parts.append(chunk)
+			have += len(chunk)
+		return b"".join(parts), False
+
+	def iterBlocks(self) -> Iterator[Block]:
+		"""
+		Yield blocks of dictionary data, from the current position of
+		self.file to the end of data.
 
-	def readBytes(self, num: int) -> int:
-		"""Return -1 if error."""
-		if num < 1 or num > 4:
-			log.error(f"invalid argument num={num}")
-			return -1
-		self.file.flush()
-		buf = self.file.read(num)
-		if len(buf) == 0:
-			log.debug("readBytes: end of file: len(buf)==0")
-			return -1
-		if len(buf) != num:
-			log.error(
-				f"readBytes: expected to read {num} bytes, but found {len(buf)} bytes",
+		Decompressed data is read in large chunks and blocks are sliced
+		out of the buffer, instead of calling self.file.read for the
+		1 to 4 bytes length of each block.
+		"""
+		buf = b""
+		pos = 0
+		# offset of buf[pos] in the gzip stream
+		offset = self.file.tell()
+		eof = False
+		while True:
+			# block header is 1 to 5 bytes
+			if len(buf) - pos < 5 and not eof:
+				buf, eof = self._readData(buf[pos:], 5)
+				pos = 0
+			size = len(buf)
+			if pos >= size:
+				return
+			first = buf[pos]
+			length = first >> 4
+			if length < 4:
+				dataPos = pos + length + 2
+				if dataPos > size:
+					log.error(
+						f"block header at offset={offset:#02x} is truncated",
+					)
+					return
+				length = int.from_bytes(buf[pos + 1 : dataPos], "big")
+			else:
+				dataPos = pos + 1
+				length -= 4
+			end = dataPos + length
+			if end > size and not eof:
+				buf, eof = self._readData(buf[pos:], end - pos)
+				dataPos -= pos
+				end -= pos
+				pos = 0
+			self.numBlocks += 1
+			yield Block(
+				blockType=first & 0xF,
+				data=buf[dataPos:end],
+				offset=offset,
 			)
-			return -1
-		return uintFromBytes(buf)
+			if end > len(buf):
+				log.error(
+					f"block at offset={offset:#02x} is truncated"
+					f": length={length}, numBlocks={self.numBlocks}",
+				)
+				return
+			offset += end - pos
+			pos = end
@@ -21,6 +21,8 @@
 # If not, see <http://www.gnu.org/licenses/gpl.txt>.
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
 from pyglossary.core import log
 from pyglossary.text_utils import uintFromBytes
 
@@ -28,70 +30,95 @@ from .bgl_info import (
 	charsetInfoDecode,
 	infoType3ByCode,
 )
-from .reader_data import Block
+
+if TYPE_CHECKING:
+	from collections.abc import Iterator
+
+	from pyglossary.glossary_types import EntryType
+
+	from .reader_data import Block
 
 __all__ = ["_BglReaderMeta"]
 
 
 class _BglReaderMeta:
-	"""Dictionary metadata (first pass) and glossary info."""
+	"""Dictionary metadata and glossary info."""
 
-	# TODO: PLR0912 Too many branches (14 > 12)
-	def readInfo(self) -> None:  # noqa: PLR0912
+	def readInfo(self) -> None:
 		"""
 		Read meta information about the dictionary: author, description,
 		source and target languages, etc (articles are not read).
+
+		Only the blocks before the first article or resource are read.
+		That block is kept in self._firstBlock, and the rest of blocks
+		are read (in the same pass) by __iter__.
 		"""
 		self.numEntries = 0
 		self.numBlocks = 0
 		self.numResources = 0
-		block = Block()
-		while not self.isEndOfDictData():
-			if not self.readBlock(block):
+		self._firstBlock = None
+		self._blocks = self.iterBlocks()
+		for block in self._blocks:
+			if block.type in {1, 2, 7, 10, 11, 13}:
+				self._firstBlock = block
 				break
-			self.numBlocks += 1
-			if not block.data:
-				continue
-			if block.type == 0:
-				self.readType0(block)
-			elif block.type in {1, 7, 10, 11, 13}:
-				self.numEntries += 1
-			elif block.type == 2:
-				self.numResources += 1
-			elif block.type == 3:
-				self.readType3(block)
-			else:  # Unknown block.type
-				log.debug(
-					f"Unknown Block type {block.type!r}"
-					f", data_length = {len(block.data)}"
-					f", number = {self.numBlocks}",
-				)
-		self.file.seek(0)
+			self.readMetaBlock(block)
 
 		self.detectEncoding()
 
-		log.debug(f"numEntries = {self.numEntries}")
-		if self.bgl_numEntries and self.bgl_numEntries != self.numEntries:
-			# There are a number of cases when these numbers do not match.
-			# The dictionary is OK, and these is no doubt that we might missed
-			# an entry.
-			# self.bgl_numEntries may be less than the number of entries
-			# we've read.
-			log.warning(
-				f"bgl_numEntries={self.bgl_numEntries}, numEntries={self.numEntries}",
+		for key, value in self.info.items():
+			self.info[key] = self.decodeInfoValue(key, value)
+
+	def readMetaBlock(self, block: Block) -> None:
+		if not block.data:
+			return
+		if block.type == 0:
+			self.readType0(block)
+		elif block.type == 3:
+			self.readType3(block)
+		else:  # Unknown block.type
+			log.debug(
+				f"Unknown Block type {block.type!r}"
+				f", data_length = {len(block.data)}"
+				f", number = {self.numBlocks}",
 			)
 
-		self.numBlocks = 0
+	def readLateMetaBlock(self, block: Block) -> Iterator[EntryType]:
+		"""
+		Read a metadata block that comes after the first article, and
+		yield data entries for the icon or about file it may contain.
+
+		Encodings are already detected, so the charset and language of
+		such blocks are not used for decoding articles.
+		"""
+		log.debug(
+			f"metadata block after articles: type={block.type}, number={self.numBlocks}",
+		)
+		infoKeys = set(self.info)
+		iconCount = len(self.iconDataList)
+		aboutBytes = self.aboutBytes
+		self.readMetaBlock(block)
+		for key in self.info.keys() - infoKeys:
+			value = self.decodeInfoValue(key, self.info[key])
+			self.info[key] = value
+			self.setGlossaryInfoValue(key, value)
+		for fname, iconData in self.iconDataList[iconCount:]:
+			yield self._glos.newDataEntry(fname, iconData)
+		if self.aboutBytes and self.aboutBytes is not aboutBytes:
+			yield self._glos.newDataEntry(
+				"about" + self.aboutExt,
+				self.aboutBytes,
+			)
 
+	def decodeInfoValue(self, key: str, value: Any) -> Any:
+		if not isinstance(value, bytes):
+			return value
 		encoding = self.targetEncoding  # FIXME: confirm this is correct
-		for key, value in self.info.items():
-			if isinstance(value, bytes):
-				try:
-					value = value.decode(encoding)  # noqa: PLW2901
-				except Exception:
-					log.warning(f"failed to decode info value: {key} = {value}")
-				else:
-					self.info[key] = value
+		try:
+			return value.decode(encoding)
+		except Exception:
+			log.warning(f"failed to decode info value: {key} = {value}")
+		return value
 
 	def setGlossaryInfo(self) -> None:
 		glos = self._glos
@@ -120,17 +147,20 @@ class _BglReaderMeta:
 			self.info["lastUpdated"] = self.info.pop("bgl_firstUpdated")
 		###
 		for key, value in self.info.items():
-			s_value = str(value).strip("\x00")
-			if not s_value:
-				continue
-				# TODO: a bool flag to add empty value infos?
-			# leave "creationTime" and "lastUpdated" as is
-			if key == "utf8Encoding":
-				key = "bgl_" + key  # noqa: PLW2901
-			try:
-				glos.setInfo(key, s_value)
-			except Exception:
-				log.exception(f"key = {key}")
+			self.setGlossaryInfoValue(key, value)
+
+	def setGlossaryInfoValue(self, key: str, value: Any) -> None:
+		s_value = str(value).strip("\x00")
+		if not s_value:
+			return
+			# TODO: a bool flag to add empty value infos?
+		# leave "creationTime" and "lastUpdated" as is
+		if key == "utf8Encoding":
+			key = "bgl_" + key
+		try:
+			self._glos.setInfo(key, s_value)
+		except Exception:
+			log.exception(f"key = {key}")
 
 	def readType0(self, block: Block) -> bool:
 		code = block.data[0]
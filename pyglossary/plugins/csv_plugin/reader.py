@@ -24,6 +24,7 @@ from typing import TYPE_CHECKING, cast
 
 from pyglossary.compress import (
 	compressionOpen,
+	progressSize,
 	stdCompressions,
 )
 from pyglossary.core import log
@@ -32,7 +33,7 @@ from pyglossary.os_utils import countFilesRecursive, listFilesRecursiveRelPath
 
 if TYPE_CHECKING:
 	import io
-	from collections.abc import Iterable, Iterator
+	from collections.abc import Callable, Iterable, Iterator
 
 	from pyglossary.glossary_types import EntryType, ReaderGlossaryType
 
@@ -79,16 +80,17 @@ class Reader:
 			),
 		)
 
+		rawTell: Callable[[], int] | None = None
 		if self._glos.progressbar:
 			if cfile.seekable():
-				cfile.seek(0, 2)
-				self._fileSize = cfile.tell()
-				cfile.seek(0)
+				progress = progressSize(cfile)
+				self._fileSize = progress.size
+				rawTell = progress.rawTell
 				# self._glos.setInfo("input_file_size", f"{self._fileSize}")
 			else:
 				log.warning("CSV Reader: file is not seekable")
 
-		self._file = TextFilePosWrapper(cfile, self._encoding)
+		self._file = TextFilePosWrapper(cfile, self._encoding, rawTell=rawTell)
 		self._csvReader = csv.reader(
 			self._file,
 			dialect="excel",
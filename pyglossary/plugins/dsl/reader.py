@@ -26,9 +26,11 @@ from typing import TYPE_CHECKING, cast
 
 from pyglossary.compress import (
 	compressionOpen,
+	progressSize,
 	stdCompressions,
 )
 from pyglossary.core import log
+from pyglossary.data_source import FileDataSource, ZipDataSource
 from pyglossary.io_utils import nullTextIO
 from pyglossary.os_utils import indir
 from pyglossary.text_reader import TextFilePosWrapper
@@ -162,15 +164,14 @@ class Reader:
 			),
 		)
 
+		progress = progressSize(cfile)
 		if cfile.seekable():
-			cfile.seek(0, 2)
-			self._fileSize = cfile.tell()
-			cfile.seek(0)
+			self._fileSize = progress.size
 			# self._glos.setInfo("input_file_size", f"{self._fileSize}")
 		else:
 			log.warning("DSL Reader: file is not seekable")
 
-		self._file = TextFilePosWrapper(cfile, encoding)
+		self._file = TextFilePosWrapper(cfile, encoding, rawTell=progress.rawTell)
 
 		# read header
 		for line in self._file:
@@ -302,13 +303,14 @@ class Reader:
 		zipCount = 0
 		if isfile(resZipPath):
 			with zipfile.ZipFile(resZipPath, mode="r") as zf:
-				fnameList = zf.namelist()
-				zipCount = len(fnameList)
-				resFileSet -= set(fnameList)
-				for fname in sorted(fnameList):
-					with zf.open(fname) as file:
-						data = file.read()
-					yield self._glos.newDataEntry(fname, data)
+				infoList = [info for info in zf.infolist() if not info.is_dir()]
+			zipCount = len(infoList)
+			resFileSet -= {info.filename for info in infoList}
+			for info in sorted(infoList, key=lambda info: info.filename):
+				yield self._glos.newFileDataEntry(
+					info.filename,
+					ZipDataSource(resZipPath, info),
+				)
 
 		resDir = dirname(self._filename)
 		looseCount = sum(1 for fname in resFileSet if isfile(join(resDir, fname)))
@@ -318,9 +320,7 @@ class Reader:
 			if not isfile(fpath):
 				log.warning(f"resource file not found: {fname}")
 				continue
-			with open(fpath, mode="rb") as file:
-				data = file.read()
-			yield self._glos.newDataEntry(fname, data)
+			yield self._glos.newFileDataEntry(fname, FileDataSource(fpath))
 
 	def parseEntryBlock(  # noqa: PLR0912 Too many branches (14 > 12)
 		self,
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from pyglossary.flags import NEVER
+from pyglossary.option import BoolOption
 
 from .writer import Writer
 
@@ -43,7 +44,11 @@ relatedFormats: list[str] = ["Dictfile", "Epub2", "Mobi"]
 # https://help.kobo.com/hc/en-us/articles/360017640093-Add-new-dictionaries-to-your-Kobo-eReader
 
 
-optionsProp: dict[str, Option] = {}
+optionsProp: dict[str, Option] = {
+	"sqlite": BoolOption(
+		comment="Use SQLite to limit memory usage.",
+	),
+}
 
 
 # Penelope option: marisa_index_size=1000000
@@ -18,10 +18,15 @@
 # SOFTWARE.
 from __future__ import annotations
 
+import gzip
+import os
 import re
 import unicodedata
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from gzip import compress, decompress
 from operator import itemgetter
+from os.path import isfile, join
 from pathlib import Path
 from pickle import dumps, loads
 from typing import TYPE_CHECKING
@@ -30,7 +35,9 @@ from pyglossary.core import exc_note, log, pip, trace
 from pyglossary.os_utils import indir
 
 if TYPE_CHECKING:
-	from collections.abc import Generator
+	import sqlite3
+	from collections.abc import Generator, Iterator
+	from concurrent.futures import Future
 
 	from pyglossary.glossary_types import EntryType, WriterGlossaryType
 
@@ -64,9 +71,104 @@ def _fixFilename(fname: str) -> str:
 	return Path(fname.replace("/", "2F").replace("\\", "5C")).name
 
 
+_RowType = tuple[str, list[str], str]  # (headword, variants, defi)
+
+
+class _MemStore:
+	"""Rows (by prefix) and terms of Kobo writer, kept in memory."""
+
+	def __init__(self) -> None:
+		# rows are pickled and compressed to save memory
+		self._rows: list[tuple[str, bytes]] = []
+		self._terms: list[str] = []
+
+	def addRow(self, prefix: str, row: _RowType) -> None:
+		self._rows.append((prefix, compress(dumps(row))))
+
+	def addTerms(self, terms: list[str]) -> None:
+		self._terms += terms
+
+	def iterRows(self) -> Iterator[tuple[str, _RowType]]:
+		self._rows.sort(key=itemgetter(0))
+		for prefix, row in self._rows:
+			yield prefix, loads(decompress(row))
+
+	def iterTerms(self) -> Iterator[str]:
+		return iter(self._terms)
+
+	def close(self) -> None:
+		self._rows = []
+		self._terms = []
+
+
+class _SqStore:
+	"""
+	Rows (by prefix) and terms of Kobo writer, kept in a temporary
+	SQLite database, so memory usage does not grow with glossary size.
+	"""
+
+	def __init__(self, database: str) -> None:
+		from sqlite3 import connect
+
+		if isfile(database):
+			os.remove(database)
+		self._database = database
+		self._con: sqlite3.Connection | None = connect(database)
+		# the database is removed after writing, no need for durability
+		self._con.execute("PRAGMA journal_mode = OFF")
+		self._con.execute("PRAGMA synchronous = OFF")
+		self._con.execute("CREATE TABLE rows (prefix TEXT, row BLOB)")
+		self._con.execute("CREATE TABLE terms (term TEXT)")
+
+	def _connection(self) -> sqlite3.Connection:
+		if self._con is None:
+			raise RuntimeError("db is closed")
+		return self._con
+
+	def addRow(self, prefix: str, row: _RowType) -> None:
+		self._connection().execute(
+			"INSERT INTO rows (prefix, row) VALUES (?, ?)",
+			(prefix, dumps(row)),
+		)
+
+	def addTerms(self, terms: list[str]) -> None:
+		self._connection().executemany(
+			"INSERT INTO terms (term) VALUES (?)",
+			[(term,) for term in terms],
+		)
+
+	def iterRows(self) -> Iterator[tuple[str, _RowType]]:
+		con = self._connection()
+		con.commit()
+		# SQLite sorts on disk (in temp files) if needed
+		for prefix, row in con.execute(
+			"SELECT prefix, row FROM rows ORDER BY prefix, rowid",
+		):
+			yield prefix, loads(row)
+
+	def iterTerms(self) -> Iterator[str]:
+		for (term,) in self._connection().execute("SELECT term FROM terms"):
+			yield term
+
+	def close(self) -> None:
+		if self._con is None:
+			return
+		self._con.close()
+		self._con = None
+		if isfile(self._database):
+			os.remove(self._database)
+
+
+def _compressGroup(parts: list[str]) -> bytes:
+	# mtime=0 makes output reproducible
+	return gzip.compress("".join(parts).encode("utf-8"), mtime=0)
+
+
 class Writer:
 	WORDS_FILE_NAME = "words"
 
+	_sqlite: bool = True
+
 	depends = {
 		"marisa_trie": "marisa-trie",
 	}
@@ -78,7 +180,7 @@ class Writer:
 	def __init__(self, glos: WriterGlossaryType) -> None:
 		self._glos = glos
 		self._filename = ""
-		self._terms: list[str] = []
+		self._store: _MemStore | _SqStore | None = None
 		self._img_pattern = re.compile(
 			'<img src="([^<>"]*?)"( [^<>]*?)?>',
 			re.DOTALL,
@@ -115,31 +217,20 @@ class Writer:
 		# for now we just skip data entries and remove '<img' tags
 		return self._img_pattern.sub("[Image: \\1]", defi)
 
-	def write_groups(self) -> Generator[None, EntryType, None]:
-		import gzip
+	def _newStore(self) -> _MemStore | _SqStore:
+		if not self._sqlite:
+			return _MemStore()
+		return _SqStore(join(self._glos.tmpDataDir, "kobo.db"))
 
-		dataEntryCount = 0
-
-		htmlHeader = '<?xml version="1.0" encoding="utf-8"?><html>\n'
+	def _closeStore(self) -> None:
+		if self._store is not None:
+			self._store.close()
+			self._store = None
 
-		groupCounter = 0
-		htmlContents = htmlHeader
-
-		def writeGroup(lastPrefix: str) -> None:
-			nonlocal htmlContents
-			group_fname = _fixFilename(lastPrefix)
-			htmlContents += "</html>"
-			trace(
-				log,
-				f"writeGroup: {lastPrefix!r}, {group_fname!r}, count={groupCounter}",
-			)
-			with gzip.open(group_fname + ".html", mode="wb") as gzipFile:
-				gzipFile.write(htmlContents.encode("utf-8"))
-			htmlContents = htmlHeader
+	def write_groups(self) -> Generator[None, EntryType, None]:
+		dataEntryCount = 0
 
-		allWords: list[str] = []
-		# TODO: switch to SQLite, like StarDict writer
-		data: list[tuple[str, bytes]] = []
+		store = self._store = self._newStore()
 
 		while True:
 			entry = yield
@@ -149,7 +240,7 @@ class Writer:
 				dataEntryCount += 1
 				continue
 			l_term = entry.l_term
-			allWords += l_term
+			store.addTerms(l_term)
 			wordsByPrefix: dict[str, list[str]] = {}
 			for word in l_term:
 				prefix = self.get_prefix(word)
@@ -163,45 +254,11 @@ class Writer:
 				headword, *variants = p_words
 				if headword != mainHeadword:
 					headword = f"{mainHeadword}, {headword}"
-				data.append(
-					(
-						prefix,
-						compress(
-							dumps(
-								(
-									headword,
-									variants,
-									defi,
-								),
-							),
-						),
-					),
-				)
+				store.addRow(prefix, (headword, variants, defi))
 			del entry
 
-		log.info("Kobo: sorting entries...")
-		data.sort(key=itemgetter(0))
-
 		log.info("Kobo: writing entries...")
-
-		lastPrefix = ""
-		for prefix, row in data:
-			headword, variants, defi = loads(decompress(row))
-			if lastPrefix and prefix != lastPrefix:
-				writeGroup(lastPrefix)
-				groupCounter = 0
-			lastPrefix = prefix
-
-			htmlVariants = "".join(
-				f'<variant name="{v.strip().lower()}"/>' for v in variants
-			)
-			body = f"<div><b>{headword}</b><var>{htmlVariants}</var><br/>{defi}</div>"
-			htmlContents += f'<w><a name="{headword}" />{body}</w>\n'
-			groupCounter += 1
-		del data
-
-		if groupCounter > 0:
-			writeGroup(lastPrefix)
+		self._writeGroupFiles(store.iterRows())
 
 		if dataEntryCount > 0:
 			log.warning(
@@ -209,7 +266,54 @@ class Writer:
 				" and replaced '<img ...' tags in definitions with placeholders",
 			)
 
-		self._terms = allWords
+	@staticmethod
+	def _writeGroupFiles(rows: Iterator[tuple[str, _RowType]]) -> None:
+		"""
+		Write a gzip-compressed html file for each prefix group, given rows
+		sorted by prefix. Groups are compressed in a thread pool while next
+		groups are being built, at most `2 * workers` groups are in memory.
+		"""
+		htmlHeader = '<?xml version="1.0" encoding="utf-8"?><html>\n'
+		workers = min(8, os.cpu_count() or 1)
+		inFlight: deque[tuple[str, Future[bytes]]] = deque()
+
+		def writeGroupFile(group_fname: str, future: Future[bytes]) -> None:
+			with open(group_fname + ".html", mode="wb") as file:
+				file.write(future.result())
+
+		with ThreadPoolExecutor(max_workers=workers) as pool:
+
+			def writeGroup(lastPrefix: str, parts: list[str]) -> None:
+				group_fname = _fixFilename(lastPrefix)
+				parts.append("</html>")
+				trace(
+					log,
+					f"writeGroup: {lastPrefix!r}, {group_fname!r}"
+					f", count={len(parts) - 2}",
+				)
+				inFlight.append((group_fname, pool.submit(_compressGroup, parts)))
+				if len(inFlight) >= 2 * workers:
+					writeGroupFile(*inFlight.popleft())
+
+			lastPrefix = ""
+			parts: list[str] = [htmlHeader]
+			for prefix, (headword, variants, defi) in rows:
+				if lastPrefix and prefix != lastPrefix:
+					writeGroup(lastPrefix, parts)
+					parts = [htmlHeader]
+				lastPrefix = prefix
+
+				htmlVariants = "".join(
+					f'<variant name="{v.strip().lower()}"/>' for v in variants
+				)
+				body = f"<div><b>{headword}</b><var>{htmlVariants}</var><br/>{defi}</div>"
+				parts.append(f'<w><a name="{headword}" />{body}</w>\n')
+
+			if len(parts) > 1:
+				writeGroup(lastPrefix, parts)
+
+			while inFlight:
+				writeGroupFile(*inFlight.popleft())
 
 	def open(self, filename: str) -> None:
 		try:
@@ -220,13 +324,23 @@ class Writer:
 		self._filename = filename
 
 	def write(self) -> Generator[None, EntryType, None]:
-		with indir(self._filename, create=True):
-			yield from self.write_groups()
+		try:
+			with indir(self._filename, create=True):
+				yield from self.write_groups()
+		except BaseException:
+			self._closeStore()
+			raise
 
 	def finish(self) -> None:
 		import marisa_trie
 
-		with indir(self._filename, create=False):
-			trie = marisa_trie.Trie(self._terms)
-			trie.save(self.WORDS_FILE_NAME)
-		self._filename = ""
+		try:
+			if self._store is not None:
+				with indir(self._filename, create=False):
+					# terms are streamed into the trie builder (C++ keyset),
+					# not collected as a list of Python strings
+					trie = marisa_trie.Trie(self._store.iterTerms())
+					trie.save(self.WORDS_FILE_NAME)
+		finally:
+			self._closeStore()
+			self._filename = ""
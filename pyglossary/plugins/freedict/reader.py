@@ -7,7 +7,7 @@ from io import BytesIO
 from os.path import dirname, isfile, join
 from typing import TYPE_CHECKING, cast
 
-from pyglossary.compress import compressionOpen, stdCompressions
+from pyglossary.compress import compressionOpen, progressSize, stdCompressions
 from pyglossary.core import exc_note, log, pip
 from pyglossary.html_utils import unescape_unicode
 from pyglossary.io_utils import nullBinaryIO
@@ -17,7 +17,7 @@ from pyglossary.langs.writing_system import getWritingSystemFromText
 from .utils import XMLLANG, ReaderUtils
 
 if TYPE_CHECKING:
-	from collections.abc import Iterator
+	from collections.abc import Callable, Iterator
 	from io import IOBase
 
 	from pyglossary.glossary_types import EntryType, ReaderGlossaryType
@@ -701,12 +701,11 @@ class Reader(ReaderUtils):
 
 		defi = buff.getvalue().decode("utf-8")
 		# defi = defi.replace("\xa0", "&nbsp;")  # do we need to do this?
-		file = self._file
 		return self._glos.newEntry(
 			keywords,
 			defi,
 			defiFormat="h",
-			byteProgress=(file.tell(), self._fileSize) if self._progress else None,
+			byteProgress=(self._tell(), self._fileSize) if self._progress else None,
 		)
 
 	def setWordCount(self, header: Element) -> None:
@@ -820,6 +819,8 @@ class Reader(ReaderUtils):
 		self._dirname = ""
 		self._file: IOBase = nullBinaryIO
 		self._fileSize = 0
+		# returns position for byte progress
+		self._tell: Callable[[], int] = nullBinaryIO.tell
 		self._progress = True
 		self._entryCount = 0
 		self._discoveredTags: dict[str, Element] = {}
@@ -846,6 +847,7 @@ class Reader(ReaderUtils):
 		self._file = nullBinaryIO
 		self._filename = ""
 		self._fileSize = 0
+		self._tell = nullBinaryIO.tell
 
 	def open(
 		self,
@@ -862,10 +864,10 @@ class Reader(ReaderUtils):
 		cfile = compressionOpen(filename, mode="rb")
 
 		if cfile.seekable():
-			cfile.seek(0, 2)
-			self._fileSize = cfile.tell()
-			cfile.seek(0)
-			self._glos.setInfo("input_file_size", str(self._fileSize))
+			progress = progressSize(cfile)
+			self._fileSize = progress.size
+			if progress.uncompressed:
+				self._glos.setInfo("input_file_size", str(progress.size))
 		else:
 			log.warning("FreeDict Reader: file is not seekable")
 
@@ -904,9 +906,11 @@ class Reader(ReaderUtils):
 	def __iter__(self) -> Iterator[EntryType]:
 		from lxml import etree as ET
 
-		self._file = compressionOpen(self._filename, mode="rb")
+		self._file = file = compressionOpen(self._filename, mode="rb")
+		if self._progress:
+			self._tell = progressSize(file).rawTell or file.tell
 		context = ET.iterparse(  # type: ignore # noqa: PGH003
-			self._file,
+			file,
 			events=("end",),
 			tag=(_ENTRY, _INCLUDE),
 		)
@@ -5,6 +5,8 @@ from typing import TYPE_CHECKING
 from pyglossary.option import (
 	BoolOption,
 	EncodingOption,
+	FileSizeOption,
+	IntOption,
 )
 
 from .reader import Reader
@@ -51,6 +53,16 @@ optionsProp: dict[str, Option] = {
 	"audio": BoolOption(
 		comment="Enable audio objects",
 	),
+	"workers": IntOption(
+		comment="Number of threads to decompress blocks, 0 means number of CPUs",
+		minim=0,
+	),
+	"processes": BoolOption(
+		comment="Decompress blocks in processes instead of threads",
+	),
+	"memory_budget": FileSizeOption(
+		comment="Maximum size of blocks decompressed ahead, e.g. 64Mi",
+	),
 }
 
 docTail = """### `python-lzo` is required for **some** MDX glossaries.
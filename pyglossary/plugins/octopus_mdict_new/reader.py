@@ -20,13 +20,17 @@ import gc
 import os
 import re
 import sys
+import tempfile
 from os.path import dirname, extsep, isfile, join, splitext
-from typing import TYPE_CHECKING
+from struct import Struct
+from typing import TYPE_CHECKING, Any
 
 from pyglossary.core import log
+from pyglossary.data_source import FileDataSource
 from pyglossary.text_utils import toStr
 
 if TYPE_CHECKING:
+	import io
 	from collections.abc import Iterator
 
 	from pyglossary.glossary_types import EntryType, ReaderGlossaryType
@@ -35,6 +39,22 @@ if TYPE_CHECKING:
 
 __all__ = ["Reader"]
 
+# lengths of term and definition of an entry in spill file
+_spillRecordHeader = Struct(">II")
+
+
+def _isLinkRecord(b_defi: bytes) -> bool:
+	"""
+	Same as b_defi.decode("utf-8").strip().startswith("@@@LINK="),
+	but only decodes records that may start with non-ASCII whitespace.
+	"""
+	b_defi = b_defi.strip()
+	if b_defi.startswith(b"@@@LINK="):
+		return True
+	if b_defi[:1] < b"\x80":
+		return False
+	return b_defi.decode("utf-8").strip().startswith("@@@LINK=")
+
 
 class Reader:
 	useByteProgress = False
@@ -42,6 +62,9 @@ class Reader:
 	_substyle: bool = True
 	_same_dir_data_files: bool = False
 	_audio: bool = False
+	_workers: int = 0
+	_processes: bool = False
+	_memory_budget: int = 64 * 1024 * 1024
 
 	depends = {
 		"xxhash": "xxhash",
@@ -61,10 +84,19 @@ class Reader:
 		self._mdd: list[MDD] = []
 		self._entryCount = 0
 		self._dataEntryCount = 0
+		# non-link entries, written while extracting links
+		self._spillFile: io.BufferedRandom | None = None
 
 		# dict of mainWord -> newline-separated alternatives
 		self._linksDict: dict[str, str] = {}
 
+	def _blockOptions(self) -> dict[str, Any]:
+		return {
+			"workers": self._workers,
+			"processes": self._processes,
+			"memory_budget": self._memory_budget,
+		}
+
 	def open(self, filename: str) -> None:
 		"""
 		Multiple MDD files are supported with this naming schema:
@@ -77,16 +109,21 @@ class Reader:
 		from pyglossary.plugin_lib.readmdict import MDD, MDX
 
 		self._filename = filename
-		self._mdx = MDX(filename, self._encoding, self._substyle)
+		self._mdx = MDX(
+			filename,
+			self._encoding,
+			self._substyle,
+			**self._blockOptions(),
+		)
 
 		filenameNoExt, _ext = splitext(self._filename)
 		mddBase = filenameNoExt + extsep
 		for fname in (f"{mddBase}mdd", f"{mddBase}1.mdd"):
 			if isfile(fname):
-				self._mdd.append(MDD(fname))
+				self._mdd.append(MDD(fname, **self._blockOptions()))
 		mddN = 2
 		while isfile(f"{mddBase}{mddN}.mdd"):
-			self._mdd.append(MDD(f"{mddBase}{mddN}.mdd"))
+			self._mdd.append(MDD(f"{mddBase}{mddN}.mdd", **self._blockOptions()))
 			mddN += 1
 
 		dataEntryCount = 0
@@ -118,8 +155,10 @@ class Reader:
 		self.loadLinks()
 
 	def loadLinks(self) -> None:
-		from pyglossary.plugin_lib.readmdict import MDX
-
+		"""
+		Extract links, and write other entries into a temporary file
+		so that record blocks are only decompressed once.
+		"""
 		mdx = self._mdx
 		if mdx is None:
 			raise ValueError("mdx is None")
@@ -128,10 +167,12 @@ class Reader:
 		linksDict: dict[str, str] = {}
 		term = ""
 		entryCount = 0
+		spillFile = tempfile.TemporaryFile(prefix="pyglossary-mdx-")  # noqa: SIM115
+		packHeader = _spillRecordHeader.pack
 		for b_term, b_defi in mdx.items():
-			term = b_term.decode("utf-8")
-			defi = b_defi.decode("utf-8").strip()
-			if defi.startswith("@@@LINK="):
+			if _isLinkRecord(b_defi):
+				term = b_term.decode("utf-8")
+				defi = b_defi.decode("utf-8").strip()
 				if not term:
 					log.warning(f"unexpected defi: {defi}")
 					continue
@@ -141,15 +182,34 @@ class Reader:
 				else:
 					linksDict[mainWord] = term
 				continue
+			spillFile.write(packHeader(len(b_term), len(b_defi)))
+			spillFile.write(b_term)
+			spillFile.write(b_defi)
 			entryCount += 1
 
 		log.info(
 			f"extracting links done, sizeof(linksDict)={sys.getsizeof(linksDict)}",
 		)
 		log.info(f"{entryCount = }")
+		spillFile.seek(0)
+		self._spillFile = spillFile
 		self._linksDict = linksDict
 		self._entryCount = entryCount
-		self._mdx = MDX(self._filename, self._encoding, self._substyle)
+
+	def _spilledItems(self) -> Iterator[tuple[bytes, bytes]]:
+		spillFile = self._spillFile
+		if spillFile is None:
+			return
+		headerSize = _spillRecordHeader.size
+		unpackHeader = _spillRecordHeader.unpack
+		while True:
+			header = spillFile.read(headerSize)
+			if len(header) < headerSize:
+				break
+			termLen, defiLen = unpackHeader(header)
+			yield spillFile.read(termLen), spillFile.read(defiLen)
+		spillFile.close()
+		self._spillFile = None
 
 	def fixDefi(self, defi: str) -> str:
 		defi = self._re_internal_link.sub(r"href=\1bword://", defi)
@@ -173,18 +233,15 @@ class Reader:
 		return defi
 
 	def __iter__(self) -> Iterator[EntryType]:
-		if self._mdx is None:
+		if self._mdx is None or self._spillFile is None:
 			log.error("trying to iterate on a closed MDX file")
 			return
 
 		glos = self._glos
 		linksDict = self._linksDict
-		for b_term, b_defi in self._mdx.items():
+		for b_term, b_defi in self._spilledItems():
 			term = b_term.decode("utf-8")
-			defi = b_defi.decode("utf-8").strip()
-			if defi.startswith("@@@LINK="):
-				continue
-			defi = self.fixDefi(defi)
+			defi = self.fixDefi(b_defi.decode("utf-8").strip())
 			terms: str | list[str] = term
 			altsStr = linksDict.get(term, "")
 			if altsStr:
@@ -205,9 +262,7 @@ class Reader:
 				fpath = join(dirPath, fname)
 				if not isfile(fpath):
 					continue
-				with open(fpath, mode="rb") as file:
-					b_data = file.read()
-				yield glos.newDataEntry(fname, b_data)
+				yield glos.newFileDataEntry(fname, FileDataSource(fpath))
 
 		for mdd in self._mdd:
 			try:
@@ -226,4 +281,6 @@ class Reader:
 		return self._entryCount + self._dataEntryCount
 
 	def close(self) -> None:
+		if self._spillFile is not None:
+			self._spillFile.close()
 		self.clear()
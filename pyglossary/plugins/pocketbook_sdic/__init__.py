@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from pyglossary.flags import NEVER
-from pyglossary.option import StrOption
+from pyglossary.option import FileSizeOption, StrOption
 
 from .writer import Writer
 
@@ -54,4 +54,8 @@ optionsProp: dict[str, Option] = {
 	"merge_separator": StrOption(
 		comment="Separator for merging duplicate headwords",
 	),
+	"sort_memory": FileSizeOption(
+		comment="approximate memory used for sorting before using temp files"
+		"\nexamples: 256m, 1g",
+	),
 }
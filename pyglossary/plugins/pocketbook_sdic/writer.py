@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import heapq
 import os
 import re
+import shutil
 import struct
+import tempfile
 import zlib
+from collections import deque
+from itertools import islice
+from operator import itemgetter
 from typing import TYPE_CHECKING
 
 from pyglossary.core import log
 
 if TYPE_CHECKING:
-	from collections.abc import Generator
+	from collections.abc import Generator, Iterable, Iterator
 
 	from pyglossary.glossary_types import EntryType, WriterGlossaryType
 
@@ -18,6 +24,7 @@ __all__ = [
 	"BODY_PREFIX",
 	"BODY_SUFFIX",
 	"DEFAULT_MAX_ENTRY_SIZE",
+	"DEFAULT_SORT_MEMORY",
 	"FORMAT_VERSION",
 	"HEADER_SIZE",
 	"MAX_COMPRESSED_BLOCK_SIZE",
@@ -28,12 +35,15 @@ __all__ = [
 	"_build_header",
 	"_build_sparse_index",
 	"_encode_entry",
-	"_pack_blocks",
+	"_iter_blocks",
+	"_merge_duplicates",
 	"_prepare_collate_section",
 	"_prepare_keyboard_section",
 	"_prepare_morphems_section",
 	"_prepare_section_compressed",
 	"_prepare_sparse_index_section",
+	"_read_sort_run",
+	"_write_sort_run",
 	"encode_body",
 	"get_collated_key",
 	"load_collates",
@@ -57,6 +67,16 @@ BODY_PREFIX = b"\x20"
 BODY_SUFFIX = b"\x20\x0a\x00"
 BLOCK_TRAILER = b"\x00\x00"
 
+# Sorting: entries are buffered in memory up to DEFAULT_SORT_MEMORY
+# (approximately), then sorted runs are spilled to temp files and merged
+DEFAULT_SORT_MEMORY = 256 * 1024 * 1024
+# approximate memory used by a (key, word, defi) tuple besides the strings
+SORT_ITEM_OVERHEAD = 200
+SORT_BUFFER_SIZE = 1024 * 1024
+
+_sort_key = itemgetter(0, 1)
+_uint32 = struct.Struct("<I")
+
 # Mapping of codepoint -> replacement codepoint, or None to delete the character.
 # Compatible with str.translate().
 CollateTable = dict[int, int | None]
@@ -117,31 +137,33 @@ def _encode_entry(word: str, body_bytes: bytes) -> bytes:
 	return struct.pack("<H", total_size) + payload
 
 
-def _pack_blocks(
-	payloads: list[bytes],
-) -> tuple[list[bytes], list[int], int, int]:
+def _iter_blocks(
+	payloads: Iterable[bytes],
+) -> Iterator[tuple[bytes, int, bool]]:
 	"""
 	Pack entry payloads into compressed blocks using binary search.
 
-	Returns (blocks, counts, max_block_size, widened_count).
+	Payloads are consumed lazily, at most MAX_WORDS_PER_BLOCK of them
+	are kept in memory.
+	Yields (block, count, widened) for each block.
 	"""
-	total = len(payloads)
-	blocks: list[bytes] = []
-	counts: list[int] = []
-	max_block_size = 0
-	widened_count = 0
-
+	payload_iter = iter(payloads)
+	pending: list[bytes] = []
 	start = 0
-	while start < total:
+	while True:
+		pending.extend(islice(payload_iter, MAX_WORDS_PER_BLOCK - len(pending)))
+		if not pending:
+			return
+
 		lo = 1
-		hi = min(MAX_WORDS_PER_BLOCK, total - start)
+		hi = len(pending)
 		best_block: bytes | None = None
 		best_count = 0
 
 		while lo <= hi:
 			mid = (lo + hi) // 2
 
-			raw = b"".join(payloads[start : start + mid]) + BLOCK_TRAILER
+			raw = b"".join(pending[:mid]) + BLOCK_TRAILER
 			if len(raw) >= MAX_RAW_BLOCK_SIZE:
 				hi = mid - 1
 				continue
@@ -154,43 +176,86 @@ def _pack_blocks(
 			else:
 				hi = mid - 1
 
+		widened = False
 		if best_block is None:
 			# Single-entry fallback with relaxed ceiling
-			raw = payloads[start] + BLOCK_TRAILER
+			raw = pending[0] + BLOCK_TRAILER
 			blob = zlib.compress(raw, 9)
 			if len(blob) > 0xFFFF:
 				raise ValueError(
 					f"entry at index {start} is too large: "
-					f"{len(payloads[start])} bytes raw, "
+					f"{len(pending[0])} bytes raw, "
 					f"compresses to {len(blob)} bytes "
 					f"(block limit: 65535)",
 				)
 			best_block = blob
 			best_count = 1
-			widened_count += 1
-
-		max_block_size = max(max_block_size, len(best_block))
+			widened = True
 
-		blocks.append(best_block)
-		counts.append(best_count)
+		yield best_block, best_count, widened
+		del pending[:best_count]
 		start += best_count
 
-	return blocks, counts, max_block_size, widened_count
+
+def _write_sort_run(
+	items: list[tuple[str, str, str]],
+	path: str,
+) -> None:
+	"""Sort (collated_key, word, defi) items and write them to *path*."""
+	items.sort(key=_sort_key)
+	with open(path, "wb", buffering=SORT_BUFFER_SIZE) as f:
+		for item in items:
+			for text in item:
+				b_text = text.encode("utf-8")
+				f.write(_uint32.pack(len(b_text)))
+				f.write(b_text)
+
+
+def _read_sort_run(path: str) -> Iterator[tuple[str, str, str]]:
+	"""Read back a sorted run written by _write_sort_run, then remove it."""
+	size = _uint32.size
+	with open(path, "rb", buffering=SORT_BUFFER_SIZE) as f:
+
+		def read_text(header: bytes) -> str:
+			return f.read(_uint32.unpack(header)[0]).decode("utf-8")
+
+		while header := f.read(size):
+			key = read_text(header)
+			word = read_text(f.read(size))
+			defi = read_text(f.read(size))
+			yield key, word, defi
+	os.remove(path)
+
+
+def _merge_duplicates(
+	items: Iterable[tuple[str, str, str]],
+	sep: str,
+) -> Iterator[tuple[str, str]]:
+	"""Merge definitions of adjacent items with the same headword."""
+	last_word: str | None = None
+	defis: list[str] = []
+	for _key, word, defi in items:
+		if word == last_word:
+			defis.append(defi)
+			continue
+		if last_word is not None:
+			yield last_word, sep.join(defis)
+		last_word = word
+		defis = [defi]
+	if last_word is not None:
+		yield last_word, sep.join(defis)
 
 
-def _build_sparse_index(
-	words: list[str],
-	blocks: list[bytes],
-	counts: list[int],
-) -> bytes:
-	r"""Build the raw sparse index: [uint16 size][first_word\\0] per block."""
+def _build_sparse_index(blocks: Iterable[tuple[int, str]]) -> bytes:
+	r"""
+	Build the raw sparse index: [uint16 size][first_word\0] per block,
+	from (compressed block size, first headword of block) pairs.
+	"""
 	buf = bytearray()
-	entry_start = 0
-	for block, count in zip(blocks, counts, strict=True):
-		buf += struct.pack("<H", len(block))
-		buf += words[entry_start].encode("utf-8")
+	for size, first_word in blocks:
+		buf += struct.pack("<H", size)
+		buf += first_word.encode("utf-8")
 		buf += b"\x00"
-		entry_start += count
 	return bytes(buf)
 
 
@@ -318,6 +383,7 @@ class Writer:
 	_keyboard_path: str = ""
 	_morphems_path: str = ""
 	_merge_separator: str = "<br>"
+	_sort_memory: int = DEFAULT_SORT_MEMORY
 
 	def __init__(self, glos: WriterGlossaryType) -> None:
 		self._glos = glos
@@ -360,9 +426,44 @@ class Writer:
 		with open(keyboard_path, encoding="utf-8") as f:
 			keyboard = f.read().strip()
 
-		# Collect entries
-		entries: list[tuple[str, str]] = []
+		with tempfile.TemporaryDirectory(prefix="pyglossary-sdic-") as tmp_dir:
+			items = yield from self._collect_sorted(collate, tmp_dir)
+			if items is None:
+				log.warning("No entries to write")
+				return
+			self._write_file(
+				items,
+				collate=collate,
+				morphems=morphems,
+				keyboard=keyboard,
+				tmp_dir=tmp_dir,
+			)
+
+	def _collect_sorted(
+		self,
+		collate: CollateTable,
+		tmp_dir: str,
+	) -> Generator[None, EntryType, Iterator[tuple[str, str, str]] | None]:
+		"""
+		Receive entries, return an iterator of (collated_key, word, defi)
+		sorted by (collated_key, word), or None if there are no entries.
+
+		This is an external merge sort: when the (approximate) size of
+		buffered entries exceeds sort_memory, they are sorted and written
+		to a temp file (a sorted run), and sorted runs are merged at the end.
+		Duplicate headwords keep their original order.
+		"""
+		sort_memory = self._sort_memory
+		buffer: list[tuple[str, str, str]] = []
+		buffer_size = 0
+		runs: list[str] = []
 		data_count = 0
+
+		def spill(items: list[tuple[str, str, str]]) -> None:
+			path = os.path.join(tmp_dir, f"sort-run-{len(runs)}")
+			_write_sort_run(items, path)
+			runs.append(path)
+
 		while True:
 			entry = yield
 			if entry is None:
@@ -372,7 +473,13 @@ class Writer:
 				continue
 			word = entry.l_term[0] if entry.l_term else entry.s_term
 			defi = entry.defi
-			entries.append((word, defi))
+			key = get_collated_key(word, collate)
+			buffer.append((key, word, defi))
+			buffer_size += SORT_ITEM_OVERHEAD + len(key) + len(word) + len(defi)
+			if buffer_size >= sort_memory:
+				spill(buffer)
+				buffer = []
+				buffer_size = 0
 
 		if data_count > 0:
 			log.warning(
@@ -381,86 +488,110 @@ class Writer:
 				f" (not supported by SDIC format)",
 			)
 
-		if not entries:
-			log.warning("No entries to write")
-			return
-
-		# Sort by collated key, then raw word for determinism
-		entries.sort(
-			key=lambda e: (get_collated_key(e[0], collate), e[0]),
+		if not runs:
+			if not buffer:
+				return None
+			# Sort by collated key, then raw word for determinism
+			buffer.sort(key=_sort_key)
+			return iter(buffer)
+
+		if buffer:
+			spill(buffer)
+		del buffer
+		log.info(f"SDIC: merging {len(runs)} sorted runs")
+		return heapq.merge(
+			*[_read_sort_run(path) for path in runs],
+			key=_sort_key,
 		)
 
-		# Merge duplicate headwords
-		merged: list[tuple[str, str]] = [entries[0]]
-		sep = self._merge_separator
-		for word, defi in entries[1:]:
-			if word == merged[-1][0]:
-				merged[-1] = (word, merged[-1][1] + sep + defi)
-			else:
-				merged.append((word, defi))
-		entries = merged
-
-		# Encode entries
-		words: list[str] = []
-		payloads: list[bytes] = []
+	def _write_file(  # noqa: PLR0913
+		self,
+		items: Iterator[tuple[str, str, str]],
+		collate: CollateTable,
+		morphems: str,
+		keyboard: str,
+		tmp_dir: str,
+	) -> None:
+		entry_count = 0
 		max_entry_size = 0
-		for word, defi in entries:
-			body_bytes = encode_body(defi)
-			payload = _encode_entry(word, body_bytes)
-			max_entry_size = max(max_entry_size, len(payload))
-			words.append(word)
-			payloads.append(payload)
-
-		# Pack into compressed blocks
-		blocks, counts, _max_block_size, widened_count = _pack_blocks(
-			payloads,
-		)
-		if widened_count > 0:
-			log.info(
-				f"SDIC: {widened_count} block(s) exceeded default compressed size limit",
-			)
+		# headwords of payloads taken by _iter_blocks but not packed yet
+		pending_words: deque[str] = deque()
+
+		def payloads() -> Iterator[bytes]:
+			nonlocal entry_count, max_entry_size
+			for word, defi in _merge_duplicates(items, self._merge_separator):
+				payload = _encode_entry(word, encode_body(defi))
+				max_entry_size = max(max_entry_size, len(payload))
+				entry_count += 1
+				pending_words.append(word)
+				yield payload
+
+		# Pack into compressed blocks, which are kept in a temp file until
+		# the sections that come before them are known
+		block_count = 0
+		widened_count = 0
+		# (compressed size, first headword) of each block
+		index_blocks: list[tuple[int, str]] = []
+		with open(
+			os.path.join(tmp_dir, "blocks"),
+			"w+b",
+			buffering=SORT_BUFFER_SIZE,
+		) as blocks_file:
+			for block, count, widened in _iter_blocks(payloads()):
+				index_blocks.append((len(block), pending_words[0]))
+				for _ in range(count):
+					pending_words.popleft()
+				blocks_file.write(block)
+				block_count += 1
+				widened_count += widened
+
+			if widened_count > 0:
+				log.info(
+					f"SDIC: {widened_count} block(s) exceeded"
+					" default compressed size limit",
+				)
 
-		# Build sections
-		sparse_index_raw = _build_sparse_index(words, blocks, counts)
-		collate_section = _prepare_collate_section(collate)
-		morphems_section = _prepare_morphems_section(morphems, collate)
-		keyboard_section = _prepare_keyboard_section(keyboard)
-		sparse_index_section = _prepare_sparse_index_section(
-			sparse_index_raw,
-		)
+			# Build sections
+			collate_section = _prepare_collate_section(collate)
+			morphems_section = _prepare_morphems_section(morphems, collate)
+			keyboard_section = _prepare_keyboard_section(keyboard)
+			sparse_index_section = _prepare_sparse_index_section(
+				_build_sparse_index(index_blocks),
+			)
 
-		section_sizes = [
-			len(collate_section),
-			len(morphems_section),
-			len(keyboard_section),
-			len(sparse_index_section),
-		]
-
-		# Dictionary display name
-		name = (
-			self._glos.getInfo("bookname")
-			or self._glos.getInfo("name")
-			or self._glos.getInfo("description")
-			or "Dictionary"
-		)
+			section_sizes = [
+				len(collate_section),
+				len(morphems_section),
+				len(keyboard_section),
+				len(sparse_index_section),
+			]
+
+			# Dictionary display name
+			name = (
+				self._glos.getInfo("bookname")
+				or self._glos.getInfo("name")
+				or self._glos.getInfo("description")
+				or "Dictionary"
+			)
 
-		header = _build_header(
-			entry_count=len(entries),
-			max_entry_size=max_entry_size,
-			name=name,
-			section_sizes=section_sizes,
-		)
+			header = _build_header(
+				entry_count=entry_count,
+				max_entry_size=max_entry_size,
+				name=name,
+				section_sizes=section_sizes,
+			)
 
-		# Write the final file
-		with open(self._filename, "wb") as f:
-			f.write(header)
-			f.write(collate_section)
-			f.write(morphems_section)
-			f.write(keyboard_section)
-			f.write(sparse_index_section)
-			f.writelines(blocks)
+			# Write the final file
+			blocks_file.seek(0)
+			with open(self._filename, "wb") as f:
+				f.write(header)
+				f.write(collate_section)
+				f.write(morphems_section)
+				f.write(keyboard_section)
+				f.write(sparse_index_section)
+				shutil.copyfileobj(blocks_file, f, SORT_BUFFER_SIZE)
 
 		log.info(
-			f"SDIC: wrote {len(entries)} entries"
-			f" in {len(blocks)} blocks to {self._filename}",
+			f"SDIC: wrote {entry_count} entries"
+			f" in {block_count} blocks to {self._filename}",
 		)
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 from pyglossary.option import (
 	BoolOption,
 	EncodingOption,
+	IntOption,
 	ListOption,
 	NewlineOption,
 )
@@ -45,4 +46,14 @@ optionsProp: dict[str, Option] = {
 	"add_extra_info": BoolOption(comment="Create dbinfo_extra table"),
 	"newline": NewlineOption(),
 	"transaction": BoolOption(comment="Use TRANSACTION"),
+	"batch_size": IntOption(
+		comment=(
+			"Number of rows in each INSERT statement (or executemany call"
+			" with sqlite_db), 0 means 1 for SQL script and 1000 for sqlite_db"
+		),
+		minim=0,
+	),
+	"sqlite_db": BoolOption(
+		comment="Write a SQLite database file instead of SQL script",
+	),
 }
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import os
+from os.path import isfile
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
 	import io
+	import sqlite3
 	from collections.abc import Generator
 
 	from pyglossary.glossary_types import EntryType, WriterGlossaryType
@@ -11,33 +14,65 @@ if TYPE_CHECKING:
 __all__ = ["Writer"]
 
 
+_indexStatements = [
+	"CREATE INDEX ix_word_w ON word(w COLLATE NOCASE);",
+	"CREATE INDEX ix_alt_id ON alt(id COLLATE NOCASE);",
+	"CREATE INDEX ix_alt_w ON alt(w COLLATE NOCASE);",
+]
+
+
 class Writer:
 	_encoding: str = "utf-8"
 	_info_keys: list[str] | None = None
 	_add_extra_info: bool = True
 	_newline: str = "<br>"
 	_transaction: bool = False
+	_batch_size: int = 0
+	_sqlite_db: bool = False
 
 	def __init__(self, glos: WriterGlossaryType) -> None:
 		self._glos = glos
 		self._filename = ""
 		self._file: io.IOBase | None = None
+		self._con: sqlite3.Connection | None = None
 
 	def finish(self) -> None:
 		self._filename = ""
 		if self._file:
 			self._file.close()
 			self._file = None
+		if self._con:
+			self._con.close()
+			self._con = None
 
 	def open(self, filename: str) -> None:
 		self._filename = filename
+		if self._sqlite_db:
+			self._openSQLite(filename)
+			return
 		self._file = open(filename, "w", encoding=self._encoding)
 		self._writeInfo()
 
-	def _writeInfo(self) -> None:
-		fileObj = self._file
-		if fileObj is None:
-			raise ValueError("fileObj is None")
+	def _openSQLite(self, filename: str) -> None:
+		from sqlite3 import connect
+
+		if isfile(filename):
+			os.remove(filename)
+		con = self._con = connect(filename, isolation_level=None)
+		# the database is written in one transaction, and if conversion
+		# fails, it is incomplete anyway
+		con.execute("PRAGMA journal_mode = OFF")
+		con.execute("PRAGMA synchronous = OFF")
+		con.execute("BEGIN")
+		createStatements, insertStatements = self._infoStatements()
+		for statement in createStatements + insertStatements:
+			con.execute(statement)
+
+	def _infoStatements(self) -> tuple[list[str], list[str]]:
+		"""
+		Return statements that create tables, and statements that
+		insert dbinfo (and dbinfo_extra) rows.
+		"""
 		newline = self._newline
 		info_keys = self._getInfoKeys()
 		infoDefLine = "CREATE TABLE dbinfo ("
@@ -56,37 +91,47 @@ class Writer:
 			infoDefLine += f"{key} char({len(value)}), "
 
 		infoDefLine = infoDefLine[:-2] + ");"
-		fileObj.write(infoDefLine + "\n")
+		createStatements = [infoDefLine]
 
 		if self._add_extra_info:
-			fileObj.write(
+			createStatements.append(
 				"CREATE TABLE dbinfo_extra ("
 				"'id' INTEGER PRIMARY KEY NOT NULL, "
-				"'name' TEXT UNIQUE, 'value' TEXT);\n",
+				"'name' TEXT UNIQUE, 'value' TEXT);",
 			)
 
-		fileObj.write(
-			"CREATE TABLE word ('id' INTEGER PRIMARY KEY NOT NULL, "
-			"'w' TEXT, 'm' TEXT);\n",
-		)
-		fileObj.write(
-			"CREATE TABLE alt ('id' INTEGER NOT NULL, 'w' TEXT);\n",
-		)
-
-		if self._transaction:
-			fileObj.write("BEGIN TRANSACTION;\n")
-		fileObj.write(f"INSERT INTO dbinfo VALUES({','.join(infoValues)});\n")
+		createStatements += [
+			"CREATE TABLE word ('id' INTEGER PRIMARY KEY NOT NULL, 'w' TEXT, 'm' TEXT);",
+			"CREATE TABLE alt ('id' INTEGER NOT NULL, 'w' TEXT);",
+		]
+		insertStatements = [
+			f"INSERT INTO dbinfo VALUES({','.join(infoValues)});",
+		]
 
 		if self._add_extra_info:
 			extraInfo = glos.getExtraInfos(info_keys)
 			for index, (key, value) in enumerate(extraInfo.items()):
 				key2 = key.replace("'", "''")
 				value2 = value.replace("'", "''")
-				fileObj.write(
+				insertStatements.append(
 					f"INSERT INTO dbinfo_extra VALUES({index + 1}, "
-					f"'{key2}', '{value2}');\n",
+					f"'{key2}', '{value2}');",
 				)
 
+		return createStatements, insertStatements
+
+	def _writeInfo(self) -> None:
+		fileObj = self._file
+		if fileObj is None:
+			raise ValueError("fileObj is None")
+		createStatements, insertStatements = self._infoStatements()
+		for statement in createStatements:
+			fileObj.write(statement + "\n")
+		if self._transaction:
+			fileObj.write("BEGIN TRANSACTION;\n")
+		for statement in insertStatements:
+			fileObj.write(statement + "\n")
+
 	def _getInfoKeys(self) -> list[str]:
 		info_keys = self._info_keys
 		if info_keys:
@@ -103,7 +148,12 @@ class Writer:
 		]
 
 	def write(self) -> Generator[None, EntryType, None]:
+		if self._sqlite_db:
+			yield from self._writeSQLite()
+			return
+
 		newline = self._newline
+		batchSize = self._batch_size or 1
 
 		fileObj = self._file
 		if fileObj is None:
@@ -112,6 +162,15 @@ class Writer:
 		def fixStr(word: str) -> str:
 			return word.replace("'", "''").replace("\r", "").replace("\n", newline)
 
+		wordValues: list[str] = []
+		altValues: list[str] = []
+
+		def flush(table: str, values: list[str]) -> None:
+			# multi-row INSERT, one row per line if there is more than one
+			rows = ",\n".join(values)
+			fileObj.write(f"INSERT INTO {table} VALUES{rows};\n")
+			values.clear()
+
 		id_ = 1
 		while True:
 			entry = yield
@@ -123,18 +182,67 @@ class Writer:
 			terms = entry.l_term
 			term = fixStr(terms[0])
 			defi = fixStr(entry.defi)
-			fileObj.write(
-				f"INSERT INTO word VALUES({id_}, '{term}', '{defi}');\n",
-			)
+			wordValues.append(f"({id_}, '{term}', '{defi}')")
+			if len(wordValues) >= batchSize:
+				flush("word", wordValues)
 			for alt in terms[1:]:
-				fileObj.write(
-					f"INSERT INTO alt VALUES({id_}, '{fixStr(alt)}');\n",
-				)
+				altValues.append(f"({id_}, '{fixStr(alt)}')")
+				if len(altValues) >= batchSize:
+					flush("alt", altValues)
 			id_ += 1
 
+		if wordValues:
+			flush("word", wordValues)
+		if altValues:
+			flush("alt", altValues)
+
 		if self._transaction:
 			fileObj.write("END TRANSACTION;\n")
 
-		fileObj.write("CREATE INDEX ix_word_w ON word(w COLLATE NOCASE);\n")
-		fileObj.write("CREATE INDEX ix_alt_id ON alt(id COLLATE NOCASE);\n")
-		fileObj.write("CREATE INDEX ix_alt_w ON alt(w COLLATE NOCASE);\n")
+		for statement in _indexStatements:
+			fileObj.write(statement + "\n")
+
+	def _writeSQLite(self) -> Generator[None, EntryType, None]:
+		"""
+		Write entries directly into SQLite database, using parameterized
+		executemany in batches of `batch_size` rows (1000 if not set),
+		and create indexes after all rows are inserted.
+		"""
+		con = self._con
+		if con is None:
+			raise ValueError("con is None")
+
+		newline = self._newline
+		batchSize = self._batch_size or 1000
+
+		def fixStr(word: str) -> str:
+			return word.replace("\r", "").replace("\n", newline)
+
+		wordRows: list[tuple[int, str, str]] = []
+		altRows: list[tuple[int, str]] = []
+
+		def flush() -> None:
+			con.executemany("INSERT INTO word VALUES(?, ?, ?)", wordRows)
+			con.executemany("INSERT INTO alt VALUES(?, ?)", altRows)
+			wordRows.clear()
+			altRows.clear()
+
+		id_ = 1
+		while True:
+			entry = yield
+			if entry is None:
+				break
+			if entry.isData():
+				# FIXME
+				continue
+			terms = entry.l_term
+			wordRows.append((id_, fixStr(terms[0]), fixStr(entry.defi)))
+			altRows += [(id_, fixStr(alt)) for alt in terms[1:]]
+			if len(wordRows) >= batchSize:
+				flush()
+			id_ += 1
+
+		flush()
+		for statement in _indexStatements:
+			con.execute(statement)
+		con.execute("COMMIT")
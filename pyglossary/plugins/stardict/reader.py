@@ -12,6 +12,8 @@ from os.path import (
 from typing import TYPE_CHECKING, Protocol
 
 from pyglossary.core import log
+from pyglossary.data_source import FileDataSource
+from pyglossary.dictzip import openDictzip
 from pyglossary.os_utils import countFilesRecursive, listFilesRecursiveRelPath
 from pyglossary.text_utils import (
 	uint32FromBytes,
@@ -22,6 +24,7 @@ if TYPE_CHECKING:
 	import io
 	from collections.abc import Iterator
 
+	from pyglossary.dictzip import DictzipReader
 	from pyglossary.glossary_types import EntryType, ReaderGlossaryType
 
 	class XdxfTransformerType(Protocol):
@@ -90,7 +93,7 @@ class Reader:
 		self.clear()
 
 	def clear(self) -> None:
-		self._dictFile: io.IOBase | None = None
+		self._dictFile: io.IOBase | DictzipReader | None = None
 		self._filename = ""  # base file path, no extension
 		self._indexData: list[tuple[bytes, int, int]] = []
 		self._synDict: dict[int, list[str]] = {}
@@ -117,7 +120,7 @@ class Reader:
 		self._synDict = self.readSynFile()
 		self._sametypesequence = sametypesequence
 		if isfile(self._filename + ".dict.dz"):
-			self._dictFile = gzip.open(self._filename + ".dict.dz", mode="rb")
+			self._dictFile = openDictzip(self._filename + ".dict.dz")
 		else:
 			self._dictFile = open(self._filename + ".dict", mode="rb")
 		self._resDir = join(dirname(self._filename), "res")
@@ -392,11 +395,7 @@ class Reader:
 		if isdir(self._resDir):
 			for fname in listFilesRecursiveRelPath(self._resDir):
 				fpath = join(self._resDir, fname)
-				with open(fpath, "rb") as file:
-					yield self._glos.newDataEntry(
-						fname,
-						file.read(),
-					)
+				yield self._glos.newFileDataEntry(fname, FileDataSource(fpath))
 
 	def readSynFile(self) -> dict[int, list[str]]:
 		"""Return synDict, a dict { entryIndex -> altList }."""
@@ -17,6 +17,7 @@ from time import perf_counter as now
 from typing import TYPE_CHECKING, Literal
 
 from pyglossary.core import log
+from pyglossary.dictzip import DictzipWriter
 from pyglossary.glossary_utils import Error
 from pyglossary.plugins.stardict.memlist import MemSdList
 from pyglossary.plugins.stardict.sqlist import IdxSqList, SynSqList
@@ -57,7 +58,7 @@ def _newlinesToBr(text: str) -> str:
 
 @dataclass(slots=True)
 class _PartFiles:
-	dictFile: io.BufferedWriter
+	dictFile: io.BufferedWriter | DictzipWriter
 	idxFile: io.BufferedWriter
 	altIndexList: T_SdList[tuple[bytes, int]]
 
@@ -94,7 +95,7 @@ class Writer:
 		self._glos = glos
 		self._filename = ""
 		self._resDir = ""
-		self._openMultipartFiles: list[io.BufferedWriter] = []
+		self._openMultipartFiles: list[io.BufferedWriter | DictzipWriter] = []
 		self._sourceLang: Lang | None = None
 		self._targetLang: Lang | None = None
 		self._p_pattern = re.compile(
@@ -270,8 +271,17 @@ class Writer:
 		partIndex: int,
 	) -> _PartFiles:
 		fileBasePath = self.partBasePath(partIndex)
+		dictFile: io.BufferedWriter | DictzipWriter
+		if self._dictzip:
+			# compress while writing, instead of compressing .dict file later
+			dictFile = DictzipWriter(
+				fileBasePath + ".dict.dz",
+				origName=split(fileBasePath)[1] + ".dict",
+			)
+		else:
+			dictFile = open(fileBasePath + ".dict", "wb")
 		return _PartFiles(
-			open(fileBasePath + ".dict", "wb"),
+			dictFile,
 			open(fileBasePath + ".idx", "wb"),
 			self.newSynList(),
 		)
@@ -296,8 +306,6 @@ class Writer:
 			partNumber=partNumber,
 		)
 
-		if self._dictzip:
-			runDictzip(f"{fileBasePath}.dict")
 		syn_file = f"{fileBasePath}.syn"
 		if self._dictzip_syn and isfile(syn_file):
 			runDictzip(syn_file)
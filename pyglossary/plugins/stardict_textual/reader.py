@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, cast
 
 from pyglossary.compress import (
 	compressionOpen,
+	progressSize,
 	stdCompressions,
 )
 from pyglossary.core import exc_note, log, pip
@@ -74,9 +75,7 @@ class Reader:
 		cfile = compressionOpen(filename, mode="rb")
 
 		if cfile.seekable():
-			cfile.seek(0, 2)
-			self._fileSize = cfile.tell()
-			cfile.seek(0)
+			self._fileSize = progressSize(cfile).size
 			# self._glos.setInfo("input_file_size", f"{self._fileSize}")
 		else:
 			log.warning("StarDict Textual File Reader: file is not seekable")
@@ -158,8 +157,10 @@ class Reader:
 		from lxml import etree as ET
 
 		glos = self._glos
-		fileSize = self._fileSize
 		self._file = file = compressionOpen(self._filename, mode="rb")
+		progress = progressSize(file)
+		fileSize = progress.size
+		tell = progress.rawTell or file.tell
 		context = ET.iterparse(  # noqa: PGH003
 			self._file,
 			events=("end",),
@@ -205,7 +206,7 @@ class Reader:
 				terms,
 				defi,
 				defiFormat=defiFormat,
-				byteProgress=(file.tell(), fileSize),
+				byteProgress=(tell(), fileSize),
 			)
 
 			# clean up preceding siblings to save memory
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 
 from pyglossary.option import (
 	BoolOption,
+	IntOption,
 	ListOption,
 	StrOption,
 )
@@ -66,4 +67,10 @@ optionsProp: dict[str, Option] = {
 	"categories": BoolOption(
 		comment="Enable categories",
 	),
+	"workers": IntOption(
+		comment=(
+			"Number of processes to parse lines and build entries, 0 means number of CPUs"
+		),
+		minim=0,
+	),
 }
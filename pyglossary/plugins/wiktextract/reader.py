@@ -2,6 +2,8 @@ from __future__ import annotations
 
 # mypy: ignore-errors
 import collections
+import os
+from collections import deque
 from io import BytesIO
 from json import loads as json_loads
 from typing import TYPE_CHECKING, cast
@@ -9,6 +11,7 @@ from typing import TYPE_CHECKING, cast
 if TYPE_CHECKING:
 	from collections import Counter
 	from collections.abc import Callable, Iterator
+	from concurrent.futures import Future
 	from io import IOBase
 	from typing import Any
 
@@ -18,6 +21,7 @@ if TYPE_CHECKING:
 
 from pyglossary.compress import (
 	compressionOpen,
+	progressSize,
 	stdCompressions,
 )
 from pyglossary.core import exc_note, log, pip
@@ -25,6 +29,49 @@ from pyglossary.io_utils import nullBinaryIO
 
 __all__ = ["Reader"]
 
+# number of lines sent to a worker process at once
+batchSize = 64
+
+# (terms, defi) of entries, and warnings of a batch
+_BatchResult = tuple[list[tuple[list[str], str]], "Counter[str]"]
+
+_workerReader: Reader | None = None
+
+
+class _WorkerGlossary:
+	"""The part of glossary that Reader.makeTermsDefi uses, in worker processes."""
+
+	def __init__(self, sourceLangTitleTag: str) -> None:
+		self._sourceLangTitleTag = sourceLangTitleTag
+
+	def titleTag(self, sample: str) -> str:
+		# same as GlossaryInfo.titleTag
+		from pyglossary.langs.writing_system import getWritingSystemFromText
+
+		ws = getWritingSystemFromText(sample)
+		if ws and ws.name != "Latin":
+			return ws.titleTag
+		return self._sourceLangTitleTag
+
+
+def _initWorker(sourceLangTitleTag: str, options: dict[str, Any]) -> None:
+	global _workerReader  # noqa: PLW0603
+	reader = Reader(_WorkerGlossary(sourceLangTitleTag))  # type: ignore
+	for attr, value in options.items():
+		setattr(reader, attr, value)
+	reader._warnings = collections.Counter()
+	_workerReader = reader
+
+
+def _buildBatch(lines: list[str]) -> _BatchResult:
+	reader = _workerReader
+	if reader is None:
+		raise RuntimeError("worker is not initialized")
+	result = [reader.makeTermsDefi(json_loads(line)) for line in lines]
+	warnings = reader._warnings
+	reader._warnings = collections.Counter()
+	return result, warnings
+
 
 class Reader:
 	useByteProgress = True
@@ -45,6 +92,18 @@ class Reader:
 
 	_categories: bool = False
 
+	_workers: int = 1
+
+	# options used by makeTermsDefi, passed to worker processes
+	_makeEntryOptions = (
+		"_word_title",
+		"_gram_color",
+		"_example_padding",
+		"_audio",
+		"_audio_formats",
+		"_categories",
+	)
+
 	topicStyle = (
 		"color:white;"
 		"background:green;"
@@ -59,6 +118,8 @@ class Reader:
 		self._filename = ""
 		self._file: IOBase = nullBinaryIO
 		self._fileSize = 0
+		# returns position for byte progress
+		self._tell: Callable[[], int] = nullBinaryIO.tell
 		self._entryCount = 0
 		self._badExampleKeys = {
 			"bold_literal_offsets",
@@ -80,10 +141,11 @@ class Reader:
 		cfile = compressionOpen(filename, mode="rt", encoding="utf-8")
 
 		if cfile.seekable():
-			cfile.seek(0, 2)
-			self._fileSize = cfile.tell()
-			cfile.seek(0)
-			self._glos.setInfo("input_file_size", str(self._fileSize))
+			progress = progressSize(cfile)
+			self._fileSize = progress.size
+			self._tell = progress.rawTell or cfile.tell
+			if progress.uncompressed:
+				self._glos.setInfo("input_file_size", str(progress.size))
 		else:
 			self.warning("Wiktextract Reader: file is not seekable")
 
@@ -100,6 +162,7 @@ class Reader:
 		self._file = nullBinaryIO
 		self._filename = ""
 		self._fileSize = 0
+		self._tell = nullBinaryIO.tell
 
 	def countResourceFiles(self) -> int:
 		return 0
@@ -108,21 +171,86 @@ class Reader:
 		return 0
 
 	def __iter__(self) -> Iterator[EntryType]:
-		while line := self._file.readline():
-			line = line.strip()
-			if not line:
-				continue
-			yield self.makeEntry(json_loads(line))
+		if self._workers == 1:
+			while line := self._file.readline():
+				line = line.strip()
+				if not line:
+					continue
+				yield self.makeEntry(json_loads(line))
+		else:
+			yield from self._iterParallel()
 		for msg_, count in self._warnings.most_common():
 			msg = msg_
 			if count > 1:
 				msg = f"[{count} times] {msg}"
 			log.warning(msg)
 
+	def _batchEntries(
+		self,
+		future: Future[_BatchResult],
+		byteProgress: tuple[int, int],
+	) -> Iterator[EntryType]:
+		result, warnings = future.result()
+		self._warnings.update(warnings)
+		newEntry = self._glos.newEntry
+		for terms, defi in result:
+			yield newEntry(terms, defi, defiFormat="h", byteProgress=byteProgress)
+
+	def _iterParallel(self) -> Iterator[EntryType]:
+		"""
+		Send batches of lines to worker processes that parse JSON and build
+		definitions, and yield entries in the same order as lines.
+		At most `2 * workers` batches are in flight at any time.
+		"""
+		from concurrent.futures import ProcessPoolExecutor
+
+		workers = self._workers or os.cpu_count() or 1
+		maxInFlight = 2 * workers
+		sourceLang = self._glos.sourceLang
+		options = {attr: getattr(self, attr) for attr in self._makeEntryOptions}
+		file = self._file
+		inFlight: deque[tuple[Future[_BatchResult], tuple[int, int]]] = deque()
+		with ProcessPoolExecutor(
+			max_workers=workers,
+			initializer=_initWorker,
+			initargs=(sourceLang.titleTag if sourceLang else "b", options),
+		) as pool:
+			lines: list[str] = []
+			while line := file.readline():
+				line = line.strip()
+				if not line:
+					continue
+				lines.append(line)
+				if len(lines) < batchSize:
+					continue
+				byteProgress = (self._tell(), self._fileSize)
+				inFlight.append((pool.submit(_buildBatch, lines), byteProgress))
+				lines = []
+				if len(inFlight) >= maxInFlight:
+					yield from self._batchEntries(*inFlight.popleft())
+			if lines:
+				byteProgress = (self._tell(), self._fileSize)
+				inFlight.append((pool.submit(_buildBatch, lines), byteProgress))
+			while inFlight:
+				yield from self._batchEntries(*inFlight.popleft())
+
 	def warning(self, msg: str) -> None:
 		self._warnings[msg] += 1
 
-	def makeEntry(self, data: dict[str, Any]) -> EntryType:  # noqa: PLR0912
+	def makeEntry(self, data: dict[str, Any]) -> EntryType:
+		keywords, defi = self.makeTermsDefi(data)
+		return self._glos.newEntry(
+			keywords,
+			defi,
+			defiFormat="h",
+			byteProgress=(self._tell(), self._fileSize),
+		)
+
+	def makeTermsDefi(  # noqa: PLR0912
+		self,
+		data: dict[str, Any],
+	) -> tuple[list[str], str]:
+		"""Return (terms, definition) of entry, definition is html."""
 		from lxml import etree as ET
 
 		glos = self._glos
@@ -219,13 +347,7 @@ class Reader:
 
 		defi = f.getvalue().decode("utf-8")
 		# defi = defi.replace("\xa0", "&nbsp;")  # do we need to do this?
-		file = self._file
-		return self._glos.newEntry(
-			keywords,
-			defi,
-			defiFormat="h",
-			byteProgress=(file.tell(), self._fileSize),
-		)
+		return keywords, defi
 
 	# "homophone" key found in Dutch and Arabic dictionaries
 	# (similar-sounding words for Arabic)
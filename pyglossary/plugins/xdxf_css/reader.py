@@ -31,6 +31,7 @@ from lxml import etree as ET
 
 from pyglossary.compress import (
 	compressionOpen,
+	progressSize,
 	stdCompressions,
 )
 from pyglossary.core import log, rootDir
@@ -39,7 +40,7 @@ from pyglossary.text_utils import toStr
 
 if TYPE_CHECKING:
 	import io
-	from collections.abc import Iterator, Sequence
+	from collections.abc import Callable, Iterator, Sequence
 
 	from pyglossary.glossary_types import EntryType, ReaderGlossaryType
 	from pyglossary.lxml_types import Element
@@ -69,6 +70,8 @@ class Reader:
 		self._glos = glos
 		self._filename = ""
 		self._file: io.IOBase = nullBinaryIO
+		# returns position for byte progress
+		self._tell: Callable[[], int] = nullBinaryIO.tell
 		self._encoding = "utf-8"
 		self._htmlTr: TransformerType | None = None
 		self._re_span_k = re.compile(
@@ -137,10 +140,12 @@ class Reader:
 		del context
 
 		if cfile.seekable():
-			cfile.seek(0, 2)
-			self._fileSize = cfile.tell()
 			cfile.seek(0)
-			self._glos.setInfo("input_file_size", str(self._fileSize))
+			progress = progressSize(cfile)
+			self._fileSize = progress.size
+			self._tell = progress.rawTell or cfile.tell
+			if progress.uncompressed:
+				self._glos.setInfo("input_file_size", str(progress.size))
 		else:
 			log.warning("XDXF Reader: file is not seekable")
 			self._file.close()
@@ -194,7 +199,7 @@ class Reader:
 				terms,
 				defi,
 				defiFormat=defiFormat,
-				byteProgress=(self._file.tell(), self._fileSize),
+				byteProgress=(self._tell(), self._fileSize),
 			)
 			# clean up preceding siblings to save memory
 			# this can reduce memory usage from 1 GB to ~25 MB
@@ -207,6 +212,7 @@ class Reader:
 	def close(self) -> None:
 		self._file.close()
 		self._file = nullBinaryIO
+		self._tell = nullBinaryIO.tell
 
 	def generate_abbr_js(self, abbr_defs: list[Element]) -> bytes:
 		abbr_map_js = """const abbr_map = new Map();\n"""
@@ -28,7 +28,7 @@ from typing import TYPE_CHECKING, cast
 
 if TYPE_CHECKING:
 	import io
-	from collections.abc import Iterator, Sequence
+	from collections.abc import Callable, Iterator, Sequence
 
 	from lxml.html import HtmlElement as Element
 
@@ -36,6 +36,7 @@ if TYPE_CHECKING:
 
 from pyglossary.compress import (
 	compressionOpen,
+	progressSize,
 	stdCompressions,
 )
 from pyglossary.core import log
@@ -72,6 +73,8 @@ class Reader:
 		self._glos = glos
 		self._filename = ""
 		self._file: io.IOBase = nullBinaryIO
+		# returns position for byte progress
+		self._tell: Callable[[], int] = nullBinaryIO.tell
 		self._encoding = "utf-8"
 		self._htmlTr: TransformerType | None = None
 		self._re_span_k = re.compile(
@@ -135,10 +138,12 @@ class Reader:
 
 		self.readMetadata()
 
-		cfile.seek(0, 2)
-		self._fileSize = cfile.tell()
 		cfile.seek(0)
-		self._glos.setInfo("input_file_size", str(self._fileSize))
+		progress = progressSize(cfile)
+		self._fileSize = progress.size
+		self._tell = progress.rawTell or cfile.tell
+		if progress.uncompressed:
+			self._glos.setInfo("input_file_size", str(progress.size))
 
 	def countResourceFiles(self) -> int:
 		return 0
@@ -179,13 +184,14 @@ class Reader:
 				terms,
 				defi,
 				defiFormat=defiFormat,
-				byteProgress=(self._file.tell(), self._fileSize),
+				byteProgress=(self._tell(), self._fileSize),
 			)
 
 	def close(self) -> None:
 		if self._file:
 			self._file.close()
 			self._file = nullBinaryIO
+			self._tell = nullBinaryIO.tell
 
 	@staticmethod
 	def tostring(
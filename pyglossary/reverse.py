@@ -1,17 +1,23 @@
 from __future__ import annotations
 
+import json
 import logging
 import re
+import sqlite3
 import typing
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache, partial
 from operator import itemgetter
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
-	from collections.abc import Iterable, Iterator
+	from collections.abc import Callable, Iterable, Iterator
+	from concurrent.futures import Future
 
 	from .glossary_types import EntryType
 
-__all__ = ["reverseGlossary"]
+__all__ = ["ReverseIndex", "reverseGlossary"]
 
 log = logging.getLogger("pyglossary")
 
@@ -60,6 +66,14 @@ def reverseGlossary(  # noqa: PLR0913
 		includeDefs = False
 		showRel = "None"
 			allowed values: None, "Percent", "Percent At First"
+		sqlitePath = ""
+			keep the index in this SQLite file instead of memory
+		processes = 1
+			number of processes to tokenize definitions
+
+	With matchWord=True (default), definitions are tokenized once into an
+	inverted index (see ReverseIndex), otherwise every definition is scanned
+	for every term.
 	"""
 	if not savePath:
 		savePath = glos.getInfo("name") + ".txt"
@@ -67,11 +81,53 @@ def reverseGlossary(  # noqa: PLR0913
 	if saveStep < 2:
 		raise ValueError("saveStep must be more than 1")
 
-	entries: list[EntryType] = list(glos)
-	log.info(f"loaded {len(entries)} entries into memory")
+	sqlitePath: str = kwargs.pop("sqlitePath", "")
+	processes: int = kwargs.pop("processes", 1)
+
+	if not kwargs.get("matchWord", True):
+		# matching parts of words can not be answered from the index
+		entries: list[EntryType] = list(glos)
+		log.info(f"loaded {len(entries)} entries into memory")
+		yield from _writeReversed(
+			glos,
+			savePath,
+			list(terms) if terms else takeOutputWords(glos, entries),
+			partial(searchWordInDef, entries, includeDefs=includeDefs, **kwargs),
+			includeDefs=includeDefs,
+			saveStep=saveStep,
+		)
+		return
+
+	kwargs.pop("matchWord", None)
+	index = ReverseIndex(
+		sepChars=kwargs.pop("sepChars", ".,،"),
+		minWordLen=kwargs.pop("minWordLen", 3),
+		sqlitePath=sqlitePath,
+		processes=processes,
+	)
+	try:
+		index.build(glos, collectWords=not terms)
+		log.info(f"indexed {index.entryCount} entries")
+		yield from _writeReversed(
+			glos,
+			savePath,
+			list(terms) if terms else index.outputWords(),
+			partial(index.search, includeDefs=includeDefs, **kwargs),
+			includeDefs=includeDefs,
+			saveStep=saveStep,
+		)
+	finally:
+		index.close()
 
-	terms = list(terms) if terms else takeOutputWords(glos, entries)
 
+def _writeReversed(  # noqa: PLR0913
+	glos: _GlossaryType,
+	savePath: str,
+	terms: list[str],
+	search: Callable[[str], list[str]],
+	includeDefs: bool,
+	saveStep: int,
+) -> Iterator[int]:
 	entryCount = len(terms)
 	log.info(
 		f"Reversing to file {savePath!r}, number of entries: {entryCount}",
@@ -87,12 +143,7 @@ def reverseGlossary(  # noqa: PLR0913
 
 			if entryIndex % saveStep == 0 and entryIndex > 0:
 				saveFile.flush()
-			result = searchWordInDef(
-				entries,
-				term,
-				includeDefs=includeDefs,
-				**kwargs,
-			)
+			result = search(term)
 			if result:
 				try:
 					if includeDefs:
@@ -115,9 +166,7 @@ def takeOutputWords(
 	entryIter: Iterable[EntryType],
 	minWordLen: int = 3,
 ) -> list[str]:
-	# f"[\\w]{{{minWordLen},}}" == fr"[\w]{{{minWordLen},}}"
-	#   == r"[\w]{%d,}" % minWordLen
-	termPattern = re.compile(rf"[\w]{{{minWordLen},}}", re.UNICODE)
+	termPattern = _termPattern(minWordLen)
 	terms = set()
 	progressbar, glos.progressbar = glos.progressbar, False
 	for entry in entryIter:
@@ -130,6 +179,287 @@ def takeOutputWords(
 	return sorted(terms)
 
 
+@cache
+def _termPattern(minWordLen: int = 3) -> re.Pattern[str]:
+	"""Return pattern of words with at least minWordLen characters."""
+	# f"[\\w]{{{minWordLen},}}" == fr"[\w]{{{minWordLen},}}"
+	#   == r"[\w]{%d,}" % minWordLen
+	return re.compile(rf"[\w]{{{minWordLen},}}", re.UNICODE)
+
+
+@cache
+def _tokenizePatterns(
+	sepChars: str,
+	minWordLen: int,
+) -> tuple[re.Pattern[str], re.Pattern[str]]:
+	splitPattern = re.compile(
+		"|".join(re.escape(x) for x in sepChars),
+		re.UNICODE,
+	)
+	return splitPattern, _termPattern(minWordLen)
+
+
+def _wordRelations(
+	defi: str,
+	splitPattern: re.Pattern[str],
+	wordPattern: re.Pattern[str],
+) -> dict[str, float]:
+	"""
+	Return the relation value of each word to definition, which is
+	the maximum (over parts of definition) of `count(word) / len(partWords)`
+	like searchWordInDef with matchWord=True.
+	"""
+	rels: dict[str, float] = {}
+	for part in splitPattern.split(defi):
+		if not part:
+			continue
+		partWords = wordPattern.findall(part)
+		if not partWords:
+			continue
+		partLen = len(partWords)
+		for word, count in Counter(partWords).items():
+			rel = count / partLen
+			if rel > rels.get(word, 0.0):
+				rels[word] = rel
+	return rels
+
+
+def _tokenizeBatch(
+	sepChars: str,
+	minWordLen: int,
+	collectWords: bool,
+	defis: list[str],
+) -> tuple[list[dict[str, float]], set[str]]:
+	splitPattern, wordPattern = _tokenizePatterns(sepChars, minWordLen)
+	relsList = [_wordRelations(defi, splitPattern, wordPattern) for defi in defis]
+	outputWords: set[str] = set()
+	if collectWords:
+		# same as takeOutputWords
+		termPattern = _termPattern()
+		for defi in defis:
+			outputWords.update(termPattern.findall(defi))
+	return relsList, outputWords
+
+
+class ReverseIndex:
+	"""
+	Inverted index from words to (entry, relation value) postings.
+
+	Each definition is tokenized only once, using the same sepChars and
+	minWordLen rules as searchWordInDef, so that `search(term)` gives the
+	same result as `searchWordInDef(entries, term)` with matchWord=True.
+
+	If sqlitePath is given, entries and postings are stored in that SQLite
+	database (which is created or overwritten) instead of memory.
+	With processes > 1, definitions are tokenized in a process pool.
+	"""
+
+	batchSize = 256
+
+	def __init__(
+		self,
+		sepChars: str = ".,،",
+		minWordLen: int = 3,
+		sqlitePath: str = "",
+		processes: int = 1,
+	) -> None:
+		self._sepChars = sepChars
+		self._minWordLen = minWordLen
+		self._processes = processes
+		self._entryCount = 0
+		# word -> list of (entryIndex, rel), sorted by entryIndex
+		self._postings: dict[str, list[tuple[int, float]]] = {}
+		# list of (terms, defi)
+		self._entries: list[tuple[list[str], str]] = []
+		self._outputWords: set[str] = set()
+		self._con: sqlite3.Connection | None = None
+		if sqlitePath:
+			self._con = self._openDatabase(sqlitePath)
+
+	@staticmethod
+	def _openDatabase(sqlitePath: str) -> sqlite3.Connection:
+		con = sqlite3.connect(sqlitePath)
+		for query in (
+			"PRAGMA journal_mode=OFF",
+			"PRAGMA synchronous=OFF",
+			"DROP TABLE IF EXISTS entry",
+			"DROP TABLE IF EXISTS posting",
+			"DROP TABLE IF EXISTS outword",
+			"CREATE TABLE entry (id INTEGER PRIMARY KEY, terms TEXT, defi TEXT)",
+			"CREATE TABLE posting (word TEXT, entry INTEGER, rel REAL)",
+			"CREATE TABLE outword (word TEXT PRIMARY KEY) WITHOUT ROWID",
+		):
+			con.execute(query)
+		return con
+
+	@property
+	def entryCount(self) -> int:
+		return self._entryCount
+
+	def _batches(
+		self,
+		entryIter: Iterable[EntryType],
+	) -> Iterator[list[tuple[list[str], str]]]:
+		batchSize = self.batchSize
+		batch: list[tuple[list[str], str]] = []
+		for entry in entryIter:
+			batch.append((entry.l_term, entry.defi))
+			if len(batch) >= batchSize:
+				yield batch
+				batch = []
+		if batch:
+			yield batch
+
+	def _tokenized(
+		self,
+		entryIter: Iterable[EntryType],
+		collectWords: bool,
+	) -> Iterator[tuple[list[tuple[list[str], str]], list[dict[str, float]], set[str]]]:
+		tokenize = partial(
+			_tokenizeBatch,
+			self._sepChars,
+			self._minWordLen,
+			collectWords,
+		)
+		if self._processes <= 1:
+			for batch in self._batches(entryIter):
+				yield batch, *tokenize([defi for _, defi in batch])
+			return
+
+		maxInFlight = 2 * self._processes
+		inFlight: deque[
+			tuple[
+				list[tuple[list[str], str]],
+				Future[tuple[list[dict[str, float]], set[str]]],
+			]
+		] = deque()
+		with ProcessPoolExecutor(max_workers=self._processes) as pool:
+			for batch in self._batches(entryIter):
+				inFlight.append(
+					(batch, pool.submit(tokenize, [defi for _, defi in batch])),
+				)
+				if len(inFlight) >= maxInFlight:
+					doneBatch, future = inFlight.popleft()
+					yield doneBatch, *future.result()
+			while inFlight:
+				doneBatch, future = inFlight.popleft()
+				yield doneBatch, *future.result()
+
+	def build(
+		self,
+		entryIter: Iterable[EntryType],
+		collectWords: bool = True,
+	) -> None:
+		"""
+		Tokenize and index entries.
+
+		If collectWords is True, also collect the output words, like
+		takeOutputWords does, to be returned by outputWords().
+		"""
+		con = self._con
+		for batch, relsList, outputWords in self._tokenized(
+			entryIter,
+			collectWords,
+		):
+			start = self._entryCount
+			self._entryCount += len(batch)
+			if con is None:
+				self._entries += batch
+				postings = self._postings
+				for entryIndex, rels in enumerate(relsList, start):
+					for word, rel in rels.items():
+						wordPostings = postings.get(word)
+						if wordPostings is None:
+							postings[word] = [(entryIndex, rel)]
+						else:
+							wordPostings.append((entryIndex, rel))
+				self._outputWords.update(outputWords)
+				continue
+			con.executemany(
+				"INSERT INTO entry (id, terms, defi) VALUES (?, ?, ?)",
+				[
+					(entryIndex, json.dumps(terms), defi)
+					for entryIndex, (terms, defi) in enumerate(batch, start)
+				],
+			)
+			con.executemany(
+				"INSERT INTO posting (word, entry, rel) VALUES (?, ?, ?)",
+				[
+					(word, entryIndex, rel)
+					for entryIndex, rels in enumerate(relsList, start)
+					for word, rel in rels.items()
+				],
+			)
+			con.executemany(
+				"INSERT OR IGNORE INTO outword (word) VALUES (?)",
+				[(word,) for word in outputWords],
+			)
+		if con is not None:
+			# creating the index after loading is much faster
+			con.execute("CREATE INDEX posting_word ON posting (word, entry)")
+			con.commit()
+
+	def outputWords(self) -> list[str]:
+		"""Return sorted list of words collected by build()."""
+		if self._con is None:
+			return sorted(self._outputWords)
+		return [
+			row[0] for row in self._con.execute("SELECT word FROM outword ORDER BY word")
+		]
+
+	def _matches(
+		self,
+		st: str,
+		minRel: float,
+	) -> Iterator[tuple[list[str], str, float]]:
+		"""Yield (terms, defi, rel) in the order of entries."""
+		if self._con is None:
+			entries = self._entries
+			for entryIndex, rel in self._postings.get(st, []):
+				if rel > minRel:
+					yield *entries[entryIndex], rel
+			return
+		for termsJson, defi, rel in self._con.execute(
+			"SELECT entry.terms, entry.defi, posting.rel FROM posting"
+			" JOIN entry ON entry.id = posting.entry"
+			" WHERE posting.word = ? AND posting.rel > ?"
+			" ORDER BY posting.entry",
+			(st, minRel),
+		):
+			yield json.loads(termsJson), defi, rel
+
+	def search(
+		self,
+		st: str,
+		maxNum: int = 100,
+		minRel: float = 0.0,
+		includeDefs: bool = False,
+		showRel: str = "Percent",  # "Percent" | "Percent At First" | ""
+	) -> list[str]:
+		"""Search word `st` in definitions, see searchWordInDef."""
+		outRel: list[tuple[str, float] | tuple[str, float, str]] = []
+		for terms, defi, rel in self._matches(st, minRel):
+			for word in terms:
+				if includeDefs:
+					outRel.append((word, rel, defi))
+				else:
+					outRel.append((word, rel))
+		return _formatResults(
+			outRel,
+			maxNum=maxNum,
+			includeDefs=includeDefs,
+			showRel=showRel,
+		)
+
+	def close(self) -> None:
+		if self._con is not None:
+			self._con.close()
+			self._con = None
+		self._postings = {}
+		self._entries = []
+		self._outputWords = set()
+
+
 # C901 too complex (22 > 13)
 # PLR0912 Too many branches (27 > 12)
 # PLR0913 Too many arguments in function definition (9 > 5)
@@ -182,6 +512,28 @@ def searchWordInDef(  # noqa: C901, PLR0912, PLR0913
 				outRel.append((word, rel, defi))
 			else:
 				outRel.append((word, rel))
+	return _formatResults(
+		outRel,
+		maxNum=maxNum,
+		includeDefs=includeDefs,
+		showRel=showRel,
+	)
+
+
+def _relLabel(word: str, rel: float, prevRel: float, showRel: str) -> str:
+	if int(1.0 / rel) == 1:
+		return word
+	if showRel == "Percent" or (showRel == "Percent At First" and rel != prevRel):
+		return f"{word}(%{100 * rel})"
+	return word
+
+
+def _formatResults(
+	outRel: list[tuple[str, float] | tuple[str, float, str]],
+	maxNum: int,
+	includeDefs: bool,
+	showRel: str,
+) -> list[str]:
 	outRel.sort(
 		key=itemgetter(1),
 		reverse=True,
@@ -197,32 +549,10 @@ def searchWordInDef(  # noqa: C901, PLR0912, PLR0913
 			numP = num
 			w, num, m = outRel[j]  # type: ignore
 			m = m.replace("\n", "\\n").replace("\t", "\\t")
-			onePer = int(1.0 / num)
-			if onePer == 1:
-				out.append(f"{w}\\n{m}")
-			elif showRel == "Percent":
-				out.append(f"{w}(%{100 * num})\\n{m}")
-			elif showRel == "Percent At First":
-				if num == numP:
-					out.append(f"{w}\\n{m}")
-				else:
-					out.append(f"{w}(%{100 * num})\\n{m}")
-			else:
-				out.append(f"{w}\\n{m}")
+			out.append(f"{_relLabel(w, num, numP, showRel)}\\n{m}")
 		return out
 	for j in range(n):
 		numP = num
 		w, num = outRel[j]  # type: ignore
-		onePer = int(1.0 / num)
-		if onePer == 1:
-			out.append(w)
-		elif showRel == "Percent":
-			out.append(f"{w}(%{100 * num})")
-		elif showRel == "Percent At First":
-			if num == numP:
-				out.append(w)
-			else:
-				out.append(f"{w}(%{100 * num})")
-		else:
-			out.append(w)
+		out.append(_relLabel(w, num, numP, showRel))
 	return out
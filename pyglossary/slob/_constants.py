@@ -5,6 +5,7 @@ from struct import calcsize
 
 __all__ = [
 	"DEFAULT_COMPRESSION",
+	"DEFAULT_SORT_MEMORY",
 	"MAGIC",
 	"MAX_BIN_ITEM_COUNT",
 	"MAX_LARGE_BYTE_STRING_LEN",
@@ -26,6 +27,9 @@ __all__ = [
 
 DEFAULT_COMPRESSION = "lzma2"
 
+# approximate memory used for sorting refs before spilling sorted runs to disk
+DEFAULT_SORT_MEMORY = 256 * 1024 * 1024
+
 UTF8 = "utf-8"
 MAGIC = b"!-1SLOB\x1f"
 
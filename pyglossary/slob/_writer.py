@@ -2,16 +2,17 @@
 from __future__ import annotations
 
 import encodings
+import heapq
 import operator
 import os
 import pickle
 import sys
 import tempfile
 from builtins import open as fopen
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 from datetime import UTC, datetime
 from os.path import isdir
-from struct import pack
+from struct import pack, unpack
 from types import MappingProxyType
 from typing import TYPE_CHECKING, Any, NamedTuple, Self, cast
 
@@ -27,24 +28,33 @@ from ._collate import IDENTICAL, sortkey
 from ._compressions import COMPRESSIONS
 from ._constants import (
 	DEFAULT_COMPRESSION,
+	DEFAULT_SORT_MEMORY,
 	MAGIC,
 	MAX_BIN_ITEM_COUNT,
 	MAX_LARGE_BYTE_STRING_LEN,
 	MAX_TEXT_LEN,
 	MAX_TINY_TEXT_LEN,
 	U_CHAR,
+	U_INT,
 	U_INT_SIZE,
 	U_LONG_LONG_SIZE,
+	U_SHORT_SIZE,
 	UTF8,
 )
 from ._exceptions import UnknownCompression, UnknownEncoding
 from ._item_lists import BinMemWriter, RefList
 from ._multifile import MultiFileReader
-from ._struct import StructWriter
+from ._struct import StructReader, StructWriter
 from ._types import Ref
 
 __all__ = ["Writer", "WriterEvent"]
 
+# approximate memory used by a (sort key, ref position) tuple
+# in addition to the length of the sort key
+SORT_ITEM_OVERHEAD = 120
+
+SORT_BUFFER_SIZE = 1024 * 1024
+
 
 class WriterEvent(NamedTuple):
 	name: str
@@ -62,9 +72,11 @@ class Writer:
 		max_redirects: int = 5,
 		observer: Callable[[WriterEvent], None] | None = None,
 		version_info: bool = True,
+		sort_memory: int = DEFAULT_SORT_MEMORY,
 	) -> None:
 		self.filename = filename
 		self.observer = observer
+		self.sort_memory = sort_memory
 		if os.path.exists(self.filename):
 			raise SystemExit(f"File {self.filename!r} already exists")
 
@@ -97,6 +109,7 @@ class Writer:
 				max_redirects=0,
 				compression=None,
 				version_info=False,
+				sort_memory=sort_memory,
 			)
 
 		if compression is None:
@@ -117,6 +130,7 @@ class Writer:
 
 		self.blob_count = 0
 		self.ref_count = 0
+		self._sort_run_count = 0
 		self.bin_count = 0
 		self._tags = {
 			"created.at": created_at,
@@ -255,21 +269,92 @@ class Writer:
 		self.f_refs.write_tiny_text(fragment)
 		self.ref_count += 1
 
+	def _iter_ref_sort_keys(self) -> Iterator[tuple[bytes, int]]:
+		"""
+		Read refs file sequentially, yield (sort_key, ref_position) tuples.
+
+		Every written ref has exactly one position, so this yields the same
+		refs as ref-positions, without random access.
+		"""
+		sortkey_func = sortkey(IDENTICAL)
+		with fopen(self.f_refs.name, "rb", buffering=SORT_BUFFER_SIZE) as f:
+			reader = StructReader(f, self.encoding)
+			for _ in range(self.ref_count):
+				pos = reader.tell()
+				key = reader.read_text()
+				reader.read(U_INT_SIZE + U_SHORT_SIZE)  # bin_index, item_index
+				reader.read_tiny_text()  # fragment
+				yield sortkey_func(key), pos
+
+	def _write_sort_run(self, items: list[tuple[bytes, int]]) -> str:
+		items.sort()
+		f_run = StructWriter(
+			fopen(
+				os.path.join(self.tmpdir.name, f"sort-run-{self._sort_run_count}"),
+				"wb",
+				buffering=SORT_BUFFER_SIZE,
+			),
+		)
+		self._sort_run_count += 1
+		for key, pos in items:
+			f_run.write_int(len(key))
+			f_run.write(key)
+			f_run.write_long(pos)
+		f_run.close()
+		self._fire_event("sort_run", f_run.name)
+		return f_run.name
+
+	@staticmethod
+	def _read_sort_run(path: str) -> Iterator[tuple[bytes, int]]:
+		with fopen(path, "rb", buffering=SORT_BUFFER_SIZE) as f:
+			reader = StructReader(f)
+			while header := reader.read(U_INT_SIZE):
+				key = reader.read(unpack(U_INT, header)[0])
+				yield key, reader.read_long()
+		os.remove(path)
+
 	def _sort(self) -> None:
+		"""
+		Sort ref positions by collation key of ref keys.
+
+		This is an external merge sort: refs are read sequentially, and when
+		the (approximate) size of (sort_key, position) tuples in memory
+		exceeds sort_memory, they are sorted and written to a temporary
+		file (a sorted run). Sorted runs are then merged.
+		Ties are broken by ref position (order of writing).
+		"""
 		self._fire_event("begin_sort")
-		f_ref_positions_sorted = self._wbfopen("ref-positions-sorted")
 		self.f_refs.flush()
 		self.f_ref_positions.close()
-		with MultiFileReader(self.f_ref_positions.name, self.f_refs.name) as f:
-			ref_list = RefList(f, self.encoding, count=self.ref_count)
-			sortkey_func = sortkey(IDENTICAL)
-			for i in sorted(
-				range(len(ref_list)),
-				key=lambda j: sortkey_func(ref_list[j].key),
-			):
-				ref_pos = ref_list.pos(i)
-				f_ref_positions_sorted.write_long(ref_pos)
+		sort_memory = self.sort_memory
+		run_paths: list[str] = []
+		items: list[tuple[bytes, int]] = []
+		items_size = 0
+		for item in self._iter_ref_sort_keys():
+			items.append(item)
+			items_size += len(item[0]) + SORT_ITEM_OVERHEAD
+			if items_size >= sort_memory:
+				run_paths.append(self._write_sort_run(items))
+				items = []
+				items_size = 0
+
+		sorted_items: Iterable[tuple[bytes, int]]
+		if run_paths:
+			if items:
+				run_paths.append(self._write_sort_run(items))
+			del items
+			sorted_items = heapq.merge(
+				*[self._read_sort_run(path) for path in run_paths],
+			)
+		else:
+			items.sort()
+			sorted_items = items
+
+		f_ref_positions_sorted = self._wbfopen("ref-positions-sorted")
+		for _, ref_pos in sorted_items:
+			f_ref_positions_sorted.write_long(ref_pos)
 		f_ref_positions_sorted.close()
+		del sorted_items
 		os.remove(self.f_ref_positions.name)
 		os.rename(f_ref_positions_sorted.name, self.f_ref_positions.name)
 		self.f_ref_positions = StructWriter(
@@ -306,6 +391,7 @@ class Writer:
 					max_redirects=0,
 					compression=None,
 					version_info=False,
+					sort_memory=self.sort_memory,
 				)
 
 				for item in aliasesSlob:
@@ -253,6 +253,36 @@ class TestSort(BaseTest):
 		BaseTest.tearDown(self)
 
 
+class TestExternalSort(BaseTest):
+	def test_sort_runs(self):
+		rnd = random.Random(42)
+		keys = [
+			"".join(rnd.choice("абвгдеёжabcdeABCDE ,") for _ in range(rnd.randint(1, 8)))
+			for _ in range(1000)
+		]
+		events = []
+
+		def observer(event: WriterEvent):
+			events.append(event.name)
+
+		results = []
+		for sort_memory in (1024 * 1024 * 1024, 4000):
+			path = os.path.join(self.tmpdir.name, f"test-{sort_memory}.slob")
+			writer = self.create(path, observer=observer, sort_memory=sort_memory)
+			for i, key in enumerate(keys):
+				writer.add(str(i).encode("ascii"), key)
+			writer.finalize()
+			with Slob(path) as r:
+				results.append([(item.key, item.content) for item in r])
+
+		self.assertGreater(events.count("sort_run"), 1)
+		self.assertEqual(results[0], results[1])
+		self.assertEqual(
+			[key for key, _ in results[1]],
+			sorted(keys, key=sortkey(IDENTICAL)),
+		)
+
+
 class TestSortKey(BaseTest):
 	def setUp(self):
 		BaseTest.setUp(self)
@@ -21,6 +21,7 @@ import logging
 from typing import TYPE_CHECKING, Self
 
 from .glossary_utils import Error
+from .sqlite_utils import bulkLoadPragmas
 
 if TYPE_CHECKING:
 	from collections.abc import Callable, Iterable, Iterator
@@ -35,6 +36,13 @@ __all__ = ["SqEntryList"]
 
 log = logging.getLogger("pyglossary")
 
+# number of rows buffered by append() before they are inserted
+# with a single executemany call
+defaultBatchSize = 1000
+
+# must be set before the first table is created
+_tempDatabasePageSize = 16384
+
 
 class SqEntryList:
 	def __init__(  # noqa: PLR0913
@@ -43,19 +51,39 @@ class SqEntryList:
 		entryFromRaw: Callable[[RawEntryType], EntryType],
 		database: str,
 		create: bool = True,
+		batchSize: int = defaultBatchSize,
+		mmapSize: int = 0,
 	) -> None:
-		"""sqliteSortKey[i] == (name, type, valueFunc)."""
+		"""
+		sqliteSortKey[i] == (name, type, valueFunc).
+
+		batchSize: number of entries to buffer before inserting them,
+			1 means insert every entry immediately
+		mmapSize: maximum number of bytes of the database file to
+			memory-map, 0 disables memory-mapped I/O
+		"""
 		import sqlite3
 
+		# set before validating arguments, so __del__ (close) works
+		self._con: sqlite3.Connection | None = None
+		self._cur: sqlite3.Cursor | None = None
+
+		if not database:
+			raise ValueError(f"invalid {database=}")
+		if batchSize < 1:
+			raise ValueError(f"invalid {batchSize=}")
+
 		self._entryToRaw = entryToRaw
 		self._entryFromRaw = entryFromRaw
 		self._database = database
 
-		self._con: sqlite3.Connection | None = sqlite3.connect(database)
-		self._cur: sqlite3.Cursor | None = self._con.cursor()
+		self._con = sqlite3.connect(database)
+		self._cur = self._con.cursor()
 
-		if not database:
-			raise ValueError(f"invalid {database=}")
+		if create:
+			self._setTempDatabasePragmas()
+		if mmapSize > 0:
+			self._con.execute(f"PRAGMA mmap_size={int(mmapSize)}")
 
 		self._orderBy = "rowid"
 		self._sorted = False
@@ -64,6 +92,15 @@ class SqEntryList:
 		self._create = create
 		self._sqliteSortKey: SQLiteSortKeyType = []
 		self._columnNames = ""
+		self._insertQuery = ""
+		self._batchSize = batchSize
+		self._pending: list[list[Any]] = []
+
+	def _setTempDatabasePragmas(self) -> None:
+		assert self._con
+		self._con.execute(f"PRAGMA page_size={_tempDatabasePageSize}")
+		for pragma in bulkLoadPragmas:
+			self._con.execute(pragma)
 
 	def hasSortKey(self) -> bool:
 		return bool(self._sqliteSortKey)
@@ -94,6 +131,10 @@ class SqEntryList:
 
 		self._sqliteSortKey = sqliteSortKey
 		self._columnNames = ",".join(col[0] for col in sqliteSortKey)
+		self._insertQuery = (
+			f"insert into data({self._columnNames}, data)"
+			f" values (?{', ?' * len(sqliteSortKey)})"
+		)
 
 		if not self._create:
 			self._parseExistingIndex()
@@ -116,16 +157,27 @@ class SqEntryList:
 		return self._entryFromRaw(data.split(b"\x00"))
 
 	def append(self, entry: EntryType) -> None:
-		self._cur.execute(  # type: ignore
-			f"insert into data({self._columnNames}, data)"
-			f" values (?{', ?' * len(self._sqliteSortKey)})",
-			[col[2](entry.l_term) for col in self._sqliteSortKey] + [self._encode(entry)],
+		l_term = entry.l_term
+		pending = self._pending
+		pending.append(
+			[col[2](l_term) for col in self._sqliteSortKey] + [self._encode(entry)],
 		)
 		self._len += 1
+		if len(pending) >= self._batchSize:
+			self._flush()
+
+	def _flush(self) -> None:
+		if not self._pending:
+			return
+		if self._cur is None:
+			raise Error("SQLite cursor is closed")
+		self._cur.executemany(self._insertQuery, self._pending)
+		self._pending.clear()
 
 	def __iter__(self) -> Iterator[EntryType]:
 		if self._cur is None:
 			raise Error("SQLite cursor is closed")
+		self._flush()
 		self._cur.execute(f"SELECT data FROM data ORDER BY {self._orderBy}")
 		for row in self._cur:
 			yield self._decode(row[0])
@@ -148,6 +200,7 @@ class SqEntryList:
 		if reverse:
 			self._orderBy = ",".join(f"{col[0]} DESC" for col in self._sqliteSortKey)
 		assert self._con
+		self._flush()
 		self._con.commit()
 		self._con.execute(
 			f"CREATE INDEX sortkey ON data({sortColumnNames});",
@@ -182,6 +235,7 @@ class SqEntryList:
 	def close(self) -> None:
 		if self._con is None or self._cur is None:
 			return
+		self._flush()
 		self._con.commit()
 		self._cur.close()
 		self._con.close()
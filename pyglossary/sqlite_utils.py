@@ -0,0 +1,20 @@
+"""
+SQLite settings shared by SqEntryList and SQLite-based writers.
+
+This module is used in plugins.
+"""
+
+from __future__ import annotations
+
+__all__ = ["bulkLoadPragmas"]
+
+# PRAGMAs for a database that is created from scratch and filled in one go:
+# if the process is interrupted, the file is useless anyway (and a temp
+# database is removed after conversion), so we don't need the rollback
+# journal or fsync calls
+bulkLoadPragmas = (
+	"PRAGMA journal_mode=OFF",
+	"PRAGMA synchronous=OFF",
+	"PRAGMA cache_size=-65536",  # in KiB, 64 MiB
+	"PRAGMA temp_store=MEMORY",
+)
@@ -0,0 +1,318 @@
+"""
+Timing counters for stages of conversion: reader, entry filters and writer.
+
+Enabled with `stage_stats` config key (`--stage-stats` flag), or by setting
+`stage_stats_json` (`--stage-stats-json`) to the path of a JSON file.
+When disabled, none of these wrappers are used, so there is no overhead.
+
+Size of an entry is the number of characters in its terms and definition,
+or the number of bytes for a data entry (resource file), so that computing
+it does not need encoding the entry.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+from os.path import isdir, join, split, splitext
+from time import perf_counter as now
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from collections.abc import Iterable, Iterator
+	from typing import Any
+
+	from .entry_filters import EntryFilterType
+	from .glossary_types import EntryType
+
+__all__ = [
+	"StageCounter",
+	"StageStats",
+	"TimedEntryFilter",
+	"entrySize",
+	"filesSnapshot",
+	"glossaryFiles",
+	"stageName",
+]
+
+# number of slowest entries kept for each stage
+slowestCount = 5
+
+
+def entrySize(entry: EntryType) -> int:
+	if entry.isData():
+		return entry.size()  # type: ignore
+	return len(entry.defi) + sum(len(term) for term in entry.l_term)
+
+
+def stageName(obj: Any) -> str:
+	"""Plugin module name of a Reader or Writer object, or its class name."""
+	cls = type(obj)
+	parts = cls.__module__.split(".")
+	if len(parts) > 2 and parts[:2] == ["pyglossary", "plugins"]:
+		return parts[2]
+	return cls.__name__
+
+
+def glossaryFiles(filename: str) -> dict[str, os.stat_result]:
+	"""
+	Files of a glossary: the file (or all files in the directory) and other
+	files with the same name and a different extension, like .idx and
+	.dict.dz files of StarDict. Returns a dict of absolute path to stat.
+	"""
+	filename = os.path.abspath(filename.rstrip(os.sep))
+	if isdir(filename):
+		files: dict[str, os.stat_result] = {}
+		for dirPath, _dirNames, fileNames in os.walk(filename):
+			for fname in fileNames:
+				fpath = join(dirPath, fname)
+				files[fpath] = os.stat(fpath)
+		return files
+	directory, fname = split(filename)
+	if not isdir(directory):
+		return {}
+	prefix = splitext(fname)[0] + "."
+	return {
+		entry.path: entry.stat()
+		for entry in os.scandir(directory)
+		if entry.is_file() and (entry.name == fname or entry.name.startswith(prefix))
+	}
+
+
+def filesSnapshot(filename: str) -> dict[str, tuple[int, int, int]]:
+	"""Return glossaryFiles(filename) as (inode, size, mtime) tuples."""
+	return {path: _statKey(st) for path, st in glossaryFiles(filename).items()}
+
+
+def _statKey(st: os.stat_result) -> tuple[int, int, int]:
+	return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+class StageCounter:
+	"""
+	Counters of one stage.
+
+	time: cumulative time in seconds
+	count: number of entries given to (or yielded by, for reader) this stage
+	outCount: number of entries passed to next stage (not skipped)
+	sizeIn, sizeOut: total size of entries (or files) in and out of stage
+	"""
+
+	__slots__ = [
+		"count",
+		"kind",
+		"name",
+		"outCount",
+		"sizeIn",
+		"sizeOut",
+		"slowest",
+		"time",
+	]
+
+	def __init__(self, kind: str, name: str) -> None:
+		self.kind = kind
+		self.name = name
+		self.time = 0.0
+		self.count = 0
+		self.outCount = 0
+		self.sizeIn = 0
+		self.sizeOut = 0
+		# min-heap of (seconds, index, term)
+		self.slowest: list[tuple[float, int, str]] = []
+
+	@property
+	def label(self) -> str:
+		return f"{self.kind}: {self.name}"
+
+	def addSlow(self, elapsed: float, entry: EntryType) -> None:
+		slowest = self.slowest
+		if len(slowest) < slowestCount:
+			heapq.heappush(slowest, (elapsed, self.count, entry.s_term))
+		elif elapsed > slowest[0][0]:
+			heapq.heapreplace(slowest, (elapsed, self.count, entry.s_term))
+
+	def toDict(self) -> dict[str, Any]:
+		return {
+			"kind": self.kind,
+			"name": self.name,
+			"time": round(self.time, 6),
+			"count": self.count,
+			"out_count": self.outCount,
+			"size_in": self.sizeIn,
+			"size_out": self.sizeOut,
+			"slowest": [
+				{"term": term, "time": round(elapsed, 6)}
+				for elapsed, _, term in sorted(self.slowest, reverse=True)
+			],
+		}
+
+
+class TimedEntryFilter:
+	"""Wrapper of entry filter that updates a StageCounter."""
+
+	def __init__(self, entryFilter: EntryFilterType, counter: StageCounter) -> None:
+		self.name = entryFilter.name
+		self.desc = entryFilter.desc
+		self._run = entryFilter.run
+		self._counter = counter
+
+	def prepare(self) -> None:
+		pass
+
+	def run(self, entry: EntryType) -> EntryType | None:
+		counter = self._counter
+		sizeIn = entrySize(entry)
+		t0 = now()
+		result = self._run(entry)
+		elapsed = now() - t0
+		counter.time += elapsed
+		counter.addSlow(elapsed, entry)
+		counter.count += 1
+		counter.sizeIn += sizeIn
+		if result is not None:
+			counter.outCount += 1
+			counter.sizeOut += entrySize(result)
+		return result
+
+
+class StageStats:
+	"""Counters of all stages of a conversion, in the order they were added."""
+
+	def __init__(self) -> None:
+		self._counters: dict[tuple[str, str], StageCounter] = {}
+		self._startTime = now()
+		self._totalTime = 0.0
+		# for each running timeIter next() call, time of nested calls
+		self._nested: list[float] = []
+		# glossary files of each read counter
+		self._inputFiles: dict[StageCounter, dict[str, os.stat_result]] = {}
+
+	def counter(self, kind: str, name: str) -> StageCounter:
+		key = (kind, name)
+		counter = self._counters.get(key)
+		if counter is None:
+			counter = self._counters[key] = StageCounter(kind, name)
+		return counter
+
+	@property
+	def counters(self) -> list[StageCounter]:
+		return list(self._counters.values())
+
+	def addInputFiles(self, counter: StageCounter, filename: str) -> None:
+		"""Set sizeIn of a read counter to size of files of glossary."""
+		files = self._inputFiles.setdefault(counter, {})
+		files.update(glossaryFiles(filename))
+		counter.sizeIn = sum(st.st_size for st in files.values())
+
+	def addOutputFiles(
+		self,
+		counter: StageCounter,
+		filename: str,
+		before: dict[str, tuple[int, int, int]],
+	) -> None:
+		"""
+		Add size of files of glossary that are created or changed since
+		`before` snapshot (taken with filesSnapshot) to sizeOut of a write
+		counter. Input glossaries may share the name with a different
+		extension, and those files are not counted.
+		Files that were counted as input (like output of a previous run)
+		are no longer counted as input.
+		"""
+		files = {
+			path: st
+			for path, st in glossaryFiles(filename).items()
+			if before.get(path) != _statKey(st)
+		}
+		counter.sizeOut += sum(st.st_size for st in files.values())
+		for inCounter, inFiles in self._inputFiles.items():
+			for path in files:
+				inFiles.pop(path, None)
+			inCounter.sizeIn = sum(st.st_size for st in inFiles.values())
+
+	def wrapFilters(
+		self,
+		entryFilters: list[EntryFilterType],
+	) -> list[EntryFilterType]:
+		return [
+			TimedEntryFilter(entryFilter, self.counter("filter", entryFilter.name))
+			for entryFilter in entryFilters
+		]
+
+	def timeIter(
+		self,
+		iterable: Iterable[EntryType | None],
+		counter: StageCounter,
+	) -> Iterator[EntryType | None]:
+		"""
+		Yield items of iterable, timing each next() call.
+
+		If iterable pulls entries from another timed iterator (like
+		parallel filters do from reader), time of the inner one is not
+		counted for this one.
+		"""
+		iterator = iter(iterable)
+		nested = self._nested
+		while True:
+			nested.append(0.0)
+			t0 = now()
+			try:
+				entry = next(iterator)
+			except StopIteration:
+				return
+			finally:
+				elapsed = now() - t0
+				inner = nested.pop()
+				if nested:
+					nested[-1] += elapsed
+				elapsed -= inner
+				counter.time += elapsed
+			if entry is not None:
+				counter.addSlow(elapsed, entry)
+				counter.count += 1
+				counter.outCount += 1
+				counter.sizeOut += entrySize(entry)
+			yield entry
+
+	def stop(self) -> None:
+		self._totalTime = now() - self._startTime
+
+	def toDict(self) -> dict[str, Any]:
+		return {
+			"total_time": round(self._totalTime, 6),
+			"stages": [counter.toDict() for counter in self._counters.values()],
+		}
+
+	def reportText(self, slowestStages: int = 3) -> str:
+		"""
+		Return a table of counters, and slowest entries of the
+		`slowestStages` stages that took the most time.
+		"""
+		counters = list(self._counters.values())
+		total = self._totalTime or 1e-9
+		width = max([len(c.label) for c in counters] + [len("Stage")])
+
+		def timeCols(t: float) -> str:
+			return f"{t:9.3f} {t * 100 / total:5.1f}"
+
+		header = (
+			f"{'Stage':<{width}} {'Time':>9} {'%':>5} {'Entries':>9} {'Out':>9}"
+			f" {'Size In':>12} {'Size Out':>12}"
+		)
+		lines = [header]
+		lines += [
+			f"{c.label:<{width}} {timeCols(c.time)}"
+			f" {c.count:9} {c.outCount:9} {c.sizeIn:12} {c.sizeOut:12}"
+			for c in counters
+		]
+		other = self._totalTime - sum(c.time for c in counters)
+		lines.append(f"{'other':<{width}} {timeCols(other)}")
+		lines.append(f"{'total':<{width}} {timeCols(self._totalTime)}")
+		for c in sorted(counters, key=lambda c: c.time, reverse=True)[:slowestStages]:
+			if not c.slowest:
+				continue
+			slowest = ", ".join(
+				f"{term!r} ({elapsed * 1000:.2f} ms)"
+				for elapsed, _, term in sorted(c.slowest, reverse=True)
+			)
+			lines.append(f"Slowest entries in {c.label}: {slowest}")
+		return "\n".join(lines)
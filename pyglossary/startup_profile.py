@@ -0,0 +1,259 @@
+"""
+Startup profiler: import time of modules and time to first entry.
+
+Enabled with `--profile-startup` command line flag, or by setting
+environment variable PYGLOSSARY_PROFILE_STARTUP to "1" (report is printed
+to stderr on exit) or to the path of a .json file (report is written
+to that file).
+
+Import time of each module is measured by wrapping exec_module of its
+loader, so only modules imported after enable() are recorded. That is why
+this module must not import anything from pyglossary, and is imported
+(and enabled) at the top of pyglossary/ui/main.py. pyglossary.core (and
+logging) are imported by pyglossary/__init__.py before that, so they are
+not recorded.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from time import perf_counter
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+	from collections.abc import Callable, Iterable, Iterator, Sequence
+	from importlib.machinery import ModuleSpec
+	from types import ModuleType
+	from typing import Any
+
+__all__ = [
+	"ImportRecord",
+	"StartupProfile",
+	"enable",
+	"enableFromArgv",
+	"isEnabled",
+	"mark",
+	"markFirst",
+]
+
+envName = "PYGLOSSARY_PROFILE_STARTUP"
+flagName = "--profile-startup"
+
+# number of modules shown in text report
+reportTopCount = 25
+
+
+class ImportRecord(NamedTuple):
+	module: str
+	selfTime: float  # seconds, excluding nested imports
+	cumulativeTime: float  # seconds
+	depth: int
+
+
+class _ImportTimer:
+	"""
+	Meta path finder that does not find anything by itself, but wraps
+	exec_module of loaders found by other finders to measure import time.
+	"""
+
+	def __init__(self, records: list[ImportRecord]) -> None:
+		self._records = records
+		# for each module being imported, total cumulative time of its
+		# nested imports (to be subtracted from its own cumulative time)
+		self._stack: list[float] = []
+
+	def find_spec(  # noqa: N802
+		self,
+		fullname: str,
+		path: Sequence[str] | None,
+		target: ModuleType | None = None,
+	) -> ModuleSpec | None:
+		for finder in sys.meta_path:
+			if finder is self:
+				continue
+			findSpec = getattr(finder, "find_spec", None)
+			if findSpec is None:
+				continue
+			spec = findSpec(fullname, path, target)
+			if spec is not None:
+				break
+		else:
+			return None
+		loader = spec.loader
+		# builtin and frozen importers are classes shared by all their modules
+		if loader is None or isinstance(loader, type):
+			return spec
+		execModule = getattr(loader, "exec_module", None)
+		if execModule is None:
+			return spec
+		try:
+			loader.exec_module = self._timed(fullname, execModule)  # type: ignore
+		except AttributeError:
+			pass
+		return spec
+
+	def _timed(
+		self,
+		fullname: str,
+		execModule: Callable[[ModuleType], None],
+	) -> Callable[[ModuleType], None]:
+		stack = self._stack
+		records = self._records
+
+		def execModuleTimed(module: ModuleType) -> None:
+			stack.append(0.0)
+			t0 = perf_counter()
+			try:
+				execModule(module)
+			finally:
+				cumulative = perf_counter() - t0
+				nested = stack.pop()
+				if stack:
+					stack[-1] += cumulative
+				records.append(
+					ImportRecord(
+						module=fullname,
+						selfTime=cumulative - nested,
+						cumulativeTime=cumulative,
+						depth=len(stack),
+					),
+				)
+
+		return execModuleTimed
+
+
+class StartupProfile:
+	def __init__(self, jsonPath: str = "") -> None:
+		self._jsonPath = jsonPath
+		self._startTime = perf_counter()
+		self._imports: list[ImportRecord] = []
+		self._marks: dict[str, float] = {}
+		self._timer = _ImportTimer(self._imports)
+
+	def start(self) -> None:
+		sys.meta_path.insert(0, self._timer)
+
+	def stop(self) -> None:
+		if self._timer in sys.meta_path:
+			sys.meta_path.remove(self._timer)
+
+	@property
+	def imports(self) -> list[ImportRecord]:
+		return self._imports
+
+	@property
+	def marks(self) -> dict[str, float]:
+		"""Seconds since start of profiling, by mark name."""
+		return self._marks
+
+	def mark(self, name: str) -> None:
+		"""Record the time of first occurrence of an event."""
+		if name not in self._marks:
+			self._marks[name] = perf_counter() - self._startTime
+
+	def markFirst[T](self, iterable: Iterable[T], name: str) -> Iterator[T]:
+		"""Yield items of iterable, and mark the time of first item."""
+		iterator = iter(iterable)
+		for item in iterator:
+			self.mark(name)
+			yield item
+			break
+		yield from iterator
+
+	def toDict(self) -> dict[str, Any]:
+		ms = 1000
+		return {
+			"marks": {name: round(t * ms, 3) for name, t in self._marks.items()},
+			"import_count": len(self._imports),
+			"import_time": round(sum(r.selfTime for r in self._imports) * ms, 3),
+			"imports": [
+				{
+					"module": r.module,
+					"self": round(r.selfTime * ms, 3),
+					"cumulative": round(r.cumulativeTime * ms, 3),
+					"depth": r.depth,
+				}
+				for r in self._imports
+			],
+		}
+
+	def reportText(self, topCount: int = reportTopCount) -> str:
+		imports = self._imports
+		importTime = sum(r.selfTime for r in imports)
+		lines = [
+			"Startup profile (milliseconds since profiler started):",
+			f"{'imports':>24}: {importTime * 1000:9.1f}  ({len(imports)} modules)",
+		]
+		lines += [f"{name:>24}: {t * 1000:9.1f}" for name, t in self._marks.items()]
+		lines.append(f"Slowest imports (top {topCount}):")
+		lines.append(f"{'self':>9} {'cumulative':>10}  module")
+		lines += [
+			f"{r.selfTime * 1000:9.1f} {r.cumulativeTime * 1000:10.1f}  {r.module}"
+			for r in sorted(imports, key=lambda r: r.selfTime, reverse=True)[:topCount]
+		]
+		return "\n".join(lines)
+
+	def report(self) -> None:
+		"""Stop profiling and print or save the report."""
+		self.stop()
+		self.mark("exit")
+		if not self._jsonPath:
+			sys.stderr.write(self.reportText() + "\n")
+			return
+		import json
+
+		with open(self._jsonPath, mode="w", encoding="utf-8") as file:
+			json.dump(self.toDict(), file, indent="\t")
+
+
+_profile: StartupProfile | None = None
+
+
+def enable(jsonPath: str = "") -> StartupProfile:
+	"""
+	Start profiling (if not started yet), and report on exit.
+	Report is printed to stderr, or written to jsonPath as JSON.
+	"""
+	global _profile
+	if _profile is not None:
+		return _profile
+	import atexit
+
+	_profile = StartupProfile(jsonPath=jsonPath)
+	_profile.start()
+	atexit.register(_profile.report)
+	return _profile
+
+
+def enableFromArgv(argv: list[str]) -> StartupProfile | None:
+	"""
+	Enable profiling if `--profile-startup` flag is in argv, or if
+	environment variable PYGLOSSARY_PROFILE_STARTUP is set.
+	"""
+	value = os.getenv(envName, "")
+	if value.endswith(".json"):
+		return enable(jsonPath=value)
+	if flagName in argv or value not in {"", "0"}:
+		return enable()
+	return None
+
+
+def isEnabled() -> bool:
+	return _profile is not None
+
+
+def mark(name: str) -> None:
+	"""Record time of first occurrence of an event, if profiling."""
+	if _profile is not None:
+		_profile.mark(name)
+
+
+def markFirst[T](iterable: Iterable[T], name: str) -> Iterable[T]:
+	"""
+	Return iterable itself if not profiling, otherwise an iterator
+	that marks the time of the first item.
+	"""
+	if _profile is None:
+		return iterable
+	return _profile.markFirst(iterable, name)
@@ -10,14 +10,16 @@ from typing import TYPE_CHECKING, cast
 
 from .compress import (
 	compressionOpen,
+	progressSize,
 	stdCompressions,
 )
+from .data_source import FileDataSource
 from .entry import DataEntry
 from .io_utils import nullTextIO
 from .os_utils import countFilesRecursive, listFilesRecursiveRelPath
 
 if TYPE_CHECKING:
-	from collections.abc import Generator, Iterator
+	from collections.abc import Callable, Generator, Iterator
 
 	from .entry_base import MultiStr
 	from .glossary_types import EntryType, ReaderGlossaryType
@@ -42,9 +44,22 @@ type nextBlockResultType = (
 
 
 class TextFilePosWrapper(io.TextIOBase):
-	def __init__(self, fileobj: io.TextIOBase, encoding: str) -> None:
+	"""
+	Keep track of position (in bytes) of a text file while iterating.
+
+	If rawTell is given (see compress.progressSize), tell() returns
+	position in the compressed file instead.
+	"""
+
+	def __init__(
+		self,
+		fileobj: io.TextIOBase,
+		encoding: str,
+		rawTell: Callable[[], int] | None = None,
+	) -> None:
 		self.fileobj = fileobj
 		self._encoding = encoding
+		self._rawTell = rawTell
 		self.pos = 0
 
 	def __iter__(self) -> Iterator[str]:  # type: ignore
@@ -59,6 +74,8 @@ class TextFilePosWrapper(io.TextIOBase):
 		return line
 
 	def tell(self) -> int:
+		if self._rawTell is not None:
+			return self._rawTell()
 		return self.pos
 
 
@@ -122,16 +139,24 @@ class TextGlossaryReader:
 		except StopIteration:
 			return ""
 
-	def _calcFilzeSize(self, cfile: io.TextIOBase, filename: str) -> None:
-		if cfile.seekable():
-			log.info("Calculating file size")
-			cfile.seek(0, 2)
-			self._fileSize = cfile.tell()
-			cfile.seek(0)
-			log.debug(f"File size of {filename}: {self._fileSize}")
-			self._glos.setInfo("input_file_size", str(self._fileSize))
-		else:
+	def _calcFilzeSize(
+		self,
+		cfile: io.TextIOBase,
+		filename: str,
+	) -> Callable[[], int] | None:
+		"""
+		Set self._fileSize, and return rawTell function
+		(see compress.ProgressSize) for compressed files.
+		"""
+		if not cfile.seekable():
 			log.warning("TextGlossaryReader: file is not seekable")
+			return None
+		progress = progressSize(cfile)
+		self._fileSize = progress.size
+		log.debug(f"File size of {filename}: {self._fileSize}")
+		if progress.uncompressed:
+			self._glos.setInfo("input_file_size", str(self._fileSize))
+		return progress.rawTell
 
 	def _openGen(self, filename: str) -> Iterator[tuple[int, int]]:
 		self._fileIndex += 1
@@ -145,15 +170,16 @@ class TextGlossaryReader:
 			),
 		)
 
+		rawTell: Callable[[], int] | None = None
 		if self._glos.progressbar:
-			self._calcFilzeSize(cfile, filename)
+			rawTell = self._calcFilzeSize(cfile, filename)
 			self._progress = self._fileSize > 0
 		else:
 			if os.getenv("CALC_FILE_SIZE"):
-				self._calcFilzeSize(cfile, filename)
+				rawTell = self._calcFilzeSize(cfile, filename)
 			self._progress = False
 
-		self._file = TextFilePosWrapper(cfile, self._encoding)
+		self._file = TextFilePosWrapper(cfile, self._encoding, rawTell=rawTell)
 		if self._hasInfo:
 			yield from self.loadInfo()
 
@@ -295,11 +321,7 @@ class TextGlossaryReader:
 			if not isfile(fpath):
 				log.error(f"No such file: {fpath}")
 				continue
-			with open(fpath, "rb") as file:
-				yield self._glos.newDataEntry(
-					fname,
-					file.read(),
-				)
+			yield self._glos.newFileDataEntry(fname, FileDataSource(fpath))
 
 	def countResourceFiles(self) -> int:
 		return self._resCount
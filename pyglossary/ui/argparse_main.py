@@ -41,6 +41,12 @@ def defineFlags(parser: argparse.ArgumentParser, config: ConfigType) -> None:
 		dest="help",
 		action="store_true",
 	)
+	parser.add_argument(
+		"--profile-startup",
+		dest="profile_startup",
+		action="store_true",
+		# handled by startup_profile.enableFromArgv, before parsing flags
+	)
 	parser.add_argument(
 		"-u",
 		"--ui",
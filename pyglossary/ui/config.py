@@ -71,6 +71,14 @@ configDefDict: dict[str, Option] = {
 			"mode is not possible. Can override with --no-sqlite"
 		),
 	),
+	"sqlite_mmap_size": IntOption(
+		hasFlag=False,
+		comment=(
+			"Maximum number of bytes of the temporary SQLite database\n"
+			"to memory-map in SQLite mode, 0 to disable"
+		),
+		minim=0,
+	),
 	"enable_alts": BoolOption(
 		hasFlag=True,
 		customFlag="alts",
@@ -88,6 +96,14 @@ configDefDict: dict[str, Option] = {
 		customFlag="info",
 		comment="Save .info file alongside output file(s)",
 	),
+	"stage_stats": BoolOption(
+		hasFlag=True,
+		comment="Show time spent in reader, each entry filter and writer",
+	),
+	"stage_stats_json": StrOption(
+		hasFlag=True,
+		comment="Save time spent in reader, entry filters and writer to JSON file",
+	),
 	"lower": getEntryFilterOption("lower"),
 	"utf8_check": getEntryFilterOption("utf8_check"),
 	"rtl": getEntryFilterOption("rtl"),
@@ -187,4 +203,13 @@ configDefDict: dict[str, Option] = {
 	"reverse_minRel": FloatOption(hasFlag=False),
 	"reverse_maxNum": IntOption(hasFlag=False),
 	"reverse_includeDefs": BoolOption(hasFlag=False),
+	"reverse_sqlitePath": StrOption(
+		hasFlag=False,
+		comment="Keep reverse index in this SQLite file instead of memory",
+	),
+	"reverse_processes": IntOption(
+		hasFlag=False,
+		minim=1,
+		comment="Number of processes to tokenize definitions for reverse index",
+	),
 }
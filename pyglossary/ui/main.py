@@ -19,17 +19,23 @@
 
 from __future__ import annotations
 
-import argparse
-import logging
 import sys
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, cast
 
-from pyglossary import core, logger  # essential
-from pyglossary.langs import langDict
+from pyglossary import startup_profile
 
-from .argparse_main import configFromArgs, defineFlags, validateFlags
-from .base import UIBase
+# must be done before importing other modules, to measure their import time
+startup_profile.enableFromArgv(sys.argv)
+
+import argparse  # noqa: E402
+import logging  # noqa: E402
+from dataclasses import dataclass  # noqa: E402
+from typing import TYPE_CHECKING, Any, cast  # noqa: E402
+
+from pyglossary import core, logger  # essential  # noqa: E402
+from pyglossary.langs import langDict  # noqa: E402
+
+from .argparse_main import configFromArgs, defineFlags, validateFlags  # noqa: E402
+from .base import UIBase  # noqa: E402
 
 if TYPE_CHECKING:
 	from pyglossary.config_type import ConfigType
@@ -205,6 +211,7 @@ def mainPrepare(  # noqa: PLR0911
 	from .ui_cmd import printHelp
 
 	Glossary.init()
+	startup_profile.mark("plugins_loaded")
 
 	if core.isDebug():
 		log.debug(f"en -> {langDict['en']!r}")
@@ -257,6 +257,8 @@ class UI(UIBase):
 			"maxNum",
 			"minRel",
 			"minWordLen",
+			"sqlitePath",
+			"processes",
 		):
 			try:
 				reverseKwArgs[key] = self.config["reverse_" + key]
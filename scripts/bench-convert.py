@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+r"""
+Conversion throughput benchmark.
+
+Generates a synthetic glossary (with configurable mix of HTML definitions,
+alternate terms and resource files), then runs Glossary.convert for the main
+reader/writer pairs in direct, indirect and SQLite modes.
+
+Every case runs in a separate process, and results are printed (or written
+to --output) as JSON, including entries/sec, peak RSS and time spent in each
+stage, taken from glos.stageStats (see pyglossary/stage_stats.py): read,
+filter, write, finish (writer finalization, like compressing or building
+indexes) and other (like sorting, and compressing the output).
+Stage times are exclusive: for example in direct mode, time spent by the
+reader is counted as "read" even though it is pulled by the writer.
+
+Formats whose dependencies are not installed are reported with an "error".
+
+Usage examples:
+	bench-convert.py --size 10k
+	bench-convert.py --size 1m --pairs Tabfile:Stardict,Stardict:Tabfile \
+		--modes indirect,sqlite --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from os.path import abspath, dirname, isfile, join
+from time import perf_counter as now
+from typing import TYPE_CHECKING, Any
+
+rootDir = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, rootDir)
+
+if TYPE_CHECKING:
+	from collections.abc import Iterable, Iterator
+
+	from pyglossary.stage_stats import StageStats
+
+defaultPairs = [
+	("Tabfile", "Tabfile"),
+	("Tabfile", "Stardict"),
+	("Tabfile", "Aard2Slob"),
+	("Tabfile", "Sql"),
+	("Tabfile", "Yomichan"),
+	("Stardict", "Tabfile"),
+	("Aard2Slob", "Tabfile"),
+	("ABBYYLingvoDSL", "Tabfile"),
+	("OctopusMdict", "Tabfile"),
+	("Xdxf", "Tabfile"),
+]
+
+modes = {
+	"direct": {"direct": True},
+	"indirect": {"direct": False},
+	"sqlite": {"sqlite": True},
+}
+
+extensions = {
+	"Tabfile": ".txt",
+	"Stardict": ".ifo",
+	"Aard2Slob": ".slob",
+	"Sql": ".sql",
+	"Yomichan": ".zip",
+	"ABBYYLingvoDSL": ".dsl",
+	"OctopusMdict": ".mdx",
+	"Xdxf": ".xdxf",
+}
+
+sizeSuffixes = {"k": 1000, "m": 1000_000}
+
+words = [
+	"alpha",
+	"bravo",
+	"charlie",
+	"delta",
+	"echo",
+	"foxtrot",
+	"golf",
+	"hotel",
+	"india",
+	"juliet",
+	"kilo",
+	"lima",
+	"mike",
+	"november",
+	"oscar",
+	"papa",
+	"quebec",
+	"romeo",
+	"sierra",
+	"tango",
+	"uniform",
+	"victor",
+	"whiskey",
+	"xray",
+	"yankee",
+	"zulu",
+]
+
+
+def parseSize(size: str) -> int:
+	size = size.strip().lower()
+	if size[-1] in sizeSuffixes:
+		return int(float(size[:-1]) * sizeSuffixes[size[-1]])
+	return int(size)
+
+
+# ______________________________ synthetic input ______________________________
+
+
+def iterSyntheticEntries(
+	count: int,
+	htmlRatio: float,
+	altRatio: float,
+	seed: int = 0,
+) -> Iterator[tuple[list[str], str]]:
+	"""Yield (terms, defi) sorted by term, with unique terms."""
+	rnd = random.Random(seed)
+	width = len(str(count))
+	for index in range(count):
+		term = f"{rnd.choice(words)}{index:0{width}d}"
+		terms = [term]
+		if rnd.random() < altRatio:
+			terms += [f"{term}-{rnd.choice(words)}", f"{term}s"]
+		sentence = " ".join(rnd.choice(words) for _ in range(rnd.randint(5, 40)))
+		if rnd.random() < htmlRatio:
+			defi = (
+				f"<b>{term}</b> <i>n.</i><br>{sentence}."
+				f'<br>see <a href="bword://{rnd.choice(words)}">also</a>'
+			)
+		else:
+			defi = f"{term}: {sentence}."
+		yield terms, defi
+
+
+def writeResources(resDir: str, count: int, seed: int = 0) -> None:
+	rnd = random.Random(seed)
+	os.makedirs(resDir, exist_ok=True)
+	for index in range(count):
+		with open(join(resDir, f"res{index}.bin"), "wb") as file:
+			file.write(rnd.randbytes(rnd.randint(100, 4000)))
+
+
+def writeTabfile(path: str, entries: Iterable[tuple[list[str], str]]) -> None:
+	from pyglossary.text_utils import escapeNTB, joinByBar
+
+	with open(path, "w", encoding="utf-8") as file:
+		file.write("##name\tBenchmark\n")
+		file.writelines(
+			f"{joinByBar([escapeNTB(t) for t in terms])}\t{escapeNTB(defi)}\n"
+			for terms, defi in entries
+		)
+
+
+def writeDsl(path: str, entries: Iterable[tuple[list[str], str]]) -> None:
+	with open(path, "w", encoding="utf-8") as file:
+		file.write(
+			'#NAME "Benchmark"\n'
+			'#INDEX_LANGUAGE "English"\n'
+			'#CONTENTS_LANGUAGE "English"\n\n',
+		)
+		for terms, defi in entries:
+			file.writelines(f"{term}\n" for term in terms)
+			text = defi.replace("<b>", "[b]").replace("</b>", "[/b]")
+			text = text.replace("<i>", "[i]").replace("</i>", "[/i]")
+			file.write(f"\t[m1]{text}[/m]\n\n")
+
+
+def writeXdxf(path: str, entries: Iterable[tuple[list[str], str]]) -> None:
+	from xml.sax.saxutils import escape
+
+	with open(path, "w", encoding="utf-8") as file:
+		file.write(
+			'<?xml version="1.0" encoding="UTF-8" ?>\n'
+			'<xdxf lang_from="ENG" lang_to="ENG" format="visual">\n'
+			"<full_name>Benchmark</full_name>\n"
+			"<description>Synthetic benchmark glossary</description>\n",
+		)
+		for terms, defi in entries:
+			keys = "".join(f"<k>{escape(term)}</k>" for term in terms)
+			file.write(f"<ar>{keys}\n{escape(defi)}</ar>\n")
+		file.write("</xdxf>\n")
+
+
+def writeMdx(path: str, entries: Iterable[tuple[list[str], str]]) -> None:
+	# MDX writing is not supported by pyglossary, use the builder of tests
+	sys.path.insert(0, join(rootDir, "tests"))
+	from mdict_test_utils import writeMdx as _writeMdx
+
+	items = []
+	for terms, defi in entries:
+		items.append((terms[0], defi))
+		items += [(alt, f"@@@LINK={terms[0]}") for alt in terms[1:]]
+	items.sort()
+	_writeMdx(path, items, title="Benchmark", keysPerBlock=64, recordsPerBlock=64)
+
+
+def prepareInput(
+	formatName: str,
+	workDir: str,
+	params: dict[str, Any],
+) -> str:
+	"""Create (or reuse) synthetic input file in given format, return path."""
+	from pyglossary.glossary_v2 import ConvertArgs, Glossary
+
+	path = join(workDir, f"input-{formatName}{extensions[formatName]}")
+	if formatName == "Stardict":
+		path = join(workDir, f"input-{formatName}", "input.ifo")
+	if isfile(path):
+		return path
+
+	def entries() -> Iterator[tuple[list[str], str]]:
+		return iterSyntheticEntries(
+			params["count"],
+			htmlRatio=params["htmlRatio"],
+			altRatio=params["altRatio"],
+		)
+
+	if formatName == "Tabfile":
+		writeTabfile(path, entries())
+		resCount = int(params["count"] * params["resourceRatio"])
+		if resCount:
+			writeResources(f"{path}_res", resCount)
+	elif formatName == "ABBYYLingvoDSL":
+		writeDsl(path, entries())
+	elif formatName == "Xdxf":
+		writeXdxf(path, entries())
+	elif formatName == "OctopusMdict":
+		writeMdx(path, entries())
+	else:
+		Glossary.init()
+		glos = Glossary()
+		glos.convert(
+			ConvertArgs(
+				inputFilename=prepareInput("Tabfile", workDir, params),
+				inputFormat="Tabfile",
+				outputFilename=path,
+				outputFormat=formatName,
+				direct=False,
+			),
+		)
+	return path
+
+
+# ______________________________ running a case ______________________________
+
+
+def stageTimes(stats: StageStats) -> dict[str, float]:
+	"""Sum time of counters by kind (read, filter, write, finish)."""
+	data = stats.toDict()
+	times: dict[str, float] = defaultdict(float)
+	for stage in data["stages"]:
+		times[stage["kind"]] += stage["time"]
+	times["other"] = data["total_time"] - sum(times.values())
+	return {kind: round(value, 4) for kind, value in times.items()}
+
+
+def runCase(case: dict[str, Any]) -> dict[str, Any]:
+	from pyglossary.glossary_v2 import ConvertArgs, Glossary
+
+	Glossary.init()
+	glos = Glossary()
+	glos.config = {"stage_stats": True}
+	t0 = now()
+	glos.convert(
+		ConvertArgs(
+			inputFilename=case["inputFilename"],
+			inputFormat=case["inputFormat"],
+			outputFilename=case["outputFilename"],
+			outputFormat=case["outputFormat"],
+			**modes[case["mode"]],
+		),
+	)
+	seconds = now() - t0
+	stats = glos.stageStats
+	assert stats is not None
+	entryCount = max(
+		(c.count for c in stats.counters if c.kind == "write"),
+		default=0,
+	)
+	return {
+		"entries": entryCount,
+		"seconds": round(seconds, 4),
+		"entriesPerSec": round(entryCount / seconds, 1) if seconds else None,
+		"peakRssKiB": peakRssKiB(),
+		"stages": stageTimes(stats),
+	}
+
+
+def peakRssKiB() -> int | None:
+	try:
+		import resource
+	except ImportError:  # Windows
+		return None
+	maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	if sys.platform == "darwin":
+		return maxrss // 1024
+	return maxrss
+
+
+def runCaseInSubprocess(case: dict[str, Any]) -> dict[str, Any]:
+	proc = subprocess.run(
+		[sys.executable, abspath(__file__), "--run-case", json.dumps(case)],
+		capture_output=True,
+		text=True,
+		check=False,
+	)
+	if proc.returncode != 0:
+		lines = proc.stderr.strip().split("\n")
+		return {"error": lines[-1] if lines else f"exit code {proc.returncode}"}
+	return json.loads(proc.stdout.strip().split("\n")[-1])
+
+
+# ______________________________ main ______________________________
+
+
+def parseArgs() -> argparse.Namespace:
+	parser = argparse.ArgumentParser(
+		description="Benchmark glossary conversion throughput",
+	)
+	parser.add_argument(
+		"--size",
+		default="10k",
+		help="number of entries, like 10k, 1m, 10m or 5000 (default: 10k)",
+	)
+	parser.add_argument("--html-ratio", type=float, default=0.5)
+	parser.add_argument("--alt-ratio", type=float, default=0.3)
+	parser.add_argument(
+		"--resource-ratio",
+		type=float,
+		default=0.01,
+		help="number of resource files relative to entries (default: 0.01)",
+	)
+	parser.add_argument(
+		"--pairs",
+		default="",
+		help="comma-separated InputFormat:OutputFormat pairs (default: all)",
+	)
+	parser.add_argument(
+		"--modes",
+		default=",".join(modes),
+		help="comma-separated modes: direct, indirect, sqlite (default: all)",
+	)
+	parser.add_argument("--repeat", type=int, default=1)
+	parser.add_argument("--workdir", default="", help="keep input files here")
+	parser.add_argument("--output", default="", help="write JSON to this file")
+	parser.add_argument("--run-case", default="", help=argparse.SUPPRESS)
+	return parser.parse_args()
+
+
+def main() -> None:
+	from pyglossary.core import log
+
+	args = parseArgs()
+	log.setVerbosity(2)  # warnings and errors
+
+	if args.run_case:
+		print(json.dumps(runCase(json.loads(args.run_case))))
+		return
+
+	params = {
+		"count": parseSize(args.size),
+		"htmlRatio": args.html_ratio,
+		"altRatio": args.alt_ratio,
+		"resourceRatio": args.resource_ratio,
+	}
+	pairs = defaultPairs
+	if args.pairs:
+		pairs = [tuple(pair.split(":")) for pair in args.pairs.split(",")]  # type: ignore
+	modeNames = [mode for mode in args.modes.split(",") if mode]
+	for mode in modeNames:
+		if mode not in modes:
+			raise SystemExit(f"invalid mode {mode!r}")
+
+	workDir = args.workdir or tempfile.mkdtemp(prefix="pyglossary-bench-")
+	os.makedirs(workDir, exist_ok=True)
+	results = []
+	try:
+		for inputFormat, outputFormat in pairs:
+			try:
+				inputFilename = prepareInput(inputFormat, workDir, params)
+			except Exception as e:
+				result = {
+					"input": inputFormat,
+					"output": outputFormat,
+					"error": f"preparing input: {e}",
+				}
+				results.append(result)
+				print(json.dumps(result), file=sys.stderr)
+				continue
+			for mode in modeNames:
+				for run in range(args.repeat):
+					outDir = tempfile.mkdtemp(dir=workDir, prefix="out-")
+					case = {
+						"inputFilename": inputFilename,
+						"inputFormat": inputFormat,
+						"outputFilename": join(
+							outDir,
+							f"output{extensions[outputFormat]}",
+						),
+						"outputFormat": outputFormat,
+						"mode": mode,
+					}
+					result = {
+						"input": inputFormat,
+						"output": outputFormat,
+						"mode": mode,
+						"run": run,
+					} | runCaseInSubprocess(case)
+					shutil.rmtree(outDir, ignore_errors=True)
+					results.append(result)
+					print(json.dumps(result), file=sys.stderr)
+	finally:
+		if not args.workdir:
+			shutil.rmtree(workDir, ignore_errors=True)
+
+	report = {
+		"python": platform.python_version(),
+		"platform": platform.platform(),
+		"params": params,
+		"results": results,
+	}
+	text = json.dumps(report, indent="\t")
+	if args.output:
+		with open(args.output, "w", encoding="utf-8") as file:
+			file.write(text + "\n")
+	else:
+		print(text)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark SqEntryList.append (SQLite mode) and print entries/sec.
+
+Compares the old path (one INSERT per entry, SQLite defaults for all
+PRAGMAs: journal_mode, synchronous, page_size, cache_size and temp_store)
+with the buffered executemany path and tuned PRAGMAs.
+
+Usage: bench-sq-entry-list.py [ENTRY_COUNT] [BATCH_SIZE]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from os.path import abspath, dirname, join
+from time import perf_counter as now
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from pyglossary.entry import Entry
+from pyglossary.sort_keys import lookupSortKey
+from pyglossary.sq_entry_list import SqEntryList, defaultBatchSize
+
+
+def entryToRaw(entry: Entry) -> list[bytes]:
+	return [b"", entry.b_defi] + entry.lb_term
+
+
+def entryFromRaw(rawEntry: list[bytes]) -> Entry:
+	return Entry(
+		[b.decode("utf-8") for b in rawEntry[2:]],
+		rawEntry[1].decode("utf-8"),
+	)
+
+
+class LegacySqEntryList(SqEntryList):
+	"""SqEntryList that keeps SQLite defaults for all PRAGMAs."""
+
+	def _setTempDatabasePragmas(self) -> None:
+		pass
+
+
+def run(database: str, count: int, batchSize: int, legacy: bool) -> float:
+	cls = LegacySqEntryList if legacy else SqEntryList
+	entryList = cls(
+		entryToRaw=entryToRaw,
+		entryFromRaw=entryFromRaw,
+		database=database,
+		create=True,
+		batchSize=batchSize,
+	)
+	entryList.setSortKey(
+		namedSortKey=lookupSortKey("stardict"),
+		sortEncoding="utf-8",
+		writeOptions={},
+	)
+	t0 = now()
+	for i in range(count):
+		term = f"word{count - i}"
+		entryList.append(
+			Entry(
+				[term, f"alt{i}"],
+				f"<b>{term}</b> definition number {i} " * 3,
+				defiFormat="h",
+			),
+		)
+	entryList.sort()
+	elapsed = now() - t0
+	entryList.close()
+	os.remove(database)
+	return elapsed
+
+
+def main() -> None:
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+	batchSize = int(sys.argv[2]) if len(sys.argv) > 2 else defaultBatchSize
+	with tempfile.TemporaryDirectory() as tmpDir:
+		database = join(tmpDir, "bench.db")
+		for title, size, legacy in (
+			("old (unbuffered)", 1, True),
+			(f"batchSize={batchSize}", batchSize, False),
+		):
+			elapsed = run(database, count, size, legacy)
+			print(
+				f"{title:20s} {count} entries in {elapsed:.2f} s"
+				f", {count / elapsed:,.0f} entries/sec",
+			)
+
+
+if __name__ == "__main__":
+	main()
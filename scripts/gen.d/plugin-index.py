@@ -4,13 +4,11 @@ import json
 import sys
 from os.path import abspath, dirname, join
 from pathlib import Path
-from typing import Any
 
 rootDir = dirname(dirname(dirname(abspath(__file__))))
 sys.path.insert(0, rootDir)
 
 from pyglossary.core import userPluginsDir
-from pyglossary.flags import DEFAULT_NO
 from pyglossary.glossary import Glossary
 
 Glossary.init(
@@ -23,39 +21,7 @@ plugins = [
 	p for p in Glossary.plugins.values() if userPluginsDirPath not in p.path.parents
 ]
 
-data = []
-for p in plugins:
-	canRead = p.canRead
-	canWrite = p.canWrite
-	item: dict[str, Any] = {
-		"module": p.module.__name__,
-		"lname": p.lname,
-		"name": p.name,
-		"description": p.description,
-		"extensions": p.extensions,
-		"singleFile": p.singleFile,
-		"optionsProp": {name: opt.toDict() for name, opt in p.optionsProp.items()},
-		"canRead": canRead,
-		"canWrite": canWrite,
-	}
-	if p.sortOnWrite != DEFAULT_NO:
-		item["sortOnWrite"] = p.sortOnWrite
-	if p.sortKeyName:
-		item["sortKeyName"] = p.sortKeyName
-	if canRead:
-		item["readOptions"] = p.getReadOptions()
-	if canWrite:
-		item["writeOptions"] = p.getWriteOptions()
-	if not p.enable:
-		item["enable"] = False
-	if p.readDepends:
-		item["readDepends"] = p.readDepends
-	if p.writeDepends:
-		item["writeDepends"] = p.writeDepends
-	if p.readCompressions:
-		item["readCompressions"] = p.readCompressions
-
-	data.append(item)
+data = [p.toDict() for p in plugins]
 
 
 jsonText = json.dumps(
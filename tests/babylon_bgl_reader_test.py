@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import gzip
+import shutil
+import sys
+import tempfile
+import unittest
+from os.path import abspath, dirname, join
+
+rootDir = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, rootDir)
+
+from pyglossary.glossary_v2 import Glossary
+from pyglossary.plugins.babylon_bgl import reader_io
+from pyglossary.plugins.babylon_bgl.reader import Reader
+from pyglossary.plugins.babylon_bgl.writer import (
+	_pack_block,
+	_pack_entry_type1,
+	_pack_entry_type11,
+	_pack_type2,
+	_pack_type3,
+)
+
+
+def _info(code: int, value: bytes) -> bytes:
+	return _pack_block(3, _pack_type3(code, value))
+
+
+class TestBglReader(unittest.TestCase):
+	def setUp(self):
+		self.tmpDir = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpDir, ignore_errors=True)
+
+	def writeBgl(self, data: bytes, truncate: int = 0) -> str:
+		gzData = gzip.compress(data, mtime=0)
+		if truncate:
+			gzData = gzData[:-truncate]
+		path = join(self.tmpDir, "test.bgl")
+		with open(path, "wb") as file:
+			file.write(b"\x12\x34\x00\x01\x00\x40" + b"\x00" * 58 + gzData)
+		return path
+
+	@staticmethod
+	def header(numEntries: int = 0) -> bytes:
+		parts = [
+			_pack_block(0, b"\x08\x42"),
+			_info(0x01, b"Test"),
+			_info(0x11, (0x8000).to_bytes(4, "big")),
+		]
+		if numEntries:
+			parts.append(_info(0x0C, numEntries.to_bytes(4, "big")))
+		return b"".join(parts)
+
+	def read(self, path: str) -> tuple[Glossary, Reader, list]:
+		glos = Glossary()
+		reader = Reader(glos)
+		reader.open(path)
+		self.addCleanup(reader.close)
+		return glos, reader, list(reader)
+
+	def test_single_pass(self):
+		longDefi = " ".join(["long définition"] * 5000)
+		data = b"".join(
+			[
+				self.header(numEntries=3),
+				_pack_block(1, _pack_entry_type1(b"a", b"defi a", [b"a2"])),
+				_pack_block(
+					11,
+					_pack_entry_type11(b"b", longDefi.encode("utf-8"), [b"b2"]),
+				),
+				_info(0x02, b"Author Name"),
+				_pack_block(1, _pack_entry_type1(b"c", b"defi c", [])),
+				_pack_block(2, _pack_type2("img.png", b"PNG")),
+			],
+		)
+		bufferSize = reader_io.readBufferSize
+		reader_io.readBufferSize = 16
+		try:
+			glos, reader, entries = self.read(self.writeBgl(data))
+		finally:
+			reader_io.readBufferSize = bufferSize
+		self.assertEqual(len(reader), 3)
+		self.assertEqual(glos.getInfo("name"), "Test")
+		self.assertEqual(glos.getInfo("author"), "Author Name")
+		self.assertEqual(
+			[(entry.l_term, entry.isData()) for entry in entries],
+			[
+				(["a", "a2"], False),
+				(["b", "b2"], False),
+				(["c"], False),
+				(["img.png"], True),
+			],
+		)
+		self.assertEqual(entries[1].defi, longDefi)
+		self.assertEqual(entries[3].data, b"PNG")
+		self.assertEqual(reader.numEntries, 3)
+		self.assertEqual(reader.numResources, 1)
+
+	def test_byte_progress(self):
+		data = self.header() + b"".join(
+			_pack_block(1, _pack_entry_type1(f"w{i}".encode(), b"defi", []))
+			for i in range(100)
+		)
+		_, reader, entries = self.read(self.writeBgl(data))
+		self.assertEqual(len(reader), 0)
+		self.assertEqual(len(entries), 100)
+		for entry in entries:
+			self.assertIsNotNone(entry.byteProgress())
+
+	def test_truncated(self):
+		data = self.header() + b"".join(
+			_pack_block(1, _pack_entry_type1(f"w{i}".encode(), f"{i}".encode(), []))
+			for i in range(1000)
+		)
+		with self.assertLogs("pyglossary", level="ERROR"):
+			_, _, entries = self.read(self.writeBgl(data, truncate=100))
+		self.assertGreater(len(entries), 0)
+		self.assertLess(len(entries), 1000)
+		self.assertEqual(
+			[entry.l_term[0] for entry in entries],
+			[f"w{i}" for i in range(len(entries))],
+		)
+
+
+if __name__ == "__main__":
+	unittest.main()
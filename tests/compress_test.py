@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from os.path import abspath, dirname, getsize, join
+
+rootDir = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, rootDir)
+
+from pyglossary.compress import compressionOpen, progressSize
+
+
+class TestProgressSize(unittest.TestCase):
+	def setUp(self):
+		self.tmpDir = tempfile.mkdtemp()
+		self.data = "".join(f"word{i}\tdéfinition {i}\n" for i in range(20000)).encode(
+			"utf-8",
+		)
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpDir, ignore_errors=True)
+
+	def writeFile(self, fname, openFunc=open, data=None, **kwargs):
+		path = join(self.tmpDir, fname)
+		with openFunc(path, "wb", **kwargs) as file:
+			file.write(self.data if data is None else data)
+		return path
+
+	def check(self, path, size, uncompressed):
+		for mode in ("rb", "rt"):
+			with compressionOpen(path, mode=mode) as cfile:
+				progress = progressSize(cfile)
+				self.assertEqual(progress.size, size)
+				self.assertEqual(progress.uncompressed, uncompressed)
+				# file is not read or moved
+				firstLine = cfile.readline()
+				if isinstance(firstLine, bytes):
+					firstLine = firstLine.decode("utf-8")
+				self.assertEqual(firstLine, "word0\tdéfinition 0\n")
+				if not uncompressed:
+					assert progress.rawTell is not None
+					for _ in cfile:
+						pass
+					self.assertEqual(progress.rawTell(), size)
+
+	def test_plain(self):
+		self.check(self.writeFile("a.txt"), len(self.data), True)
+
+	def test_gzip(self):
+		self.check(self.writeFile("a.txt.gz", gzip.open), len(self.data), True)
+
+	def test_gzip_multi_member(self):
+		path = self.writeFile("a.txt.gz", gzip.open)
+		with open(path, "ab") as file:
+			file.write(gzip.compress(b"end\n"))
+		self.check(path, getsize(path), False)
+
+	def test_gzip_large(self):
+		# ISIZE of a file this large may have wrapped around, so it is not
+		# trusted even if it is larger than compressed size
+		path = join(self.tmpDir, "large.txt.gz")
+		data = self.data + os.urandom(2**32 // 1032)
+		with gzip.open(path, "wb", compresslevel=1) as file:
+			file.write(data)
+		with open(path, "r+b") as file:
+			file.seek(-4, 2)
+			file.write((3 * 2**30).to_bytes(4, "little"))
+		with compressionOpen(path, mode="rb") as cfile:
+			progress = progressSize(cfile)
+			self.assertEqual(progress.size, getsize(path))
+			self.assertFalse(progress.uncompressed)
+			self.assertEqual(cfile.readline(), b"word0\td\xc3\xa9finition 0\n")
+
+	def test_xz(self):
+		self.check(self.writeFile("a.txt.lzma", lzma.open), len(self.data), True)
+
+	def test_lzma_alone(self):
+		path = self.writeFile("a.txt.lzma", lzma.open, format=lzma.FORMAT_ALONE)
+		self.check(path, getsize(path), False)
+
+	def test_bz2(self):
+		path = self.writeFile("a.txt.bz2", bz2.open)
+		self.check(path, getsize(path), False)
+
+
+if __name__ == "__main__":
+	unittest.main()
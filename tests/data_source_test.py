@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+from os.path import abspath, dirname, join
+
+rootDir = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, rootDir)
+
+from pyglossary.data_source import FileDataSource, ZipDataSource, copyFileRange
+from pyglossary.entry import DataEntry
+from pyglossary.glossary_v2 import ConvertArgs, Glossary
+
+
+class TestDataSource(unittest.TestCase):
+	def setUp(self):
+		self.tmpDir = tempfile.mkdtemp()
+		self.data = os.urandom(300_000) + b"abc" * 100_000
+		self.path = join(self.tmpDir, "file.bin")
+		with open(self.path, "wb") as file:
+			file.write(self.data)
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpDir, ignore_errors=True)
+
+	def readFile(self, fpath):
+		with open(fpath, "rb") as file:
+			return file.read()
+
+	def test_copyFileRange(self):
+		toPath = join(self.tmpDir, "out.bin")
+		with open(self.path, "rb") as fromFile, open(toPath, "wb") as toFile:
+			toFile.write(b"head")
+			copyFileRange(fromFile, toFile, 1000, 250_000)
+			toFile.write(b"tail")
+		self.assertEqual(
+			self.readFile(toPath),
+			b"head" + self.data[1000:251_000] + b"tail",
+		)
+
+	def test_file_whole(self):
+		source = FileDataSource(self.path)
+		self.assertEqual(source.size(), len(self.data))
+		self.assertEqual(source.read(), self.data)
+		toPath = join(self.tmpDir, "out.bin")
+		source.copyTo(toPath)
+		self.assertEqual(self.readFile(toPath), self.data)
+
+	def test_file_hardlink(self):
+		source = FileDataSource(self.path)
+		toPath = join(self.tmpDir, "out.bin")
+		source.copyTo(toPath, hardLink=True)
+		self.assertEqual(self.readFile(toPath), self.data)
+		self.assertTrue(os.path.samefile(toPath, self.path))
+
+	def test_file_range(self):
+		source = FileDataSource(self.path, offset=12345, size=200_000)
+		expected = self.data[12345:212_345]
+		self.assertEqual(source.size(), 200_000)
+		self.assertEqual(source.read(), expected)
+		with source.open() as file:
+			self.assertEqual(file.read(10), expected[:10])
+			self.assertEqual(file.read(), expected[10:])
+		toPath = join(self.tmpDir, "out.bin")
+		source.copyTo(toPath, hardLink=True)
+		self.assertEqual(self.readFile(toPath), expected)
+		self.assertFalse(os.path.samefile(toPath, self.path))
+
+	def test_zip(self):
+		zipPath = join(self.tmpDir, "res.zip")
+		with zipfile.ZipFile(zipPath, "w") as zf:
+			zf.writestr("stored.bin", self.data, compress_type=zipfile.ZIP_STORED)
+			zf.writestr("dir/deflated.bin", self.data, zipfile.ZIP_DEFLATED)
+			zf.writestr("empty.txt", b"", zipfile.ZIP_DEFLATED)
+		with zipfile.ZipFile(zipPath) as zf:
+			infoList = zf.infolist()
+		for info in infoList:
+			source = ZipDataSource(zipPath, info)
+			expected = b"" if info.filename == "empty.txt" else self.data
+			self.assertEqual(source.size(), len(expected))
+			self.assertEqual(source.read(), expected, info.filename)
+			toPath = join(self.tmpDir, "out.bin")
+			source.copyTo(toPath)
+			self.assertEqual(self.readFile(toPath), expected, info.filename)
+
+	def test_data_entry(self):
+		entry = DataEntry("res/file.bin", source=FileDataSource(self.path))
+		self.assertEqual(entry.size(), len(self.data))
+		self.assertEqual(entry.data, self.data)
+		with entry.open() as file:
+			self.assertEqual(file.read(), self.data)
+		outDir = join(self.tmpDir, "out")
+		fpath = entry.save(outDir)
+		self.assertEqual(fpath, join(outDir, "res", "file.bin"))
+		self.assertEqual(self.readFile(fpath), self.data)
+		# source file is not moved
+		self.assertEqual(self.readFile(self.path), self.data)
+
+	def convertWithResource(self, direct: bool) -> None:
+		inputPath = join(self.tmpDir, "input.txt")
+		with open(inputPath, "w", encoding="utf-8") as file:
+			file.write("apple\tfruit\n")
+		os.makedirs(inputPath + "_res")
+		resPath = join(inputPath + "_res", "file.bin")
+		shutil.copy(self.path, resPath)
+		outputPath = join(self.tmpDir, "output.txt")
+		Glossary.init()
+		glos = Glossary()
+		glos.convert(
+			ConvertArgs(
+				inputFilename=inputPath,
+				outputFilename=outputPath,
+				outputFormat="Tabfile",
+				direct=direct,
+			),
+		)
+		outResPath = join(outputPath + "_res", "file.bin")
+		self.assertEqual(self.readFile(outResPath), self.data)
+		# output must not be a hard link to input, and the temp link
+		# (in indirect mode) must be removed
+		self.assertFalse(os.path.samefile(outResPath, resPath))
+		self.assertEqual(os.stat(resPath).st_nlink, 1)
+		self.assertEqual(self.readFile(resPath), self.data)
+
+	def test_convert_resource_direct(self):
+		self.convertWithResource(direct=True)
+
+	def test_convert_resource_indirect(self):
+		self.convertWithResource(direct=False)
+
+	def test_data_entry_save_tmp_link(self):
+		entry = DataEntry("file.bin", source=FileDataSource(self.path))
+		tmpPath = entry.save(join(self.tmpDir, "tmp"), hardLink=True)
+		self.assertTrue(os.path.samefile(tmpPath, self.path))
+		fpath = DataEntry("file.bin", tmpPath=tmpPath).save(join(self.tmpDir, "out"))
+		self.assertFalse(os.path.samefile(fpath, self.path))
+		self.assertFalse(os.path.exists(tmpPath))
+		self.assertEqual(os.stat(self.path).st_nlink, 1)
+		self.assertEqual(self.readFile(fpath), self.data)
+
+	def test_data_entry_bytes_open(self):
+		entry = DataEntry("a.txt", b"abc")
+		with entry.open() as file:
+			self.assertEqual(file.read(), b"abc")
+
+
+if __name__ == "__main__":
+	unittest.main()
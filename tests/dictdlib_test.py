@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from os.path import abspath, dirname, join
+
+rootDir = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, rootDir)
+
+from pyglossary.dictzip import compressFile
+from pyglossary.plugin_lib import dictdlib
+from pyglossary.plugin_lib.dictdlib import DictDB, DictLookup
+
+
+def _oldSortNormalize(inp: str) -> str:
+	st2 = "".join(char for char in inp if char in dictdlib.validdict)
+	return st2.upper() + "\0" + inp.upper()
+
+
+class TestDictDB(unittest.TestCase):
+	def setUp(self):
+		self.tmpDir = tempfile.mkdtemp()
+		rand = random.Random(7)
+		alphabet = "abcXYZ -'.éßİ09ﬃ"
+		self.entries = []
+		for i in range(2000):
+			word = "".join(rand.choice(alphabet) for _ in range(rand.randint(1, 8)))
+			self.entries.append((f"defi {i}", [word, word.upper()]))
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpDir, ignore_errors=True)
+
+	def write(self, name: str) -> list[str]:
+		basename = join(self.tmpDir, name)
+		db = DictDB(basename, "write", 1)
+		for defi, words in self.entries:
+			db.addEntry(defi, words)
+		db.finish()
+		with open(basename + ".index", encoding="utf-8") as file:
+			return file.read().split("\n")[:-1]
+
+	def test_sortNormalize(self):
+		for _, words in self.entries:
+			for word in words:
+				self.assertEqual(
+					dictdlib.sortNormalize(word),
+					_oldSortNormalize(word),
+				)
+
+	def test_sorted_index(self):
+		lines = self.write("a")
+		self.assertEqual(len(lines), 4000)
+		self.assertEqual(
+			lines,
+			sorted(lines, key=lambda line: (_oldSortNormalize(line), line)),
+		)
+
+		db = DictDB(join(self.tmpDir, "a"), "read", 1)
+		self.addCleanup(db.close)
+		for defi, words in self.entries[:100]:
+			for word in words:
+				self.assertIn((defi + "\n").encode("utf-8"), db.getDef(word))
+
+	def test_external_sort(self):
+		expected = self.write("a")
+		maxSize = dictdlib.maxSortBufferSize
+		dictdlib.maxSortBufferSize = 5000
+		try:
+			lines = self.write("b")
+		finally:
+			dictdlib.maxSortBufferSize = maxSize
+		self.assertEqual(lines, expected)
+
+	def test_b64(self):
+		for value in (0, 1, 63, 64, 4095, 4096, 123456789, 2**36 - 1):
+			self.assertEqual(
+				dictdlib.b64_decode(dictdlib.b64_encode(value)),
+				value,
+			)
+		self.assertEqual(dictdlib.b64_encode(0), "A")
+		self.assertEqual(dictdlib.b64_encode(64), "BA")
+
+
+class TestDictLookup(unittest.TestCase):
+	def setUp(self):
+		self.tmpDir = tempfile.mkdtemp()
+		self.basename = join(self.tmpDir, "test")
+		rand = random.Random(3)
+		db = DictDB(self.basename, "write", 1)
+		self.defis: dict[str, set[str]] = {}
+		words = ["apple", "Apple", "app-le", "apply", "banana", "b"]
+		# headwords without ASCII letters or digits have the same index key
+		words += ["".join(rand.choice("αβγδ") for _ in range(5)) for _ in range(300)]
+		for i, word in enumerate(words):
+			defi = f"defi {i} of {word}"
+			db.addEntry(defi, [word])
+			self.defis.setdefault(word, set()).add(defi + "\n")
+		db.addEntry("shared", ["apple", "banana"])
+		self.defis["apple"].add("shared\n")
+		self.defis["banana"].add("shared\n")
+		db.finish()
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpDir, ignore_errors=True)
+
+	def check(self, lookup: DictLookup):
+		for word, defis in self.defis.items():
+			self.assertEqual(set(lookup.lookup(word)), defis, msg=word)
+		self.assertEqual(lookup.lookup("missing"), [])
+		self.assertEqual(
+			{entry.word for entry in lookup.match("APPLE", "normalized")},
+			{"apple", "Apple", "app-le"},
+		)
+		self.assertEqual(
+			{entry.word for entry in lookup.match("ap", "prefix")},
+			{"apple", "Apple", "app-le", "apply"},
+		)
+		self.assertEqual(len(lookup.match("ap", "prefix", limit=2)), 2)
+		words = [*self.defis, "missing", "apple"]
+		self.assertEqual(
+			lookup.lookupMany(words),
+			{word: lookup.lookup(word) for word in words},
+		)
+		with self.assertRaises(ValueError):
+			lookup.match("a", "regexp")
+		with self.assertRaises(ValueError):
+			lookup.match("αβ", "prefix")
+		with self.assertRaises(ValueError):
+			lookup.match("", "prefix", limit=10)
+
+	def test_dict(self):
+		with DictLookup(self.basename + ".index") as lookup:
+			self.check(lookup)
+
+	def test_dictzip(self):
+		compressFile(self.basename + ".dict")
+		with DictLookup(self.basename, cacheSize=2) as lookup:
+			self.check(lookup)
+		db = DictDB(self.basename, "read", 1)
+		self.addCleanup(db.close)
+		self.assertEqual(
+			{defi.decode("utf-8") for defi in db.getDef("apple")},
+			self.defis["apple"],
+		)
+
+	def test_large_group(self):
+		maxSize = dictdlib.maxGroupScanSize
+		dictdlib.maxGroupScanSize = 100
+		try:
+			with DictLookup(self.basename) as lookup:
+				self.check(lookup)
+				self.assertTrue(lookup._groups)
+		finally:
+			dictdlib.maxGroupScanSize = maxSize
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -1,10 +1,16 @@
 import gzip
 import logging
+import random
+import struct
 import unittest
+import unittest.mock
+import zlib
 from pathlib import Path
 
 from glossary_v2_errors_test import TestGlossaryErrorsBase
 
+from pyglossary import dictzip
+from pyglossary.dictzip import DictzipReader, DictzipWriter, chunkSize, openDictzip
 from pyglossary.os_utils import runDictzip
 
 TEXT = """
@@ -26,6 +32,91 @@ class TestDictzip(TestGlossaryErrorsBase):
 		with open(self.test_file_path, "a", encoding="utf-8") as tmp_file:
 			tmp_file.write(TEXT)
 
+	def test_native_compressed_matches(self) -> None:
+		runDictzip(self.test_file_path)
+		self.assertFalse(self.test_file_path.exists())
+		with gzip.open(self.result_file_path, "r") as file:
+			result = file.read().decode()
+		self.assertEqual(result, TEXT)
+
+	def test_native_missing_target(self) -> None:
+		filename = "/NOT_EXISTED_PATH/file.txt"
+		expected = f"No such file or directory: '{filename}'"
+		runDictzip(filename)
+		err = self.mockLog.popLog(logging.ERROR, expected, partial=True)
+		self.assertIsNotNone(err)
+
+	def test_writer_chunks(self) -> None:
+		rand = random.Random(1)
+		data = b"".join(
+			rand.choice([b"lorem ", b"ipsum ", bytes([rand.randrange(256)])])
+			for _ in range(100000)
+		)
+		with DictzipWriter(str(self.result_file_path), origName="test") as file:
+			file.write(data[:1000])
+			file.write(data[1000:])
+			self.assertEqual(file.tell(), len(data))
+
+		with gzip.open(self.result_file_path, "r") as file:
+			self.assertEqual(file.read(), data)
+
+		with open(self.result_file_path, "rb") as file:
+			raw = file.read()
+		(extraLen,) = struct.unpack("<H", raw[10:12])
+		self.assertEqual(raw[12:14], b"RA")
+		version, chunkLen, chunkCount = struct.unpack("<HHH", raw[16:22])
+		self.assertEqual(version, 1)
+		self.assertEqual(chunkLen, chunkSize)
+		self.assertEqual(chunkCount, len(data) // chunkSize + 1)
+		sizes = struct.unpack(f"<{chunkCount}H", raw[22 : 22 + 2 * chunkCount])
+		offset = 12 + extraLen + len(b"test\x00")
+		# every chunk can be decompressed on its own
+		for index, size in enumerate(sizes):
+			chunk = zlib.decompressobj(-zlib.MAX_WBITS).decompress(
+				raw[offset : offset + size],
+			)
+			self.assertEqual(chunk, data[index * chunkLen : (index + 1) * chunkLen])
+			offset += size
+
+	def test_reader_random_access(self) -> None:
+		rand = random.Random(2)
+		data = bytes(rand.randrange(32, 127) for _ in range(chunkSize * 5 + 123))
+		with DictzipWriter(str(self.result_file_path)) as file:
+			file.write(data)
+
+		with openDictzip(str(self.result_file_path)) as file:
+			self.assertIsInstance(file, DictzipReader)
+			self.assertEqual(len(file), len(data))
+			for _ in range(100):
+				pos = rand.randrange(len(data) + 1)
+				size = rand.randrange(chunkSize * 2)
+				file.seek(pos)
+				self.assertEqual(file.read(size), data[pos : pos + size])
+				self.assertEqual(file.tell(), min(pos + size, len(data)))
+			file.seek(-10, 2)
+			self.assertEqual(file.read(), data[-10:])
+
+	def test_reader_multi_member(self) -> None:
+		data = bytes(range(256)) * 1000
+		with unittest.mock.patch.object(dictzip, "maxMemberChunks", 2):
+			with DictzipWriter(str(self.result_file_path)) as file:
+				file.write(data)
+		with gzip.open(self.result_file_path, "r") as file:
+			self.assertEqual(file.read(), data)
+		with DictzipReader(str(self.result_file_path)) as file:
+			file.seek(chunkSize * 3 - 5)
+			self.assertEqual(file.read(10), data[chunkSize * 3 - 5 : chunkSize * 3 + 5])
+			file.seek(0)
+			self.assertEqual(file.read(), data)
+
+	def test_open_plain_gzip(self) -> None:
+		with gzip.open(self.result_file_path, "wb") as file:
+			file.write(TEXT.encode("utf-8"))
+		with openDictzip(str(self.result_file_path)) as file:
+			self.assertNotIsInstance(file, DictzipReader)
+			file.seek(10)
+			self.assertEqual(file.read(20), TEXT.encode("utf-8")[10:30])
+
 	def test_idzip_compressed_exists(self) -> None:
 		method = "idzip"
 		runDictzip(self.test_file_path, method)
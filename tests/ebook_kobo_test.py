@@ -1,6 +1,10 @@
+import gzip
+import os
+import shutil
 import sys
+import tempfile
 import unittest
-from os.path import abspath, dirname
+from os.path import abspath, dirname, join
 
 rootDir = dirname(dirname(abspath(__file__)))
 sys.path.insert(0, rootDir)
@@ -125,5 +129,61 @@ class GetPrefixTest(unittest.TestCase):
 		self.case("\x00xy", "11")
 
 
+class WriteGroupsTest(unittest.TestCase):
+	def setUp(self):
+		self.tmpDir = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpDir, ignore_errors=True)
+
+	def writeGroups(self, sqlite):
+		glos = Glossary()
+		glos.setInfo("name", "test")
+		w = Writer(glos)
+		w._sqlite = sqlite
+		outDir = join(self.tmpDir, f"out-{sqlite}")
+		os.makedirs(outDir)
+		cwd = os.getcwd()
+		os.chdir(outDir)
+		try:
+			gen = w.write_groups()
+			next(gen)
+			for i in range(300):
+				term = "abcdefg"[i % 7] + f"x{i}"
+				gen.send(glos.newEntry([term, f"Alt{i}"], f"defi {i}"))
+			gen.send(glos.newDataEntry("a.png", b"abc"))
+			with self.assertRaises(StopIteration):
+				gen.send(None)
+		finally:
+			os.chdir(cwd)
+		assert w._store is not None
+		terms = list(w._store.iterTerms())
+		w._closeStore()
+		if sqlite:
+			self.assertFalse(os.path.isfile(join(glos.tmpDataDir, "kobo.db")))
+		groups = {}
+		for fname in os.listdir(outDir):
+			with gzip.open(join(outDir, fname)) as file:
+				groups[fname] = file.read().decode("utf-8")
+		return groups, terms
+
+	def test_sqlite_same_as_memory(self):
+		memGroups, memTerms = self.writeGroups(False)
+		sqGroups, sqTerms = self.writeGroups(True)
+		self.assertEqual(sqGroups, memGroups)
+		self.assertEqual(sqTerms, memTerms)
+		self.assertEqual(len(memTerms), 600)
+		self.assertEqual(
+			sorted(memGroups),
+			["al.html"] + [f"{c}x.html" for c in "abcdefg"],
+		)
+		self.assertTrue(memGroups["dx.html"].endswith("</html>"))
+		self.assertIn(
+			'<w><a name="dx3" /><div><b>dx3</b><var></var><br/>defi 3</div></w>\n',
+			memGroups["dx.html"],
+		)
+		self.assertIn('<w><a name="dx3, Alt3" />', memGroups["al.html"])
+
+
 if __name__ == "__main__":
 	unittest.main()
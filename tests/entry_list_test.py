@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from os.path import abspath, dirname
+
+rootDir = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, rootDir)
+
+from pyglossary.entry import DataEntry, Entry
+from pyglossary.entry_list import EntryList
+from pyglossary.glossary_v2 import Glossary
+from pyglossary.sort_keys import lookupSortKey
+
+
+class TestEntryList(unittest.TestCase):
+	def newList(self) -> EntryList:
+		glos = Glossary()
+		self.addCleanup(glos.cleanup)
+		entryList = EntryList(
+			entryToRaw=glos._entryToRaw,
+			entryFromRaw=glos._entryFromRaw,
+		)
+		entryList.setSortKey(
+			namedSortKey=lookupSortKey("headword_lower"),
+			sortEncoding="utf-8",
+			writeOptions={},
+		)
+		return entryList
+
+	def test_append_iter(self):
+		entryList = self.newList()
+		entryList.append(Entry(["b", "bè"], "défi b", defiFormat="h"))
+		entryList.append(Entry(["a"], ""))
+		entryList.append(Entry(["c", "", "c2"], "defi c\x00"))
+		self.assertEqual(len(entryList), 3)
+		entries = list(entryList)
+		self.assertEqual(
+			[(e.l_term, e.defi, e.defiFormat) for e in entries],
+			[
+				(["b", "bè"], "défi b", "h"),
+				(["a"], "", "m"),
+				(["c", "", "c2"], "defi c\x00", "m"),
+			],
+		)
+
+	def test_sort(self):
+		entryList = self.newList()
+		terms = [f"word{i:05d}" for i in range(100)]
+		for term in reversed(terms):
+			entryList.append(Entry([term, term.upper()], f"defi of {term}"))
+		# equal keys keep their order
+		entryList.append(Entry(["Word00050"], "second"))
+		entryList.sort()
+		entries = list(entryList)
+		self.assertEqual(len(entries), 101)
+		self.assertEqual(
+			[e.l_term[0] for e in entries],
+			terms[:51] + ["Word00050"] + terms[51:],
+		)
+		self.assertEqual(entries[0].l_term, ["word00000", "WORD00000"])
+		self.assertEqual(entries[0].defi, "defi of word00000")
+		self.assertEqual(entries[51].defi, "second")
+
+		# appended after sort: comes last
+		entryList.append(Entry(["aaa"], "last"))
+		self.assertEqual(list(entryList)[-1].l_term, ["aaa"])
+
+		entryList.clear()
+		self.assertEqual(len(entryList), 0)
+		self.assertEqual(list(entryList), [])
+
+	def test_data_entry(self):
+		entryList = self.newList()
+		entryList.append(DataEntry("img/a.png", b"abc"))
+		entryList.append(Entry(["a"], "defi"))
+		entryList.sort()
+		entries = list(entryList)
+		self.assertEqual([e.isData() for e in entries], [False, True])
+		self.assertEqual(entries[1].s_term, "img/a.png")
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from os.path import abspath, dirname
+
+rootDir = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, rootDir)
+
+from pyglossary.glossary_v2 import Glossary
+from pyglossary.plugins.ayandict_sqlite import writer as ayandictWriter
+
+
+class TestGlossaryAyanDictSQLite(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		Glossary.init()
+
+	def setUp(self):
+		self.tmpdir = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+	def writeDb(self, entries, **options):
+		glos = Glossary()
+		glos.setInfo("name", "Test")
+		for terms, defi in entries:
+			glos.addEntry(glos.newEntry(terms, defi, defiFormat="h"))
+		fpath = os.path.join(self.tmpdir, "test.db")
+		glos.write(fpath, formatName="AyanDictSQLite", **options)
+		glos.cleanup()
+		return fpath
+
+	def test_write_read(self):
+		entries = [
+			([f"word{i}", f"alt{i}", f"alt {i}"], f"<b>defi {i}</b>") for i in range(2500)
+		]
+		fpath = self.writeDb(entries)
+
+		glos = Glossary()
+		self.assertTrue(glos.directRead(fpath, formatName="AyanDictSQLite"))
+		result = [(entry.l_term, entry.defi) for entry in glos]
+		glos.cleanup()
+		self.assertEqual(result, entries)
+
+		con = sqlite3.connect(fpath)
+		indexes = {
+			row[0]
+			for row in con.execute(
+				"SELECT name FROM sqlite_master WHERE type='index'",
+			)
+		}
+		self.assertTrue(
+			{
+				"idx_meta",
+				"idx_entry_term",
+				"idx_alt_id",
+				"idx_alt_term",
+				"idx_fuzzy3_sub",
+			}.issubset(indexes),
+		)
+		rows = set(
+			con.execute("SELECT sub, term FROM fuzzy3 WHERE id=1").fetchall(),
+		)
+		con.close()
+		self.assertEqual(
+			rows,
+			{
+				("\nwo", "word0"),
+				("wor", "word0"),
+				("ord", "word0"),
+				("rd0", "word0"),
+				("\nal", "alt0"),
+				("alt", "alt0"),
+				("lt0", "alt0"),
+				("\nal", "alt 0"),
+				("alt", "alt 0"),
+			},
+		)
+
+	def test_fuzzy_disabled(self):
+		fpath = self.writeDb([(["a"], "b")], fuzzy=False)
+		con = sqlite3.connect(fpath)
+		tables = {
+			row[0]
+			for row in con.execute(
+				"SELECT name FROM sqlite_master WHERE type='table'",
+			)
+		}
+		con.close()
+		self.assertNotIn("fuzzy3", tables)
+
+	def test_small_fuzzy_batch(self):
+		self.addCleanup(
+			setattr,
+			ayandictWriter,
+			"fuzzyBatchSize",
+			ayandictWriter.fuzzyBatchSize,
+		)
+		ayandictWriter.fuzzyBatchSize = 7
+		fpath = self.writeDb([([f"word{i}"], "defi") for i in range(100)])
+		con = sqlite3.connect(fpath)
+		(count,) = con.execute("SELECT count(*) FROM fuzzy3").fetchone()
+		con.close()
+		self.assertEqual(count, 4 * 10 + 5 * 90)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,156 @@
+import unittest
+
+from glossary_v2_errors_test import TestGlossaryErrorsBase
+from mdict_test_utils import writeMdd, writeMdx
+
+from pyglossary.glossary_v2 import ConvertArgs, Glossary
+from pyglossary.plugin_lib.readmdict import MDD, MDX
+
+
+class TestGlossaryOctopusMdict(TestGlossaryErrorsBase):
+	def __init__(self, *args, **kwargs):
+		TestGlossaryErrorsBase.__init__(self, *args, **kwargs)
+
+	def test_read_links(self):
+		inputPath = self.newTempFilePath("links.mdx")
+		outputPath = self.newTempFilePath("links.txt")
+		writeMdx(
+			inputPath,
+			[
+				("apple", "<b>fruit</b>"),
+				("apples", "@@@LINK=apple"),
+				("banana", 'yellow, see <a href="entry://apple">apple</a>'),
+				("cherry", "red"),
+				("cherries", "@@@LINK=cherry"),
+				# surrounding (also non-ASCII) whitespace is ignored
+				("pomme", "\u3000@@@LINK=apple\r\n"),
+			],
+		)
+		glos = Glossary()
+		glos.convert(
+			ConvertArgs(
+				inputFilename=inputPath,
+				outputFilename=outputPath,
+				outputFormat="Tabfile",
+			),
+		)
+		with open(outputPath, encoding="utf-8") as file:
+			lines = [line for line in file.read().split("\n") if not line.startswith("#")]
+		self.assertEqual(
+			lines,
+			[
+				"apple|apples|pomme\t<b>fruit</b>",
+				'banana\tyellow, see <a href="bword://apple">apple</a>',
+				"cherry|cherries\tred",
+				"",
+			],
+		)
+
+	def test_read_many_blocks_and_mdd(self):
+		inputPath = self.newTempFilePath("many.mdx")
+		writeMdx(
+			inputPath,
+			[(f"word{i:03d}", f"defi {i}") for i in range(100)],
+			keysPerBlock=7,
+			recordsPerBlock=11,
+		)
+		writeMdd(
+			self.newTempFilePath("many.mdd"),
+			[("\\a.png", b"PNG-A"), ("\\b.png", b"PNG-B")],
+		)
+		glos = Glossary()
+		self.assertTrue(glos.directRead(inputPath, formatName="OctopusMdict"))
+		self.assertEqual(len(glos), 102)
+		terms = []
+		data = {}
+		for entry in glos:
+			if entry.isData():
+				data[entry.s_term] = entry.data
+				continue
+			terms.append(entry.s_term)
+			self.assertEqual(entry.defi, f"defi {int(entry.s_term[4:])}")
+		glos.cleanup()
+		self.assertEqual(terms, [f"word{i:03d}" for i in range(100)])
+		self.assertEqual(data, {"a.png": b"PNG-A", "b.png": b"PNG-B"})
+
+	def test_parallel_record_blocks(self):
+		mdxPath = self.newTempFilePath("parallel.mdx")
+		mddPath = self.newTempFilePath("parallel.mdd")
+		writeMdx(
+			mdxPath,
+			[(f"word{i:04d}", f"defi {i} " * (i % 13)) for i in range(500)],
+			keysPerBlock=50,
+			recordsPerBlock=7,
+		)
+		writeMdd(
+			mddPath,
+			[(f"\\{i:03d}.bin", bytes([i]) * i) for i in range(100)],
+			recordsPerBlock=9,
+		)
+		expectedMdx = list(MDX(mdxPath).items())
+		expectedMdd = list(MDD(mddPath).items())
+		self.assertEqual(len(expectedMdx), 500)
+		self.assertEqual(len(expectedMdd), 100)
+		for kwargs in (
+			{"workers": 4},
+			{"workers": 3, "memory_budget": 1000},
+			{"workers": 2, "memory_budget": 0},
+			{"workers": 2, "processes": True},
+		):
+			with self.subTest(**kwargs):
+				self.assertEqual(list(MDX(mdxPath, **kwargs).items()), expectedMdx)
+				self.assertEqual(list(MDD(mddPath, **kwargs).items()), expectedMdd)
+
+	def test_parallel_record_blocks_partial(self):
+		mdxPath = self.newTempFilePath("partial.mdx")
+		writeMdx(
+			mdxPath,
+			[(f"word{i:04d}", f"defi {i}") for i in range(100)],
+			recordsPerBlock=2,
+		)
+		items = MDX(mdxPath, workers=4).items()
+		self.assertEqual(next(items), (b"word0000", b"defi 0\r\n"))
+		self.assertEqual(next(items), (b"word0001", b"defi 1\r\n"))
+		items.close()
+
+	def test_lookup(self):
+		mdxPath = self.newTempFilePath("lookup.mdx")
+		items = [(f"word{i:03d}", f"defi {i}") for i in range(200)]
+		items.insert(51, ("word050", "second defi 50"))
+		writeMdx(mdxPath, items, keysPerBlock=16, recordsPerBlock=10)
+		with MDX(mdxPath, cache_size=2) as mdx:
+			self.assertEqual(mdx["word000"], b"defi 0\r\n")
+			self.assertEqual(mdx["word199"], b"defi 199\r\n")
+			self.assertEqual(mdx[b"word123"], b"defi 123\r\n")
+			self.assertEqual(
+				mdx.lookup("word050"),
+				[b"defi 50\r\n", b"second defi 50\r\n"],
+			)
+			self.assertIn("word100", mdx)
+			self.assertNotIn("word200", mdx)
+			self.assertIsNone(mdx.get("missing"))
+			with self.assertRaises(KeyError):
+				mdx["missing"]  # noqa: B018
+			self.assertLessEqual(len(mdx._block_cache), 2)
+			for key, defi in items[::7]:
+				self.assertIn(defi.encode("utf-8") + b"\r\n", mdx.lookup(key))
+		self.assertIsNone(mdx._mmap)
+
+	def test_lookup_mdd(self):
+		mddPath = self.newTempFilePath("lookup.mdd")
+		writeMdd(
+			mddPath,
+			[(f"\\img{i:02d}.png", bytes([i]) * (i + 1)) for i in range(30)],
+		)
+		with MDD(mddPath) as mdd:
+			self.assertEqual(mdd["\\img07.png"], b"\x07" * 8)
+			self.assertEqual(mdd["\\img29.png"], b"\x1d" * 30)
+			self.assertEqual(mdd.lookup("\\img30.png"), [])
+			self.assertEqual(
+				len(mdd._block_cache),
+				2,
+			)
+
+
+if __name__ == "__main__":
+	unittest.main()
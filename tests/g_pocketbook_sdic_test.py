@@ -320,6 +320,27 @@ class TestPocketBookSdicWriter(unittest.TestCase):
 		# All entries should be present
 		self.assertEqual(len(result.entries), n)
 
+	def test_external_sort(self):
+		"""Spilling sorted runs to temp files gives the same output."""
+		n = 300
+		input_entries = [
+			(f"word{(i * 37) % n:04d}", f"definition number {i}") for i in range(n)
+		]
+		input_entries += [("word0007", "extra"), ("Äpfel", "apples")]
+		outpath = self._write_sdic(input_entries)
+		with open(outpath, "rb") as f:
+			expected = f.read()
+		self.glos.cleanup()
+		self.glos.clear()
+		os.remove(outpath)
+		outpath = self._write_sdic(input_entries, sort_memory=4096)
+		with open(outpath, "rb") as f:
+			self.assertEqual(f.read(), expected)
+		result = _parse_sdic(outpath)
+		self.assertEqual(result.entry_count, n + 1)
+		entries = dict(result.entries)
+		self.assertEqual(entries["word0007"], "definition number 211<br>extra")
+
 
 if __name__ == "__main__":
 	unittest.main()
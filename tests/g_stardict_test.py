@@ -437,5 +437,29 @@ class TestGlossaryStarDictSplit(TestGlossaryErrorsBase):
 				)
 
 
+class TestGlossaryStarDictDictzip(TestGlossaryErrorsBase):
+	def test_write_dictzip(self):
+		glos = self.glos = Glossary()
+		defis = {f"word{i}": f"definition {i}. " * 1000 + "end" for i in range(20)}
+		for term, defi in defis.items():
+			glos.addEntry(glos.newEntry([term], defi))
+
+		outputFilename = self.newTempFilePath("dictzip-test.ifo")
+		glos.write(
+			outputFilename,
+			formatName="Stardict",
+			sametypesequence="m",
+			dictzip=True,
+		)
+		base = outputFilename[:-4]
+		self.assertFalse(isfile(f"{base}.dict"))
+		self.assertTrue(isfile(f"{base}.dict.dz"))
+
+		glos2 = Glossary()
+		glos2.directRead(outputFilename)
+		result = {entry.s_term: entry.defi for entry in glos2}
+		self.assertEqual(result, defis)
+
+
 if __name__ == "__main__":
 	unittest.main()
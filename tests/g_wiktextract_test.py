@@ -68,6 +68,16 @@ class TestGlossaryWiktextract(TestGlossaryBase):
 			},
 		)
 
+	def test_convert_jsonl_txt_2_word_title_workers(self):
+		self.convert_jsonl_txt(
+			"10-kaikki-fa-pos-adv",
+			"10-kaikki-fa-pos-adv-word_title-v3",
+			readOptions={
+				"word_title": True,
+				"workers": 2,
+			},
+		)
+
 	def test_convert_jsonl_txt_3(self):
 		self.convert_jsonl_txt(
 			"03-kaikki-fa-selection",
@@ -78,6 +88,15 @@ class TestGlossaryWiktextract(TestGlossaryBase):
 		# "topics" in sense
 		# "form_of" in sense
 
+	def test_convert_jsonl_txt_3_workers(self):
+		self.convert_jsonl_txt(
+			"03-kaikki-fa-selection",
+			"03-kaikki-fa-selection-v3",
+			readOptions={
+				"workers": 2,
+			},
+		)
+
 
 if __name__ == "__main__":
 	unittest.main()
@@ -0,0 +1,150 @@
+"""Build small (version 2.0, zlib-compressed) MDX/MDD files for tests."""
+
+from __future__ import annotations
+
+import zlib
+from struct import pack
+
+__all__ = ["writeMdd", "writeMdx"]
+
+
+def _adler32(data: bytes) -> int:
+	return zlib.adler32(data) & 0xFFFFFFFF
+
+
+def _block(data: bytes) -> bytes:
+	return b"\x02\x00\x00\x00" + pack(">I", _adler32(data)) + zlib.compress(data)
+
+
+def _number(n: int) -> bytes:
+	return pack(">Q", n)
+
+
+def _split(items: list, size: int) -> list[list]:
+	return [items[i : i + size] for i in range(0, len(items), size)] or [[]]
+
+
+def _write(  # noqa: PLR0913, PLR0914
+	filename: str,
+	items: list[tuple[bytes, bytes]],
+	headerAttrs: str,
+	utf16: bool,
+	keysPerBlock: int,
+	recordsPerBlock: int,
+) -> None:
+	headerText = (
+		f'<Dictionary GeneratedByEngineVersion="2.0" RequiredEngineVersion="2.0"'
+		f' Encrypted="No" {headerAttrs}/>\r\n\x00'
+	)
+	header = headerText.encode("utf-16-le")
+
+	keyTerm = b"\x00\x00" if utf16 else b"\x00"
+
+	def encodeKey(key: bytes) -> bytes:
+		if utf16:
+			return key.decode("utf-8").encode("utf-16-le")
+		return key
+
+	offsets = []
+	pos = 0
+	for _key, record in items:
+		offsets.append(pos)
+		pos += len(record)
+
+	keyBlocks = []
+	keyBlockInfo = b""
+	indexes = list(range(len(items)))
+	for blockIndexes in _split(indexes, keysPerBlock):
+		data = b"".join(
+			_number(offsets[i]) + encodeKey(items[i][0]) + keyTerm for i in blockIndexes
+		)
+		block = _block(data)
+		keyBlocks.append(block)
+		first = encodeKey(items[blockIndexes[0]][0]) if blockIndexes else b""
+		last = encodeKey(items[blockIndexes[-1]][0]) if blockIndexes else b""
+		charWidth = 2 if utf16 else 1
+		keyBlockInfo += (
+			_number(len(blockIndexes))
+			+ pack(">H", len(first) // charWidth)
+			+ first
+			+ keyTerm
+			+ pack(">H", len(last) // charWidth)
+			+ last
+			+ keyTerm
+			+ _number(len(block))
+			+ _number(len(data))
+		)
+	keyBlockInfoCompressed = _block(keyBlockInfo)
+	keyBlocksData = b"".join(keyBlocks)
+
+	keySection = (
+		_number(len(keyBlocks))
+		+ _number(len(items))
+		+ _number(len(keyBlockInfo))
+		+ _number(len(keyBlockInfoCompressed))
+		+ _number(len(keyBlocksData))
+	)
+
+	recordBlocks = []
+	recordBlockInfo = b""
+	for blockItems in _split(items, recordsPerBlock):
+		data = b"".join(record for _key, record in blockItems)
+		block = _block(data)
+		recordBlocks.append(block)
+		recordBlockInfo += _number(len(block)) + _number(len(data))
+	recordBlocksData = b"".join(recordBlocks)
+
+	with open(filename, "wb") as file:
+		file.write(pack(">I", len(header)))
+		file.write(header)
+		file.write(pack("<I", _adler32(header)))
+		file.write(keySection)
+		file.write(pack(">I", _adler32(keySection)))
+		file.write(keyBlockInfoCompressed)
+		file.write(keyBlocksData)
+		file.write(
+			_number(len(recordBlocks))
+			+ _number(len(items))
+			+ _number(len(recordBlockInfo))
+			+ _number(len(recordBlocksData)),
+		)
+		file.write(recordBlockInfo)
+		file.write(recordBlocksData)
+
+
+def writeMdx(
+	filename: str,
+	items: list[tuple[str, str]],
+	title: str = "Test",
+	keysPerBlock: int = 4,
+	recordsPerBlock: int = 3,
+) -> None:
+	"""Items must be sorted by key."""
+	_write(
+		filename,
+		[
+			(key.encode("utf-8"), defi.encode("utf-8") + b"\r\n\x00")
+			for key, defi in items
+		],
+		f'Encoding="UTF-8" Format="Html" Title="{title}"',
+		utf16=False,
+		keysPerBlock=keysPerBlock,
+		recordsPerBlock=recordsPerBlock,
+	)
+
+
+def writeMdd(
+	filename: str,
+	items: list[tuple[str, bytes]],
+	keysPerBlock: int = 4,
+	recordsPerBlock: int = 3,
+) -> None:
+	r"""Items must be sorted by key, keys look like "\image.png"."""
+	_write(
+		filename,
+		[(key.encode("utf-8"), data) for key, data in items],
+		'Encoding="UTF-16" Format=""',
+		utf16=True,
+		keysPerBlock=keysPerBlock,
+		recordsPerBlock=recordsPerBlock,
+	)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import os
+import pickle
+import sys
+import unittest
+from os.path import abspath, dirname
+
+rootDir = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, rootDir)
+
+from glossary_v2_test import TestGlossaryBase
+
+from pyglossary.entry import Entry
+from pyglossary.entry_filters import (
+	LanguageCleanup,
+	LowerTerm,
+	PreventDuplicateTerms,
+	TrimWhitespaces,
+)
+from pyglossary.glossary_v2 import ConvertArgs, Glossary
+from pyglossary.parallel_filters import ParallelFilterIterator, splitParallelFilters
+
+
+class TestParallelFilters(TestGlossaryBase):
+	def setUp(self):
+		TestGlossaryBase.setUp(self)
+		os.environ["PYGLOSSARY_FILTER_PROCESSES"] = "2"
+
+	def tearDown(self):
+		del os.environ["PYGLOSSARY_FILTER_PROCESSES"]
+		TestGlossaryBase.tearDown(self)
+
+	def test_split(self):
+		glos = Glossary()
+		filters = [
+			TrimWhitespaces(glos),
+			LowerTerm(glos),
+			PreventDuplicateTerms(glos),
+			TrimWhitespaces(glos),
+		]
+		parallel, serial = splitParallelFilters(filters)
+		self.assertEqual(parallel, filters[:2])
+		self.assertEqual(serial, filters[2:])
+
+	def test_pickle_filter(self):
+		glos = Glossary()
+		glos.sourceLangName = "Persian"
+		entryFilter = LanguageCleanup(glos)
+		entryFilter.prepare()
+		entryFilter2 = pickle.loads(pickle.dumps(entryFilter))
+		self.assertEqual(entryFilter2.glos.sourceLang.code, "fa")
+		entry = entryFilter2.run(Entry("a", "ي"))
+		self.assertEqual(entry.defi, "ی")
+
+	def test_iterator_order(self):
+		glos = Glossary()
+		entries = [Entry(f"  Word{i}  ", f"defi {i}") for i in range(1000)]
+		entries[500] = None
+		result = list(
+			ParallelFilterIterator(
+				entries,
+				[TrimWhitespaces(glos), LowerTerm(glos)],
+				processes=2,
+				batchSize=64,
+			),
+		)
+		self.assertEqual(len(result), 999)
+		self.assertEqual(result[0].s_term, "word0")
+		self.assertEqual(result[-1].s_term, "word999")
+		self.assertEqual(result[500].defi, "defi 501")
+
+	def convertSerialParallel(self, config):
+		inputFilename = self.downloadFile("100-en-fa.txt")
+		outputs = []
+		for processes in ("", "2"):
+			os.environ["PYGLOSSARY_FILTER_PROCESSES"] = processes
+			outputFilename = self.newTempFilePath(f"100-en-fa-{processes}.txt")
+			glos = Glossary()
+			glos.config = config
+			glos.convert(
+				ConvertArgs(
+					inputFilename=inputFilename,
+					outputFilename=outputFilename,
+					direct=True,
+				),
+			)
+			glos.cleanup()
+			outputs.append(outputFilename)
+		self.compareTextFiles(*outputs)
+
+	def test_convert_lower_rtl(self):
+		self.convertSerialParallel({"lower": True, "rtl": True})
+
+	def test_convert_skip_duplicate_headword(self):
+		self.convertSerialParallel({"skip_duplicate_headword": True})
+
+
+if __name__ == "__main__":
+	unittest.main()
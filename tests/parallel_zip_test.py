@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+from os.path import abspath, dirname, isdir, isfile, join
+
+rootDir = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, rootDir)
+
+from pyglossary import parallel_zip
+from pyglossary.compress import zipFileOrDir
+from pyglossary.parallel_zip import ParallelZipWriter
+from pyglossary.repro_zipfile import ReproducibleZipFile
+
+
+class TestParallelZipWriter(unittest.TestCase):
+	def setUp(self):
+		self.tmpDir = tempfile.mkdtemp()
+		rand = random.Random(1)
+		self.files = []
+		os.makedirs(join(self.tmpDir, "src", "sub"))
+		for i in range(40):
+			arcname = f"sub/f{i}.html" if i % 2 else f"f{i}.html"
+			with open(join(self.tmpDir, "src", arcname), "w", encoding="utf-8") as file:
+				file.write(f"word {i} ünïcode " * rand.randint(1, 3000))
+			self.files.append(arcname)
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpDir, ignore_errors=True)
+
+	def writeParallel(self, fname: str, **kwargs) -> str:
+		path = join(self.tmpDir, fname)
+		with ParallelZipWriter(path, **kwargs) as zw:
+			zw.writestr("mimetype", b"application/epub+zip", zipfile.ZIP_STORED)
+			for arcname in self.files:
+				zw.write(join(self.tmpDir, "src", arcname), arcname)
+		return path
+
+	def writeSequential(self, fname: str) -> str:
+		path = join(self.tmpDir, fname)
+		with ReproducibleZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+			zf.writestr(
+				"mimetype",
+				b"application/epub+zip",
+				compress_type=zipfile.ZIP_STORED,
+			)
+			for arcname in self.files:
+				zf.write(join(self.tmpDir, "src", arcname), arcname=arcname)
+		return path
+
+	def readBytes(self, path: str) -> bytes:  # noqa: PLR6301
+		with open(path, "rb") as file:
+			return file.read()
+
+	def test_same_as_sequential(self):
+		expected = self.readBytes(self.writeSequential("seq.zip"))
+		for workers in (1, 3):
+			actual = self.readBytes(
+				self.writeParallel(f"p{workers}.zip", workers=workers)
+			)
+			self.assertEqual(actual, expected)
+
+	def test_large_file(self):
+		expected = self.readBytes(self.writeSequential("seq.zip"))
+		maxSize = parallel_zip.maxParallelFileSize
+		parallel_zip.maxParallelFileSize = 20000
+		try:
+			path = self.writeParallel("p.zip", workers=2)
+		finally:
+			parallel_zip.maxParallelFileSize = maxSize
+		self.assertEqual(self.readBytes(path), expected)
+		with zipfile.ZipFile(path) as zf:
+			self.assertIsNone(zf.testzip())
+			self.assertEqual(zf.namelist(), ["mimetype", *self.files])
+
+	def test_abort(self):
+		path = join(self.tmpDir, "a.zip")
+		with self.assertRaises(RuntimeError):  # noqa: SIM117
+			with ParallelZipWriter(path) as zw:
+				zw.writestr("a.txt", b"abc")
+				raise RuntimeError("test")
+		self.assertFalse(isfile(path))
+
+	def test_zipFileOrDir(self):
+		srcDir = join(self.tmpDir, "src")
+		zipFileOrDir(srcDir)
+		self.assertFalse(isdir(srcDir))
+		with zipfile.ZipFile(srcDir + ".zip") as zf:
+			self.assertIsNone(zf.testzip())
+			self.assertEqual(
+				zf.namelist(),
+				sorted(self.files, key=lambda name: name.split("/")),
+			)
+
+
+if __name__ == "__main__":
+	unittest.main()
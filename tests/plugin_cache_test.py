@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from os.path import abspath, dirname, join
+
+rootDir = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, rootDir)
+
+from pyglossary.core import dataDir, pluginsDir
+from pyglossary.plugin_cache import PluginCache, iterPluginModules, pluginStamp
+from pyglossary.plugin_handler import PluginLoader
+
+
+class TestPluginCache(unittest.TestCase):
+	def setUp(self):
+		self.tmpDir = tempfile.mkdtemp()
+		self.cachePath = join(self.tmpDir, "cache", "plugins-index.json")
+		loadedModules = PluginLoader.loadedModules
+		PluginLoader.loadedModules = set()
+		self.addCleanup(setattr, PluginLoader, "loadedModules", loadedModules)
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpDir, ignore_errors=True)
+
+	def test_pluginStamp(self):
+		pkgDir = join(self.tmpDir, "myplugin")
+		os.makedirs(join(pkgDir, "__pycache__"))
+		with open(join(pkgDir, "__init__.py"), "w", encoding="utf-8") as file:
+			file.write("x = 1\n")
+		stamp = pluginStamp(pkgDir)
+		with open(join(pkgDir, "__pycache__", "a.pyc"), "wb") as file:
+			file.write(b"\x00")
+		self.assertEqual(pluginStamp(pkgDir), stamp)
+		with open(join(pkgDir, "reader.py"), "w", encoding="utf-8") as file:
+			file.write("y = 2\n")
+		self.assertNotEqual(pluginStamp(pkgDir), stamp)
+
+	def test_iterPluginModules(self):
+		os.makedirs(join(self.tmpDir, "pkg"))
+		os.makedirs(join(self.tmpDir, "notpkg"))
+		os.makedirs(join(self.tmpDir, "__pycache__"))
+		for fname in ("pkg/__init__.py", "mod.py", "_private.py", "data.json"):
+			with open(join(self.tmpDir, fname), "w", encoding="utf-8"):
+				pass
+		self.assertEqual(
+			[name for name, _ in iterPluginModules(self.tmpDir)],
+			["mod", "pkg"],
+		)
+
+	def test_cache_get_set_save(self):
+		cache = PluginCache(self.cachePath)
+		self.assertIsNone(cache.get("dir", "mod", "s1"))
+		cache.set("dir", "mod", "s1", {"name": "Mod"})
+		cache.save()
+		self.assertFalse(cache.modified)
+
+		cache = PluginCache(self.cachePath)
+		self.assertEqual(
+			cache.get("dir", "mod", "s1"),
+			{"stamp": "s1", "attrs": {"name": "Mod"}, "missing": ""},
+		)
+		self.assertIsNone(cache.get("dir", "mod", "s2"))
+		cache.removeOthers("dir", set())
+		self.assertTrue(cache.modified)
+		self.assertIsNone(cache.get("dir", "mod", "s1"))
+
+	def test_cache_outdated_header(self):
+		cache = PluginCache(self.cachePath)
+		cache.set("dir", "mod", "s1", {"name": "Mod"})
+		cache.save()
+		with open(self.cachePath, encoding="utf-8") as file:
+			data = json.load(file)
+		data["header"]["version"] = -1
+		with open(self.cachePath, "w", encoding="utf-8") as file:
+			json.dump(data, file)
+		self.assertIsNone(PluginCache(self.cachePath).get("dir", "mod", "s1"))
+
+	def test_loadPluginsCached(self):
+		with open(join(dataDir, "plugins-meta", "index.json"), encoding="utf-8") as file:
+			index = {attrs["module"]: attrs for attrs in json.load(file)}
+
+		imported: list[str] = []
+		importPluginAttrs = PluginLoader._importPluginAttrs
+
+		def importPluginAttrsMock(moduleName, fallbackAttrs):
+			imported.append(moduleName)
+			return importPluginAttrs(moduleName, fallbackAttrs)
+
+		self.addCleanup(
+			setattr,
+			PluginLoader,
+			"_importPluginAttrs",
+			staticmethod(importPluginAttrs),
+		)
+		PluginLoader._importPluginAttrs = staticmethod(importPluginAttrsMock)
+
+		def load():
+			PluginLoader.loadedModules = set()
+			cache = PluginCache(self.cachePath)
+			plugins = PluginLoader.loadPluginsCached(
+				pluginsDir,
+				cache,
+				index.get,
+				skipDisabled=False,
+			)
+			cache.save()
+			return {prop.moduleName: prop for prop in plugins}
+
+		plugins = load()
+		self.assertIn("tabfile", imported)
+		for moduleName in ("tabfile", "stardict", "dsl"):
+			attrs = plugins[moduleName].toDict()
+			attrs.pop("extensionCreate", None)
+			self.assertEqual(attrs, index[moduleName])
+
+		imported.clear()
+		plugins2 = load()
+		self.assertEqual(imported, [])
+		self.assertEqual(sorted(plugins2), sorted(plugins))
+		self.assertEqual(plugins2["stardict"].extensionCreate, "-stardict/")
+		self.assertEqual(
+			plugins2["tabfile"].getWriteOptions(),
+			plugins["tabfile"].getWriteOptions(),
+		)
+
+	def test_failed_import_not_cached(self):
+		pluginDir = join(self.tmpDir, "plugins")
+		os.makedirs(pluginDir)
+		path = join(pluginDir, "broken.py")
+		with open(path, "w", encoding="utf-8"):
+			pass
+		# cached by older versions
+		cache = PluginCache(self.cachePath)
+		cache.set(pluginDir, "broken", pluginStamp(path), None, "")
+
+		calls: list[str] = []
+		importPluginAttrs = PluginLoader._importPluginAttrs
+
+		def importPluginAttrsMock(moduleName, fallbackAttrs):  # noqa: ARG001
+			calls.append(moduleName)
+			if len(calls) == 1:
+				return None, ""
+			return {"name": "Broken"}, ""
+
+		self.addCleanup(
+			setattr,
+			PluginLoader,
+			"_importPluginAttrs",
+			staticmethod(importPluginAttrs),
+		)
+		PluginLoader._importPluginAttrs = staticmethod(importPluginAttrsMock)
+
+		def load():
+			return PluginLoader._cachedPluginAttrs(
+				cache,
+				pluginDir,
+				"broken",
+				path,
+				lambda _: None,
+			)
+
+		self.assertIsNone(load())
+		self.assertEqual(calls, ["broken"])
+		self.assertEqual(load(), {"name": "Broken"})
+		self.assertEqual(calls, ["broken", "broken"])
+		self.assertEqual(load(), {"name": "Broken"})
+		self.assertEqual(calls, ["broken", "broken"])
+
+
+if __name__ == "__main__":
+	unittest.main()
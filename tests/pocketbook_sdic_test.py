@@ -27,7 +27,7 @@ from pyglossary.plugins.pocketbook_sdic.writer import (
 	_build_header,
 	_build_sparse_index,
 	_encode_entry,
-	_pack_blocks,
+	_iter_blocks,
 	_prepare_collate_section,
 	_prepare_keyboard_section,
 	_prepare_morphems_section,
@@ -215,12 +215,24 @@ class TestEncodeEntry(unittest.TestCase):
 		self.assertEqual(word, "café")
 
 
+def _collect_blocks(payloads: list[bytes]) -> tuple[list[bytes], list[int], int]:
+	"""Return (blocks, counts, widened_count) of _iter_blocks."""
+	blocks: list[bytes] = []
+	counts: list[int] = []
+	widened_count = 0
+	for block, count, widened in _iter_blocks(payloads):
+		blocks.append(block)
+		counts.append(count)
+		widened_count += widened
+	return blocks, counts, widened_count
+
+
 class TestPackBlocks(unittest.TestCase):
 	"""Test block packing algorithm."""
 
 	def test_single_small_entry(self):
 		payloads = [b"small entry data"]
-		blocks, counts, _max_size, widened = _pack_blocks(payloads)
+		blocks, counts, widened = _collect_blocks(payloads)
 		self.assertEqual(len(blocks), 1)
 		self.assertEqual(counts, [1])
 		self.assertEqual(widened, 0)
@@ -231,14 +243,14 @@ class TestPackBlocks(unittest.TestCase):
 
 	def test_multiple_small_entries_pack_together(self):
 		payloads = [b"entry" + bytes([i]) for i in range(10)]
-		blocks, counts, _max_size, widened = _pack_blocks(payloads)
+		blocks, counts, widened = _collect_blocks(payloads)
 		self.assertEqual(len(blocks), 1)
 		self.assertEqual(counts, [10])
 		self.assertEqual(widened, 0)
 
 	def test_max_100_entries_per_block(self):
 		payloads = [b"x" for _ in range(150)]
-		_blocks, counts, _max_size, _widened = _pack_blocks(payloads)
+		_blocks, counts, _widened = _collect_blocks(payloads)
 		self.assertEqual(sum(counts), 150)
 		for c in counts:
 			self.assertLessEqual(c, MAX_WORDS_PER_BLOCK)
@@ -246,7 +258,7 @@ class TestPackBlocks(unittest.TestCase):
 	def test_raw_size_limit_enforced(self):
 		# Each entry is ~700 bytes; 100 of them > 65531
 		payloads = [b"x" * 700 for _ in range(100)]
-		blocks, _counts, _max_size, _widened = _pack_blocks(payloads)
+		blocks, _counts, _widened = _collect_blocks(payloads)
 		self.assertGreater(len(blocks), 1)
 		for block in blocks:
 			raw = zlib.decompress(block)
@@ -260,7 +272,7 @@ class TestPackBlocks(unittest.TestCase):
 		rng = random.Random(42)
 		big = bytes(rng.getrandbits(8) for _ in range(30000))
 		payloads = [big]
-		blocks, counts, _max_size, widened = _pack_blocks(payloads)
+		blocks, counts, widened = _collect_blocks(payloads)
 		self.assertEqual(len(blocks), 1)
 		self.assertEqual(counts, [1])
 		self.assertEqual(widened, 1)
@@ -276,29 +288,28 @@ class TestPackBlocks(unittest.TestCase):
 		huge = bytes(rng.getrandbits(8) for _ in range(200000))
 		payloads = [huge]
 		with self.assertRaises(ValueError):
-			_pack_blocks(payloads)
+			_collect_blocks(payloads)
 
 
 class TestBuildSparseIndex(unittest.TestCase):
 	"""Test sparse index construction."""
 
 	def test_single_block(self):
-		words = ["alpha", "beta", "gamma"]
-		blocks = [b"compressed"]
-		counts = [3]
-		raw = _build_sparse_index(words, blocks, counts)
+		block = b"compressed"
+		raw = _build_sparse_index([(len(block), "alpha")])
 		# Should be: uint16(10) + "alpha\0"
 		size = struct.unpack_from("<H", raw, 0)[0]
-		self.assertEqual(size, len(blocks[0]))
+		self.assertEqual(size, len(block))
 		null_terminator_pos = raw.index(0, 2)
 		first_word = raw[2:null_terminator_pos].decode("utf-8")
 		self.assertEqual(first_word, "alpha")
+		self.assertEqual(len(raw), null_terminator_pos + 1)
 
 	def test_multiple_blocks(self):
-		words = ["alpha", "beta", "gamma", "delta"]
 		blocks = [b"block0", b"block1"]
-		counts = [2, 2]
-		raw = _build_sparse_index(words, blocks, counts)
+		raw = _build_sparse_index(
+			[(len(blocks[0]), "alpha"), (len(blocks[1]), "gamma")],
+		)
 		# First entry: block0, first word = "alpha"
 		off = 0
 		s1 = struct.unpack_from("<H", raw, off)[0]
@@ -314,6 +325,10 @@ class TestBuildSparseIndex(unittest.TestCase):
 		null_terminator_pos = raw.index(0, off)
 		self.assertEqual(raw[off:null_terminator_pos].decode("utf-8"), "gamma")
 
+	def test_utf8_first_word(self):
+		raw = _build_sparse_index([(300, "café")])
+		self.assertEqual(raw, struct.pack("<H", 300) + "café".encode() + b"\x00")
+
 
 class TestPrepareSections(unittest.TestCase):
 	"""Test section encoding."""
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import os
+import random
+import sys
+import tempfile
+import unittest
+from os.path import abspath, dirname
+
+rootDir = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, rootDir)
+
+from pyglossary.entry import Entry
+from pyglossary.reverse import (
+	ReverseIndex,
+	reverseGlossary,
+	searchWordInDef,
+	takeOutputWords,
+)
+
+
+class _Glossary:
+	def __init__(self, entries):
+		self._entries = entries
+		self.progressbar = False
+
+	def __iter__(self):
+		return iter(self._entries)
+
+	def getInfo(self, key):  # noqa: ARG002
+		return "test"
+
+	def progressInit(self, *args):
+		pass
+
+	def progress(self, pos, total, unit="entries"):
+		pass
+
+	def progressEnd(self):
+		pass
+
+
+def _randomEntries(count: int) -> list[Entry]:
+	rnd = random.Random(1)
+	vocab = [f"word{i}" for i in range(200)] + ["ab", "کتاب", "خانه"]
+	entries = []
+	for i in range(count):
+		parts = [
+			" ".join(rnd.choice(vocab) for _ in range(rnd.randint(1, 6)))
+			for _ in range(rnd.randint(1, 4))
+		]
+		defi = rnd.choice([". ", ", ", "، "]).join(parts)
+		terms = [f"t{i}", f"alt{i}"] if i % 5 == 0 else [f"t{i}"]
+		entries.append(Entry(terms, defi))
+	return entries
+
+
+class TestReverseIndex(unittest.TestCase):
+	def setUp(self):
+		self.tempDir = tempfile.mkdtemp()
+		self.entries = _randomEntries(500)
+		self.terms = [f"word{i}" for i in range(200)] + ["ab", "کتاب", "missing"]
+
+	def tearDown(self):
+		for fname in os.listdir(self.tempDir):
+			os.remove(os.path.join(self.tempDir, fname))
+		os.rmdir(self.tempDir)
+
+	def check(self, indexArgs: dict, searchArgs: dict) -> None:
+		index = ReverseIndex(**indexArgs)
+		index.build(self.entries)
+		self.assertEqual(index.entryCount, len(self.entries))
+		self.assertEqual(
+			index.outputWords(),
+			takeOutputWords(_Glossary(self.entries), self.entries),
+		)
+		tokenArgs = {
+			key: value
+			for key, value in indexArgs.items()
+			if key in {"sepChars", "minWordLen"}
+		}
+		for term in self.terms:
+			self.assertEqual(
+				index.search(term, **searchArgs),
+				searchWordInDef(self.entries, term, **tokenArgs, **searchArgs),
+				msg=f"{term=}",
+			)
+		index.close()
+
+	def test_memory(self):
+		self.check({}, {})
+		self.check(
+			{"sepChars": ".", "minWordLen": 4},
+			{"showRel": "", "maxNum": 3},
+		)
+
+	def test_sqlite(self):
+		self.check(
+			{"sqlitePath": os.path.join(self.tempDir, "index.db")},
+			{"includeDefs": True, "minRel": 0.2, "showRel": "Percent At First"},
+		)
+
+	def test_processes(self):
+		self.check({"processes": 2}, {"minRel": 0.3})
+
+	def test_reverseGlossary(self):
+		glos = _Glossary(self.entries)
+		outputs = []
+		for kwargs in (
+			{"matchWord": False},
+			{},
+			{"processes": 2, "sqlitePath": os.path.join(self.tempDir, "r.db")},
+		):
+			savePath = os.path.join(self.tempDir, f"out{len(outputs)}.txt")
+			list(reverseGlossary(glos, savePath=savePath, minRel=0.2, **kwargs))
+			with open(savePath, encoding="utf-8") as file:
+				outputs.append(file.read())
+		self.assertIn("word5\t", outputs[1])
+		# with matchWord=False, substrings are matched too
+		self.assertNotEqual(outputs[0], outputs[1])
+		self.assertEqual(outputs[1], outputs[2])
+
+
+if __name__ == "__main__":
+	unittest.main()
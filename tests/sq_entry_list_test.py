@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from os.path import abspath, dirname, join
+
+rootDir = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, rootDir)
+
+from pyglossary.entry import Entry
+from pyglossary.sort_keys import lookupSortKey
+from pyglossary.sq_entry_list import SqEntryList
+
+
+def entryToRaw(entry):
+	return [entry.b_defi] + entry.lb_term
+
+
+def entryFromRaw(rawEntry):
+	return Entry(
+		[b.decode("utf-8") for b in rawEntry[1:]],
+		rawEntry[0].decode("utf-8"),
+	)
+
+
+class TestSqEntryList(unittest.TestCase):
+	def setUp(self):
+		self.tempDir = tempfile.mkdtemp()
+		self.database = join(self.tempDir, "test.db")
+
+	def tearDown(self):
+		if os.path.isfile(self.database):
+			os.remove(self.database)
+		os.rmdir(self.tempDir)
+
+	def newList(self, **kwargs) -> SqEntryList:
+		entryList = SqEntryList(
+			entryToRaw=entryToRaw,
+			entryFromRaw=entryFromRaw,
+			database=self.database,
+			create=True,
+			**kwargs,
+		)
+		entryList.setSortKey(
+			namedSortKey=lookupSortKey("headword_lower"),
+			sortEncoding="utf-8",
+			writeOptions={},
+		)
+		return entryList
+
+	def addEntries(self, entryList: SqEntryList, count: int) -> list[str]:
+		terms = [f"word{i:05d}" for i in range(count)]
+		for term in reversed(terms):
+			entryList.append(Entry([term, term.upper()], f"defi of {term}"))
+		return terms
+
+	def test_invalid_batch_size(self):
+		with self.assertRaises(ValueError):
+			self.newList(batchSize=0)
+
+	def test_iter_flushes_pending(self):
+		entryList = self.newList(batchSize=7)
+		terms = self.addEntries(entryList, 20)
+		self.assertEqual(len(entryList), 20)
+		result = [entry.l_term[0] for entry in entryList]
+		self.assertEqual(result, list(reversed(terms)))
+		entryList.close()
+
+	def test_sort(self):
+		entryList = self.newList(batchSize=7)
+		terms = self.addEntries(entryList, 50)
+		entryList.sort()
+		entries = list(entryList)
+		self.assertEqual([entry.l_term[0] for entry in entries], terms)
+		self.assertEqual(entries[0].l_term, ["word00000", "WORD00000"])
+		self.assertEqual(entries[0].defi, "defi of word00000")
+		entryList.close()
+
+	def test_sort_before_append(self):
+		# this is how StarDictCreator uses it
+		entryList = self.newList(batchSize=1000, mmapSize=1 << 20)
+		entryList.sort()
+		terms = self.addEntries(entryList, 30)
+		result = [entry.l_term[0] for entry in entryList]
+		self.assertEqual(result, terms)
+		entryList.close()
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from os.path import abspath, dirname, join
+
+rootDir = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, rootDir)
+
+from pyglossary.glossary_v2 import ConvertArgs, Glossary
+
+
+class TestSQLWriter(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		Glossary.init()
+
+	def setUp(self):
+		self.tmpDir = tempfile.mkdtemp()
+		self.inputFilename = join(self.tmpDir, "input.txt")
+		with open(self.inputFilename, mode="w", encoding="utf-8") as file:
+			file.writelines(
+				f"word{i}|alt'{i}|other{i}\tdefinition 'q' {i}\\nline 2\n"
+				for i in range(250)
+			)
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpDir, ignore_errors=True)
+
+	def convert(self, fname, **writeOptions):
+		outputFilename = join(self.tmpDir, fname)
+		glos = Glossary()
+		glos.setInfo("name", "it's a test")
+		glos.convert(
+			ConvertArgs(
+				inputFilename=self.inputFilename,
+				outputFilename=outputFilename,
+				outputFormat="Sql",
+				writeOptions=writeOptions,
+			),
+		)
+		return outputFilename
+
+	def loadScript(self, fname, **writeOptions):
+		with open(self.convert(fname, **writeOptions), encoding="utf-8") as file:
+			script = file.read()
+		con = sqlite3.connect(":memory:")
+		con.executescript(script)
+		return script, con
+
+	@staticmethod
+	def tables(con):
+		return {
+			table: con.execute(f"SELECT * FROM {table} ORDER BY 1, 2").fetchall()
+			for table in ("dbinfo", "dbinfo_extra", "word", "alt")
+		}
+
+	def test_row_by_row(self):
+		script, con = self.loadScript("a.sql")
+		self.assertEqual(script.count("INSERT INTO word VALUES("), 250)
+		self.assertEqual(script.count("INSERT INTO alt VALUES("), 500)
+		self.assertEqual(
+			con.execute("SELECT * FROM word WHERE id = 3").fetchall(),
+			[(3, "word2", "definition 'q' 2<br>line 2")],
+		)
+
+	def test_batch(self):
+		_, expectedCon = self.loadScript("a.sql")
+		script, con = self.loadScript("b.sql", batch_size=100, transaction=True)
+		self.assertEqual(script.count("INSERT INTO word VALUES("), 3)
+		self.assertEqual(script.count("INSERT INTO alt VALUES("), 5)
+		self.assertEqual(self.tables(con), self.tables(expectedCon))
+
+	def test_sqlite_db(self):
+		_, expectedCon = self.loadScript("a.sql")
+		con = sqlite3.connect(self.convert("c.db", sqlite_db=True))
+		self.assertEqual(self.tables(con), self.tables(expectedCon))
+		indexes = {
+			row[0]
+			for row in con.execute("SELECT name FROM sqlite_master WHERE type='index'")
+		}
+		self.assertLessEqual({"ix_word_w", "ix_alt_id", "ix_alt_w"}, indexes)
+		con.close()
+
+	def test_sqlite_db_batch(self):
+		_, expectedCon = self.loadScript("a.sql")
+		con = sqlite3.connect(self.convert("d.db", sqlite_db=True, batch_size=7))
+		self.assertEqual(self.tables(con), self.tables(expectedCon))
+		con.close()
+
+
+if __name__ == "__main__":
+	unittest.main()
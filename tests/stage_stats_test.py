@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from os.path import abspath, dirname, getsize, join
+
+rootDir = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, rootDir)
+
+from pyglossary.entry import Entry
+from pyglossary.glossary_v2 import ConvertArgs, Glossary
+from pyglossary.stage_stats import StageStats, entrySize
+
+
+class _SlowIter:
+	def __init__(self, items, delay):
+		self._items = iter(items)
+		self._delay = delay
+
+	def __iter__(self):
+		return self
+
+	def __next__(self):
+		time.sleep(self._delay)
+		return next(self._items)
+
+
+class TestStageStats(unittest.TestCase):
+	def test_timeIter_nested(self):
+		stats = StageStats()
+		entries = [Entry(f"word{i}", f"defi {i}") for i in range(3)]
+		inner = stats.counter("read", "inner")
+		outer = stats.counter("filter", "outer")
+		result = list(
+			stats.timeIter(
+				_SlowIter(stats.timeIter(_SlowIter(entries, 0.01), inner), 0.02),
+				outer,
+			),
+		)
+		self.assertEqual(result, entries)
+		self.assertEqual(inner.count, 3)
+		self.assertEqual(outer.count, 3)
+		self.assertEqual(inner.sizeOut, sum(entrySize(e) for e in entries))
+		self.assertGreaterEqual(inner.time, 0.03)
+		# time of inner iterator is not counted for outer
+		self.assertGreaterEqual(outer.time, 0.06)
+		self.assertLess(outer.time, 0.06 + inner.time)
+		self.assertEqual(len(inner.slowest), 3)
+
+	def test_wrapFilters(self):
+		glos = Glossary()
+
+		class SkipOdd:
+			name = "skip_odd"
+			desc = "Skip odd"
+
+			def run(self, entry):  # noqa: PLR6301
+				if int(entry.s_term[4:]) % 2:
+					return None
+				return entry
+
+		stats = StageStats()
+		(timedFilter,) = stats.wrapFilters([SkipOdd()])
+		entries = [glos.newEntry(f"word{i}", "d") for i in range(5)]
+		result = [timedFilter.run(entry) for entry in entries]
+		self.assertEqual([e.s_term for e in result if e], ["word0", "word2", "word4"])
+		(counter,) = stats.counters
+		self.assertEqual(counter.label, "filter: skip_odd")
+		self.assertEqual(counter.count, 5)
+		self.assertEqual(counter.outCount, 3)
+		self.assertEqual(counter.sizeIn, 5 * 6)
+		self.assertEqual(counter.sizeOut, 3 * 6)
+
+
+class TestGlossaryStageStats(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		Glossary.init()
+
+	def setUp(self):
+		self.tmpDir = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpDir, ignore_errors=True)
+
+	def convert(self, config, **convertArgs):
+		inputFilename = join(self.tmpDir, "input.txt")
+		with open(inputFilename, mode="w", encoding="utf-8") as file:
+			file.writelines(f"Word{i}\tdefinition {i}\n" for i in range(100))
+		outputFilename = join(self.tmpDir, "output.txt")
+		glos = Glossary()
+		glos.config = config
+		glos.convert(
+			ConvertArgs(
+				inputFilename=inputFilename,
+				outputFilename=outputFilename,
+				**convertArgs,
+			),
+		)
+		return glos, inputFilename, outputFilename
+
+	def test_disabled(self):
+		glos, _, _ = self.convert({})
+		self.assertIsNone(glos.stageStats)
+
+	def test_convert_direct(self):
+		jsonPath = join(self.tmpDir, "stats.json")
+		glos, inputFilename, outputFilename = self.convert(
+			{"stage_stats_json": jsonPath, "lower": True},
+			direct=True,
+		)
+		stats = glos.stageStats
+		assert stats is not None
+		labels = [c.label for c in stats.counters]
+		self.assertEqual(labels[0], "read: tabfile")
+		self.assertIn("filter: lower", labels)
+		self.assertIn("write: tabfile", labels)
+		self.assertIn("finish: tabfile", labels)
+
+		with open(jsonPath, encoding="utf-8") as file:
+			data = json.load(file)
+		stages = {(s["kind"], s["name"]): s for s in data["stages"]}
+		read = stages["read", "tabfile"]
+		self.assertEqual(read["count"], 100)
+		self.assertEqual(read["size_in"], getsize(inputFilename))
+		self.assertEqual(stages["filter", "lower"]["count"], 100)
+		write = stages["write", "tabfile"]
+		self.assertEqual(write["count"], 100)
+		self.assertEqual(write["size_out"], getsize(outputFilename))
+		self.assertEqual(len(write["slowest"]), 5)
+		self.assertGreater(data["total_time"], 0)
+
+	def test_convert_same_basename(self):
+		def convert(inputFilename, outputFilename):
+			glos = Glossary()
+			glos.config = {"stage_stats": True}
+			glos.convert(
+				ConvertArgs(
+					inputFilename=inputFilename,
+					outputFilename=outputFilename,
+				),
+			)
+			stats = glos.stageStats
+			assert stats is not None
+			sizeIn = sum(c.sizeIn for c in stats.counters if c.kind == "read")
+			sizeOut = sum(c.sizeOut for c in stats.counters if c.kind == "write")
+			return sizeIn, sizeOut
+
+		def dirSize(exclude):
+			return sum(
+				getsize(join(self.tmpDir, fname))
+				for fname in os.listdir(self.tmpDir)
+				if fname != exclude
+			)
+
+		txtPath = join(self.tmpDir, "dict.txt")
+		ifoPath = join(self.tmpDir, "dict.ifo")
+		with open(txtPath, mode="w", encoding="utf-8") as file:
+			file.writelines(f"word{i}\tdefinition {i}\n" for i in range(100))
+		txtSize = getsize(txtPath)
+
+		sizeIn, sizeOut = convert(txtPath, ifoPath)
+		self.assertEqual(sizeIn, txtSize)
+		self.assertEqual(sizeOut, dirSize(exclude="dict.txt"))
+
+		# dict.txt is overwritten, so it is not counted as input
+		sizeIn, sizeOut = convert(ifoPath, txtPath)
+		self.assertEqual(sizeIn, dirSize(exclude="dict.txt"))
+		self.assertEqual(sizeOut, getsize(txtPath))
+
+	def test_convert_indirect(self):
+		glos, _, _ = self.convert({"stage_stats": True}, sort=True)
+		stats = glos.stageStats
+		assert stats is not None
+		counts = {c.label: c.count for c in stats.counters}
+		self.assertEqual(counts["read: tabfile"], 100)
+		self.assertEqual(counts["write: tabfile"], 100)
+		self.assertIn("read: tabfile", stats.reportText())
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from os.path import abspath, dirname, join
+
+rootDir = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, rootDir)
+
+from pyglossary.startup_profile import StartupProfile
+
+# heavy (optional) modules that must not be imported when converting
+# between simple formats with command line
+heavyModules = (
+	"lxml",
+	"icu",
+	"psutil",
+	"tqdm",
+	"prompt_toolkit",
+	"bs4",
+	"multiprocessing",
+	"concurrent.futures.process",
+)
+
+# milliseconds from start of pyglossary.ui.main import to first entry,
+# with plugin metadata cache already created. It is far more than the
+# actual time (less than 0.1 second) to avoid failing on slow machines
+startupBudget = 1500
+
+
+class TestStartupProfile(unittest.TestCase):
+	def setUp(self):
+		self.tmpDir = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpDir, ignore_errors=True)
+
+	def test_imports(self):
+		modDir = join(self.tmpDir, "mods")
+		os.makedirs(join(modDir, "startup_profile_test_pkg"))
+		with open(
+			join(modDir, "startup_profile_test_pkg", "__init__.py"),
+			mode="w",
+			encoding="utf-8",
+		) as file:
+			file.write("from . import sub\n")
+		with open(
+			join(modDir, "startup_profile_test_pkg", "sub.py"),
+			mode="w",
+			encoding="utf-8",
+		) as file:
+			file.write("x = 1\n")
+		sys.path.insert(0, modDir)
+		self.addCleanup(sys.path.remove, modDir)
+		self.addCleanup(sys.modules.pop, "startup_profile_test_pkg", None)
+		self.addCleanup(sys.modules.pop, "startup_profile_test_pkg.sub", None)
+
+		prof = StartupProfile()
+		prof.start()
+		try:
+			import startup_profile_test_pkg  # noqa: F401
+		finally:
+			prof.stop()
+
+		records = {r.module: r for r in prof.imports}
+		self.assertEqual(
+			sorted(records),
+			["startup_profile_test_pkg", "startup_profile_test_pkg.sub"],
+		)
+		pkg = records["startup_profile_test_pkg"]
+		sub = records["startup_profile_test_pkg.sub"]
+		self.assertEqual(pkg.depth, 0)
+		self.assertEqual(sub.depth, 1)
+		self.assertGreaterEqual(pkg.cumulativeTime, sub.cumulativeTime)
+		self.assertAlmostEqual(
+			pkg.selfTime,
+			pkg.cumulativeTime - sub.cumulativeTime,
+		)
+
+	def test_markFirst(self):
+		prof = StartupProfile()
+		self.assertEqual(list(prof.markFirst([], "first")), [])
+		self.assertEqual(prof.marks, {})
+		self.assertEqual(list(prof.markFirst([1, 2, 3], "first")), [1, 2, 3])
+		self.assertEqual(list(prof.marks), ["first"])
+		data = prof.toDict()
+		self.assertEqual(list(data["marks"]), ["first"])
+		self.assertEqual(data["import_count"], 0)
+
+	def _convert(self, jsonPath: str = "") -> None:
+		inputFilename = join(self.tmpDir, "input.txt")
+		with open(inputFilename, mode="w", encoding="utf-8") as file:
+			file.write("hello\thi\nworld\tearth\n")
+		homeDir = join(self.tmpDir, "home")
+		os.makedirs(homeDir, exist_ok=True)
+		env = dict(os.environ)
+		env["HOME"] = homeDir
+		env.pop("PYGLOSSARY_PROFILE_STARTUP", None)
+		if jsonPath:
+			env["PYGLOSSARY_PROFILE_STARTUP"] = jsonPath
+		subprocess.run(
+			[
+				sys.executable,
+				join(rootDir, "main.py"),
+				"--ui=none",
+				inputFilename,
+				join(self.tmpDir, "output.txt"),
+			],
+			env=env,
+			check=True,
+			capture_output=True,
+		)
+
+	def test_cmd_startup_budget(self):
+		# first run creates plugin metadata cache
+		self._convert()
+		jsonPath = join(self.tmpDir, "profile.json")
+		self._convert(jsonPath)
+		with open(jsonPath, encoding="utf-8") as file:
+			data = json.load(file)
+
+		imported = {item["module"] for item in data["imports"]}
+		for name in heavyModules:
+			self.assertNotIn(name, imported)
+		plugins = {
+			name.split(".")[2]
+			for name in imported
+			if name.startswith("pyglossary.plugins.") and name.count(".") >= 2
+		}
+		self.assertEqual(plugins, {"tabfile"})
+
+		self.assertIn("first_entry", data["marks"])
+		self.assertLess(data["marks"]["first_entry"], startupBudget)
+
+
+if __name__ == "__main__":
+	unittest.main()